@@ -0,0 +1,88 @@
+from typing import Callable, Dict, Tuple
+
+from pynamodb_utils.conditions import create_model_condition
+from pynamodb_utils.parsers import parse_value
+from pynamodb_utils.plans import clear_plan_cache
+from pynamodb_utils.serializers import ConditionsSerializer, QuerySerializer
+
+from .models import make_items, make_nested_query, make_wide_model
+
+WIDTH = 40
+QUERY_DEPTH = 8
+AS_DICT_ITEMS = 1000
+
+
+def build_cases() -> Dict[str, Tuple[Callable[[], object], int]]:
+    """
+    Function returns benchmark cases as mapping of name to (callable, number of operations per call).
+    """
+    model = make_wide_model(WIDTH)
+    unavailable = model.Meta.query_unavailable_attributes
+    nested_query = make_nested_query(QUERY_DEPTH, WIDTH)
+    index_query = {"status": "published", "created_at__lte": "2020-01-15T00:00:00", **make_nested_query(2, WIDTH)}
+    flat_args = {f"field_{i}__equals": f"value-{i}" for i in range(0, WIDTH, 4)}
+    parse_inputs = [
+        ("field_0", "value"),
+        ("field_1", "12.5"),
+        ("field_2", "true"),
+        ("field_3", "2020-01-01T00:00:00.000000+00:00"),
+        ("status", "published"),
+        ("address.city", "city"),
+        ("tags.type", "news"),
+    ]
+    items = make_items(model, AS_DICT_ITEMS, WIDTH)
+    conditions_serializer = ConditionsSerializer(model, unavailable)
+    query_serializer = QuerySerializer(model, unavailable)
+
+    def conditions_load_cold():
+        clear_plan_cache(model)
+        conditions_serializer.load(nested_query, raise_exception=True)
+
+    def conditions_load_warm():
+        conditions_serializer.load(nested_query, raise_exception=True)
+
+    def query_load_cold():
+        clear_plan_cache(model)
+        query_serializer.load(index_query, raise_exception=True)
+
+    def query_load_warm():
+        query_serializer.load(index_query, raise_exception=True)
+
+    def parse_values():
+        for field_name, value in parse_inputs:
+            parse_value(model, field_name, value)
+
+    def model_condition():
+        create_model_condition(model, flat_args, unavailable_attributes=unavailable)
+
+    def as_dict():
+        for item in items:
+            item.as_dict()
+
+    raw_items = [item.serialize() for item in items]
+
+    def from_raw_data():
+        for raw in raw_items:
+            model.from_raw_data(raw)
+
+    status = model.get_attributes()["status"]
+    statuses = list(status.enum) * 100
+    serialized_statuses = [status.serialize(value) for value in statuses]
+
+    def enum_round_trip():
+        for value in statuses:
+            status.serialize(value)
+        for value in serialized_statuses:
+            status.deserialize(value)
+
+    return {
+        "conditions_serializer.load[cold]": (conditions_load_cold, 1),
+        "conditions_serializer.load[warm]": (conditions_load_warm, 1),
+        "query_serializer.load[cold]": (query_load_cold, 1),
+        "query_serializer.load[warm]": (query_load_warm, 1),
+        "parse_value": (parse_values, len(parse_inputs)),
+        "create_model_condition": (model_condition, 1),
+        "as_dict": (as_dict, len(items)),
+        "from_raw_data": (from_raw_data, len(raw_items)),
+        "enum.serialize+deserialize": (enum_round_trip, len(statuses)),
+    }
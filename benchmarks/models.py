@@ -0,0 +1,112 @@
+import enum
+from datetime import datetime, timezone
+
+from pynamodb.attributes import (BooleanAttribute, ListAttribute, MapAttribute, NumberAttribute, UnicodeAttribute,
+                                 UTCDateTimeAttribute)
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
+
+from pynamodb_utils import AsDictModel, DynamicMapAttribute, EnumAttribute, JSONQueryModel, TimestampedModel
+
+
+class StatusEnum(enum.Enum):
+    draft = enum.auto()
+    published = enum.auto()
+    archived = enum.auto()
+
+
+ATTRIBUTE_TYPES = (
+    lambda: UnicodeAttribute(null=True),
+    lambda: NumberAttribute(null=True),
+    lambda: BooleanAttribute(null=True),
+    lambda: UTCDateTimeAttribute(null=True),
+)
+
+
+class Address(MapAttribute):
+    street = UnicodeAttribute(null=True)
+    city = UnicodeAttribute(null=True)
+    zip_code = UnicodeAttribute(null=True)
+    visited_at = UTCDateTimeAttribute(null=True)
+
+
+class StatusCreatedAtGSI(GlobalSecondaryIndex):
+    status = EnumAttribute(hash_key=True, enum=StatusEnum)
+    created_at = UTCDateTimeAttribute(range_key=True)
+
+    class Meta:
+        index_name = "status-created-at-index"
+        projection = AllProjection()
+
+
+def make_wide_model(width: int = 40):
+    """
+    Function creates model with ``width`` generated attributes of mixed types next to nested and dynamic maps.
+    """
+    attrs = {
+        "tenant": UnicodeAttribute(hash_key=True),
+        "item_id": UnicodeAttribute(range_key=True),
+        "status": EnumAttribute(enum=StatusEnum, default=StatusEnum.draft),
+        "address": Address(null=True),
+        "addresses": ListAttribute(of=Address, null=True),
+        "tags": DynamicMapAttribute(default={}),
+        "secret": UnicodeAttribute(null=True),
+        "status_created_at_gsi": StatusCreatedAtGSI(),
+        "Meta": type("Meta", (), {
+            "table_name": "benchmark-wide-table",
+            "query_unavailable_attributes": ["secret"],
+            "invisible_attributes": ["secret", "address.zip_code"],
+        }),
+    }
+    for i in range(width):
+        attrs[f"field_{i}"] = ATTRIBUTE_TYPES[i % len(ATTRIBUTE_TYPES)]()
+    return type("WideModel", (AsDictModel, JSONQueryModel, TimestampedModel), attrs)
+
+
+def field_value(i: int, seed: int = 0):
+    kind = i % len(ATTRIBUTE_TYPES)
+    if kind == 0:
+        return f"value-{seed}-{i}"
+    if kind == 1:
+        return seed * 1000 + i
+    if kind == 2:
+        return (seed + i) % 2 == 0
+    return datetime(2020, 1, 1 + (seed + i) % 28, tzinfo=timezone.utc)
+
+
+def make_items(model, count: int, width: int = 40):
+    timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for seed in range(count):
+        address = Address(street=f"street {seed}", city="city", zip_code="00-000", visited_at=timestamp)
+        items.append(model(
+            tenant=f"tenant-{seed % 10}",
+            item_id=f"item-{seed}",
+            status=StatusEnum.published,
+            address=address,
+            addresses=[address, address],
+            tags={"type": "news", "topics": ["a", "b"], "rank": seed},
+            secret="secret",
+            created_at=timestamp,
+            updated_at=timestamp,
+            **{f"field_{i}": field_value(i, seed) for i in range(width)},
+        ))
+    return items
+
+
+def make_nested_query(depth: int, width: int = 40) -> dict:
+    """
+    Function creates query nested ``depth`` times alternating AND and OR statements.
+    """
+    query: dict = {}
+    for level in reversed(range(depth)):
+        statement = {
+            f"field_{(level * 4) % width}__equals": f"value-{level}",
+            f"field_{(level * 4 + 1) % width}__gte": level,
+            f"field_{(level * 4 + 3) % width}__lte": "2020-01-15T00:00:00",
+            "tags.type__equals": "news",
+            "address.city__startswith": "ci",
+        }
+        if query:
+            statement["OR" if level % 2 else "AND"] = query
+        query = statement
+    return query
@@ -0,0 +1,132 @@
+"""
+Benchmarks of query translation and serialization hot paths.
+
+Runs fully offline, no DynamoDB backend is needed. Results are stored as JSON and can be compared between runs:
+
+    python -m benchmarks.run --output current.json --compare baseline.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from .cases import build_cases
+
+FORMAT_VERSION = 1
+MEMORY_NOISE_BYTES = 256
+
+
+def measure(fn: Callable[[], object], operations: int, min_time: float, repeat: int) -> Dict[str, Any]:
+    """
+    Function measures throughput of fn as best of ``repeat`` rounds and peak memory allocated by single call.
+    """
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10 or number >= 1 << 20:
+            break
+        number *= 2
+
+    timings: List[float] = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            timings.append((time.perf_counter() - start) / (number * operations))
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        current, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    timings.sort()
+    return {
+        "operations": operations,
+        "best_ns": timings[0] * 1e9,
+        "median_ns": timings[len(timings) // 2] * 1e9,
+        "ops_per_sec": 1 / timings[0],
+        "peak_bytes": (peak - current) / operations,
+    }
+
+
+def run(selected: Optional[List[str]] = None, min_time: float = 1.0, repeat: int = 5) -> Dict[str, Any]:
+    results = {}
+    for name, (fn, operations) in build_cases().items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        results[name] = measure(fn, operations, min_time, repeat)
+        print(f"{name:40} {results[name]['best_ns']:>14,.0f} ns/op {results[name]['peak_bytes']:>12,.0f} B/op")
+    return {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Function prints regression report and returns names of cases slower or using more memory than threshold.
+    """
+    regressions = []
+    print(f"\n{'case':40} {'baseline ns':>14} {'current ns':>14} {'time':>8} {'memory':>8}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:40} {'-':>14} {result['best_ns']:>14,.0f} {'new':>8}")
+            continue
+        time_change = result["best_ns"] / base["best_ns"] - 1
+        memory_change = result["peak_bytes"] / base["peak_bytes"] - 1 if base["peak_bytes"] else 0.0
+        memory_regressed = (
+            memory_change > threshold and result["peak_bytes"] - base["peak_bytes"] > MEMORY_NOISE_BYTES
+        )
+        regressed = time_change > threshold or memory_regressed
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:40} {base['best_ns']:>14,.0f} {result['best_ns']:>14,.0f} "
+            f"{time_change:>+8.1%} {memory_change:>+8.1%}{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", nargs="*", help="Run only cases containing any of given substrings")
+    parser.add_argument("--output", help="Store results as JSON in given file")
+    parser.add_argument("--compare", help="Compare results with baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change reported as regression")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Approximate time spent in every case")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed rounds of every case")
+    args = parser.parse_args(argv)
+
+    current = run(args.cases, min_time=args.min_time, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(current, fp, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        if compare(baseline, current, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,7 @@ PYTHON_VENV ?= venv
 COV ?= src/pynamodb_utils
 TESTS_REQUIREMENTS ?= src/tests/requirements.txt
 TESTS_DIR=src/tests
+BENCHMARK_ARGS ?=
 
 #
 # Functions
@@ -23,6 +24,7 @@ setup: python_venv
 ifneq ($(wildcard ./setup.py),)
 test: python_test
 test_integration: python_test_integration
+benchmark: python_benchmark
 endif
 distclean: python_distclean
 
@@ -38,6 +40,10 @@ python_test: $(PYTHON_VENV) install_dependencies $(TESTS_REQUIREMENTS)
 		--cov-report term-missing \
 	)
 
+.PHONY: python_benchmark
+python_benchmark: $(PYTHON_VENV) install_dependencies
+	$(call in_venv,$(PYTHON) -m benchmarks.run $(BENCHMARK_ARGS))
+
 .PHONY: python_venv
 python_venv: $(PYTHON_VENV)
 	@:
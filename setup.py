@@ -28,6 +28,12 @@ setup(
         )
     ),
     install_requires=["pynamodb>=6.0.0,<7.0.0"],
+    entry_points={
+        "console_scripts": [
+            "pynamodb-utils-export=pynamodb_utils.export:main",
+            "pynamodb-utils-import=pynamodb_utils.importer:main",
+        ],
+    },
     include_package_data=True,
     python_requires=">=3.6",
     license="MIT",
@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional
+
+from pynamodb.pagination import ResultIterator
+
+from pynamodb_utils.concurrency import get_default_executor
+from pynamodb_utils.pagination import iter_pages
+
+_END: Any = object()
+
+
+class AsyncPageIterator:
+    """
+        Asynchronous iterator over pages of query or scan.
+        Pages are fetched on executor, next page is fetched while current one is consumed.
+    """
+
+    def __init__(
+        self, result_iterator: ResultIterator, executor: Optional[Executor] = None, prefetch: bool = True
+    ) -> None:
+        self.result_iterator = result_iterator
+        self._pages = iter_pages(result_iterator)
+        self._executor = executor or get_default_executor()
+        self._prefetch = prefetch
+        self._next: Optional[asyncio.Future] = None
+        self._closed = False
+
+    def _fetch(self) -> Any:
+        return next(self._pages, _END)
+
+    def _schedule(self) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(self._executor, self._fetch)
+
+    @property
+    def last_evaluated_key(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """ Key to resume from, None for iterators without pages as results of GetItem or BatchGetItem """
+        page_iter = getattr(self.result_iterator, "page_iter", None)
+        return getattr(page_iter, "last_evaluated_key", None)
+
+    def __aiter__(self) -> "AsyncPageIterator":
+        return self
+
+    async def __anext__(self) -> List[Any]:
+        if self._closed:
+            raise StopAsyncIteration
+        future = self._next if self._next is not None else self._schedule()
+        self._next = None
+        try:
+            page = await future
+        except asyncio.CancelledError:
+            self._closed = True
+            raise
+        if page is _END:
+            self._closed = True
+            raise StopAsyncIteration
+        if self._prefetch:
+            self._next = self._schedule()
+        return page
+
+    async def aclose(self) -> None:
+        """ Stops iteration and cancels prefetched page """
+        self._closed = True
+        if self._next is not None:
+            self._next.cancel()
+            self._next = None
+
+
+class AsyncResultIterator:
+    """
+        Asynchronous iterator over items of query or scan backed by AsyncPageIterator.
+    """
+
+    def __init__(
+        self, result_iterator: ResultIterator, executor: Optional[Executor] = None, prefetch: bool = True
+    ) -> None:
+        self.pages = AsyncPageIterator(result_iterator, executor=executor, prefetch=prefetch)
+        self._items: List[Any] = []
+        self._index = 0
+
+    def __aiter__(self) -> "AsyncResultIterator":
+        return self
+
+    async def __anext__(self) -> Any:
+        while self._index == len(self._items):
+            self._items = await self.pages.__anext__()
+            self._index = 0
+        item = self._items[self._index]
+        self._index += 1
+        return item
+
+    async def aclose(self) -> None:
+        await self.pages.aclose()
+
+    async def to_list(self) -> List[Any]:
+        return [item async for item in self]
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import json
+from collections.abc import ItemsView, KeysView, Mapping, MutableMapping
 from enum import Enum
-from typing import Any, Callable, Collection, FrozenSet, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Optional, Tuple, Type, TypeVar, Union
 
 import six
-from pynamodb.attributes import Attribute, MapAttribute
+from pynamodb.attributes import DESERIALIZE_CLASS_MAP, Attribute, MapAttribute
 from pynamodb.constants import NUMBER, STRING
 
 T = TypeVar("T", bound=Enum)
@@ -16,6 +17,64 @@ def string_number(x: str) -> str:
     return str(int(x))
 
 
+class LazyDecodedDict(MutableMapping):
+    """
+        Mapping of raw DynamoDB values decoding every value on first access to its key.
+        Values which were never accessed keep their raw form and are serialized back without decoding.
+        Raw value is removed only after its decoded value is stored, so concurrent first accesses
+        decode it independently and all of them return the value stored first.
+    """
+    __slots__ = ("_raw", "_decoded", "_decode")
+
+    def __init__(self, raw: Dict[str, Dict[str, Any]], decode: Callable[[Dict[str, Any]], Any]) -> None:
+        self._raw = dict(raw)
+        self._decoded: Dict[str, Any] = {}
+        self._decode = decode
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+        raw = self._raw.get(key, _fail)
+        if raw is _fail:
+            return self._decoded[key]
+        value = self._decoded.setdefault(key, self._decode(raw))
+        self._raw.pop(key, None)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._raw.pop(key, None)
+        self._decoded[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        raw = self._raw.pop(key, _fail)
+        if self._decoded.pop(key, _fail) is _fail and raw is _fail:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._decoded or key in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        raw_keys = list(self._raw)
+        decoded_keys = list(self._decoded)
+        yield from decoded_keys
+        decoded = set(decoded_keys)
+        yield from (key for key in raw_keys if key not in decoded)
+
+    def __len__(self) -> int:
+        return len(self._decoded.keys() | self._raw.keys())
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def serialize(self, serialize_values: Callable[[Mapping[str, Any], Dict], Dict]) -> Dict[str, Dict[str, Any]]:
+        """ Serializes decoded values with serialize_values and copies raw values which were never accessed """
+        raw = dict(self._raw)
+        decoded = dict(self._decoded)
+        return serialize_values(decoded, {key: value for key, value in raw.items() if key not in decoded})
+
+
 class DynamicMapAttribute(MapAttribute):
     element_type = None
 
@@ -39,36 +98,68 @@ class DynamicMapAttribute(MapAttribute):
         for attr_name, attr_value in six.iteritems(attributes):
             setattr(self, attr_name, attr_value)
 
+    def _decode_element(self, value: Dict[str, Any]) -> Any:
+        return self._element_decoder.deserialize(next(iter(value.values())))
+
+    @staticmethod
+    def _decode_value(value: Dict[str, Any]) -> Any:
+        attr_type, attr_value = next(iter(value.items()))
+        return DESERIALIZE_CLASS_MAP[attr_type].deserialize(attr_value)
+
+    def _get_decoder(self) -> Callable[[Dict[str, Any]], Any]:
+        if not self.element_type:
+            return self._decode_value
+        if "_element_decoder" not in self.__dict__:
+            self.__dict__["_element_decoder"] = self.element_type()
+        return self._decode_element
+
+    def serialize(self, values, *, null_check: bool = True):
+        attribute_values = getattr(values, "attribute_values", None)
+        if self.is_raw() and isinstance(attribute_values, LazyDecodedDict):
+            return attribute_values.serialize(self._serialize_undeclared_attributes)
+        return super().serialize(values, null_check=null_check)
+
     def deserialize(self, values):
         """
-        Decode from map of AttributeValue types.
+        Decode from map of AttributeValue types, values are decoded on first access.
         """
-        if not self.element_type:
+        if not self.is_raw():
             return super(DynamicMapAttribute, self).deserialize(values)
 
-        class_for_deserialize = self.element_type()
-        return {
-            k: class_for_deserialize.deserialize(attr_value)
-            for k, v in values.items()
-            for _, attr_value in v.items()
-        }
+        instance = type(self).__new__(type(self))
+        instance.__dict__["attribute_values"] = LazyDecodedDict(values, self._get_decoder())
+        return instance
 
     @classmethod
     def is_raw(cls) -> bool:
         return cls == DynamicMapAttribute
 
-    def keys(self) -> FrozenSet:
-        return self.as_dict().keys()
+    def keys(self) -> KeysView:
+        return self.attribute_values.keys()
 
-    def items(self) -> Collection:
-        return self.as_dict().items()
+    def items(self) -> ItemsView:
+        return _AsDictItemsView(self.attribute_values)
 
     def __str__(self) -> str:
         return str(self.__class__)
 
 
-class EnumNumberAttribute(Attribute[T]):
-    attr_type = NUMBER
+class _AsDictItemsView(ItemsView):
+    """
+        Items of dynamic map with nested maps converted to dictionaries.
+    """
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        for key in self._mapping:
+            value = self._mapping[key]
+            yield key, value.as_dict() if isinstance(value, MapAttribute) else value
+
+
+class _EnumAttribute(Attribute[T]):
+    """
+        Base of enum attributes holding lookup tables computed once per attribute:
+        accepted python value to serialized value, serialized value to member and names of members.
+    """
 
     def __init__(
         self,
@@ -83,6 +174,10 @@ class EnumNumberAttribute(Attribute[T]):
 
         self.enum = enum
         self.unknown_value = unknown_value
+        self.member_names: FrozenSet[str] = frozenset(enum.__members__)
+        self._serialized: Dict[Any, str] = {}
+        self._members: Dict[str, T] = {}
+        self._build_lookup_tables()
 
         self._default = default
         self._default_for_new = default_for_new
@@ -99,63 +194,78 @@ class EnumNumberAttribute(Attribute[T]):
             default_for_new=default_for_new
         )
 
-    def serialize(self, value: Union[int, Callable[[], T]]) -> str:  # string number
+    def _build_lookup_tables(self) -> None:
+        raise NotImplementedError
+
+    def _serialize(self, value: Any) -> str:
+        raise NotImplementedError
+
+    def _deserialize(self, value: str) -> T:
+        raise NotImplementedError
+
+    def serialize(self, value: Union[int, str, Callable[[], T]]) -> str:
         if callable(value):
             value = value()
-        if isinstance(value, int):
-            return string_number(self.enum(value).value)
-        if isinstance(value, str):
-            return string_number(getattr(self.enum, value).value)
-        if not isinstance(value, self.enum):
-            raise TypeError(
-                f"{value} has invalid type of {type(value)} expected {self.enum}"
-            )
-        return string_number(value.value)
+        try:
+            return self._serialized[value]
+        except (KeyError, TypeError):
+            return self._serialize(value)
 
     def deserialize(self, value: str) -> Optional[T]:
         try:
-            return self.enum(int(value))
+            return self._members[value]
+        except (KeyError, TypeError):
+            pass
+        try:
+            return self._deserialize(value)
         except ValueError as e:
             if self.unknown_value is _fail:
                 raise ValueError(f"{value} is not present in {self.enum}") from e
             return self.unknown_value
 
 
-class EnumUnicodeAttribute(Attribute[T]):
-    attr_type = STRING
-
-    def __init__(
-        self,
-        enum: Type[Enum],
-        default: Optional[Enum] = None,
-        default_for_new: Optional[Enum] = None,
-        unknown_value: Optional[T] = _fail,
-        **kwargs,
-    ):
-        if not issubclass(enum, Enum):
-            raise ValueError("enum must be Enum class")
+class EnumNumberAttribute(_EnumAttribute[T]):
+    attr_type = NUMBER
 
-        self.enum = enum
-        self.unknown_value = unknown_value
+    def _build_lookup_tables(self) -> None:
+        for name, member in self.enum.__members__.items():
+            try:
+                serialized = string_number(member.value)
+            except (TypeError, ValueError):
+                continue
+            self._serialized.setdefault(member, serialized)
+            self._serialized.setdefault(name, serialized)
+            self._members.setdefault(serialized, member)
+        for member in self.enum:
+            if member in self._serialized:
+                self._serialized.setdefault(member.value, self._serialized[member])
+
+    def _serialize(self, value: Any) -> str:
+        if isinstance(value, int):
+            return string_number(self.enum(value).value)
+        if isinstance(value, str):
+            return string_number(getattr(self.enum, value).value)
+        if not isinstance(value, self.enum):
+            raise TypeError(
+                f"{value} has invalid type of {type(value)} expected {self.enum}"
+            )
+        return string_number(value.value)
 
-        self._default = default
-        self._default_for_new = default_for_new
+    def _deserialize(self, value: str) -> T:
+        return self.enum(int(value))
 
-        if default:
-            def default(): return self._default
 
-        if default_for_new:
-            def default_for_new(): return self._default_for_new
+class EnumUnicodeAttribute(_EnumAttribute[T]):
+    attr_type = STRING
 
-        super().__init__(
-            **kwargs,
-            default=default,
-            default_for_new=default_for_new
-        )
+    def _build_lookup_tables(self) -> None:
+        for member in self.enum:
+            if isinstance(member.value, str):
+                self._serialized.setdefault(member, member.value)
+                self._serialized.setdefault(member.value, member.value)
+                self._members.setdefault(member.value, member)
 
-    def serialize(self, value: Union[str, Callable[[], T]]) -> str:
-        if callable(value):
-            value = value()
+    def _serialize(self, value: Any) -> str:
         if isinstance(value, str):
             return self.enum(value).value
         if not isinstance(value, self.enum):
@@ -164,13 +274,8 @@ class EnumUnicodeAttribute(Attribute[T]):
             )
         return value.value
 
-    def deserialize(self, value: str) -> Optional[T]:
-        try:
-            return self.enum(value)
-        except ValueError as e:
-            if self.unknown_value is _fail:
-                raise ValueError(f"{value} is not present in {self.enum}") from e
-            return self.unknown_value
+    def _deserialize(self, value: str) -> T:
+        return self.enum(value)
 
 
 EnumAttribute = EnumNumberAttribute
@@ -0,0 +1,143 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, TypeVar
+
+from pynamodb.constants import BATCH_WRITE_PAGE_LIMIT, DELETE_REQUEST, ITEM, KEY, PUT_REQUEST, UNPROCESSED_ITEMS
+from pynamodb.models import Model
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.exceptions import BatchWriteError
+
+BATCH_MAX_RETRIES = int(os.environ.get("PYNAMODB_UTILS_BATCH_MAX_RETRIES", 8))
+BATCH_BACKOFF_BASE = float(os.environ.get("PYNAMODB_UTILS_BATCH_BACKOFF_BASE", 0.05))
+BATCH_BACKOFF_MAX = float(os.environ.get("PYNAMODB_UTILS_BATCH_BACKOFF_MAX", 5))
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Function splits iterable into lists of at most size elements.
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def deduplicate(items: Iterable[T]) -> List[T]:
+    """
+    Function returns items without repeated values keeping order, unhashable items are returned as they are.
+    """
+    items = list(items)
+    try:
+        return list(dict.fromkeys(items))
+    except TypeError:
+        return items
+
+
+def get_backoff(attempt: int, base: float = BATCH_BACKOFF_BASE, maximum: float = BATCH_BACKOFF_MAX) -> float:
+    """
+    Function returns exponential backoff with full jitter for given retry attempt.
+    """
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+
+class RateLimiter:
+    """
+        Thread-safe token bucket limiting consumption of capacity units to rate per second.
+        Bucket holds at most one second of capacity, so bursts do not exceed the rate.
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self._tokens = rate
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, units: float) -> None:
+        """ Blocks until units can be consumed, units larger than rate are consumed over several seconds """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= units
+            wait_for = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait_for:
+            time.sleep(wait_for)
+
+
+def batch_write(
+    model: Model,
+    put_items: Sequence[Dict[str, Any]] = (),
+    delete_items: Sequence[Dict[str, Any]] = (),
+    max_retries: Optional[int] = None,
+) -> None:
+    """
+        Function writes at most 25 serialized items in one BatchWriteItem request.
+        Unprocessed items are retried with exponential backoff, BatchWriteError is raised when retries run out.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                put_items (list): serialized items to put
+                delete_items (list): serialized keys of items to delete
+                max_retries (int): Maximal number of retries of unprocessed items
+    """
+    if len(put_items) + len(delete_items) > BATCH_WRITE_PAGE_LIMIT:
+        raise ValueError(f"DynamoDB allows a maximum of {BATCH_WRITE_PAGE_LIMIT} batch operations")
+    if max_retries is None:
+        max_retries = BATCH_MAX_RETRIES
+    connection = model._get_connection()
+    attempt = 0
+    while put_items or delete_items:
+        started_at = instrumentation.start()
+        data = connection.batch_write_item(put_items=list(put_items), delete_items=list(delete_items))
+        instrumentation.record("batch_write", started_at, model=model)
+        unprocessed = (data or {}).get(UNPROCESSED_ITEMS, {}).get(model.Meta.table_name) or []
+        put_items = [request[PUT_REQUEST][ITEM] for request in unprocessed if PUT_REQUEST in request]
+        delete_items = [request[DELETE_REQUEST][KEY] for request in unprocessed if DELETE_REQUEST in request]
+        if not unprocessed:
+            return
+        instrumentation.increment("batch_write.unprocessed", len(unprocessed), model=model)
+        if attempt >= max_retries:
+            raise BatchWriteError(f"{len(unprocessed)} items left unprocessed after {attempt} retries", unprocessed)
+        time.sleep(get_backoff(attempt))
+        attempt += 1
+
+
+def run_chunks(
+    items: Iterable[T],
+    write_chunk: Callable[[List[T]], int],
+    chunk_size: int = BATCH_WRITE_PAGE_LIMIT,
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+        Function splits items into chunks and passes them to write_chunk, in parallel when max_workers is given.
+        At most two chunks per worker are pending at once, so items can be produced lazily.
+        Returns sum of values returned by write_chunk.
+    """
+    chunks = chunked(items, chunk_size)
+    if not max_workers or max_workers < 2:
+        return sum(write_chunk(chunk) for chunk in chunks)
+    total = 0
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pynamodb-utils-batch") as executor:
+        try:
+            for chunk in chunks:
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    total += sum(future.result() for future in done)
+                pending.add(executor.submit(write_chunk, chunk))
+            done, pending = wait(pending)
+            return total + sum(future.result() for future in done)
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,152 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from pynamodb.models import Model
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.batch import chunked, deduplicate
+from pynamodb_utils.metadata import get_model_metadata
+from pynamodb_utils.multi_query import make_index_queries
+from pynamodb_utils.optimizer import MAX_IN_OPERANDS
+from pynamodb_utils.planner import EQUALITY_OPERATORS, RESERVED_KEYS, split_query_key
+from pynamodb_utils.point_get import GET_KWARGS, batch_get
+from pynamodb_utils.result_cache import get_item_key
+from pynamodb_utils.serializers import ConditionsSerializer
+from pynamodb_utils.soft_delete import DELETED_AT, NOT_DELETED_QUERY_KEY
+
+IS_IN = "is_in"
+
+
+def get_is_in_keys(query: dict) -> List[str]:
+    """
+    Function returns top level query keys of ``is_in`` conditions with list of values.
+    """
+    return [
+        k for k, v in query.items()
+        if k not in RESERVED_KEYS and isinstance(v, list) and split_query_key(k)[1] == IS_IN
+    ]
+
+
+def get_hash_key_is_in(model: Model, query: dict) -> Optional[str]:
+    """
+        Function returns query key of ``is_in`` condition on hash key of table or secondary index
+        when no other hash key is compared for equality, table hash key is preferred.
+    """
+    hash_keys = [hash_key for hash_key, _ in get_model_metadata(model).key_schemas.values()]
+    if any(
+        k not in RESERVED_KEYS and split_query_key(k)[1] in EQUALITY_OPERATORS and split_query_key(k)[0] in hash_keys
+        for k in query
+    ):
+        return None
+    is_in_keys = {split_query_key(k)[0]: k for k in get_is_in_keys(query)}
+    return next((is_in_keys[hash_key] for hash_key in hash_keys if hash_key in is_in_keys), None)
+
+
+def is_batch_get(model: Model, query: dict, kwargs: Dict[str, Any]) -> bool:
+    """
+        Function returns whether query is lookup of items by list of table hash keys only,
+        which is served by BatchGetItem on tables without range key.
+        Condition excluding soft deleted items is allowed next to key condition, it is applied to fetched items.
+    """
+    if model._range_keyname is not None or not GET_KWARGS.issuperset(kwargs):
+        return False
+    key = get_hash_key_is_in(model, query)
+    if key is None or split_query_key(key)[0] != model._hash_keyname:
+        return False
+    return all(k in (key, NOT_DELETED_QUERY_KEY) for k in query)
+
+
+def _iter_not_deleted(items: Iterable[Model]) -> Iterator[Model]:
+    return (item for item in items if getattr(item, DELETED_AT, None) is None)
+
+
+def needs_split(model: Model, query: dict) -> bool:
+    """
+    Function returns whether query has to be split into many requests to be executed.
+    """
+    return get_hash_key_is_in(model, query) is not None or any(
+        len(query[k]) > MAX_IN_OPERANDS for k in get_is_in_keys(query)
+    )
+
+
+def split_query(model: Model, query: dict, max_operands: Optional[int] = None) -> List[dict]:
+    """
+        Function splits query into queries executable by DynamoDB.
+        ``is_in`` on hash key of table or index is turned into equality query per value,
+        remaining ``is_in`` lists longer than max_operands are split into chunks of at most max_operands values.
+        Input query is not modified.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                query (dict): The input dictionary with query
+                max_operands (int): Maximal number of values of one ``is_in`` condition
+        Returns:
+                queries (list): queries whose results together are results of input query
+    """
+    max_operands = max_operands or MAX_IN_OPERANDS
+    queries = [query]
+    hash_key = get_hash_key_is_in(model, query)
+    if hash_key is not None:
+        rest = {k: v for k, v in query.items() if k != hash_key}
+        equals_key = f"{split_query_key(hash_key)[0]}__equals"
+        queries = [{**rest, equals_key: value} for value in deduplicate(query[hash_key])]
+    for key in get_is_in_keys(query):
+        if key != hash_key and len(query[key]) > max_operands:
+            chunks = list(chunked(deduplicate(query[key]), max_operands))
+            queries = [{**q, key: chunk} for q in queries for chunk in chunks]
+    return queries
+
+
+def _iter_unique_items(model: Model, results: Iterable[Model]) -> Iterator[Model]:
+    seen: Set[str] = set()
+    for item in results:
+        key = get_item_key(model, item)
+        if key not in seen:
+            seen.add(key)
+            yield item
+
+
+def make_split_query(
+    model: Model,
+    query: dict,
+    unavailable_attributes: List[str],
+    raise_exception: bool = True,
+    max_workers: Optional[int] = None,
+    **kwargs
+) -> Iterator[Model]:
+    """
+        Function executes query with ``is_in`` conditions DynamoDB can not evaluate in one request.
+        Lookup by list of table hash keys is served with BatchGetItem in batches of 100 keys,
+        otherwise query is split with ``split_query`` and parts are executed concurrently.
+        Results of parts split on attributes other than hash key are deduplicated by primary key.
+        Parameters as ``limit`` apply to every part separately.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                query (dict): The input dictionary with query
+                unavailable_attributes (list): list of attributes that should be unavailable
+                raise_exception (bool): Throwing an exception in case of an error
+                max_workers (int): Maximal number of parts executed concurrently
+                kwargs: Additional parameters passed to query
+        Returns:
+                iterator (Iterator): merged iterator of results
+    """
+    if is_batch_get(model, query, kwargs):
+        key = get_hash_key_is_in(model, query)
+        key_query = {key: query[key]}
+        ConditionsSerializer(model, unavailable_attributes).load(data=key_query, raise_exception=raise_exception)
+        values = deduplicate(query[key])
+        instrumentation.increment("split_query.batch_get", len(values), model=model)
+        if NOT_DELETED_QUERY_KEY not in query:
+            return batch_get(model, values, max_workers=max_workers, **kwargs)
+        if kwargs.get("attributes_to_get") is not None and DELETED_AT not in kwargs["attributes_to_get"]:
+            kwargs["attributes_to_get"] = [*kwargs["attributes_to_get"], DELETED_AT]
+        return _iter_not_deleted(batch_get(model, values, max_workers=max_workers, **kwargs))
+    queries = split_query(model, query)
+    instrumentation.increment("split_query.parts", len(queries), model=model)
+    results = make_index_queries(
+        model, queries, unavailable_attributes, raise_exception=raise_exception, max_workers=max_workers, **kwargs
+    )
+    hash_key = get_hash_key_is_in(model, query)
+    if any(k != hash_key and len(query[k]) > MAX_IN_OPERANDS for k in get_is_in_keys(query)):
+        return _iter_unique_items(model, results)
+    return results
@@ -0,0 +1,138 @@
+import os
+import queue
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from pynamodb.pagination import ResultIterator
+
+from pynamodb_utils.pagination import iter_pages
+
+ASYNC_MAX_WORKERS = int(os.environ.get("PYNAMODB_UTILS_ASYNC_MAX_WORKERS", 8))
+BUFFER_SIZE = int(os.environ.get("PYNAMODB_UTILS_SCAN_BUFFER_SIZE", 1000))
+
+_END: Any = object()
+_PUT_TIMEOUT = 0.1
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def get_default_executor() -> Executor:
+    """
+    Function returns bounded executor shared by prefetching iterators, its size is PYNAMODB_UTILS_ASYNC_MAX_WORKERS.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ASYNC_MAX_WORKERS, thread_name_prefix="pynamodb-utils")
+        return _executor
+
+
+class PrefetchIterator(Iterator[Any]):
+    """
+        Iterator over items of query or scan fetching next page on executor while current page is consumed.
+        First page is requested on creation.
+    """
+
+    def __init__(self, result_iterator: ResultIterator, executor: Optional[Executor] = None) -> None:
+        self.result_iterator = result_iterator
+        self._pages = iter_pages(result_iterator)
+        self._executor = executor or get_default_executor()
+        self._next: Optional[Future] = self._executor.submit(self._fetch)
+        self._items: List[Any] = []
+        self._index = 0
+
+    def _fetch(self) -> Any:
+        return next(self._pages, _END)
+
+    def __iter__(self) -> "PrefetchIterator":
+        return self
+
+    def __next__(self) -> Any:
+        while self._index == len(self._items):
+            if self._next is None:
+                raise StopIteration
+            page = self._next.result()
+            if page is _END:
+                self._next = None
+                raise StopIteration
+            self._next = self._executor.submit(self._fetch)
+            self._items, self._index = page, 0
+        item = self._items[self._index]
+        self._index += 1
+        return item
+
+    def close(self) -> None:
+        if self._next is not None:
+            self._next.cancel()
+            self._next = None
+        self._items, self._index = [], 0
+
+
+class _SourceError:
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+def _put(results: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            results.put(item, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _consume(source: Callable[[], Iterable[Any]], results: queue.Queue, stop: threading.Event) -> None:
+    try:
+        if stop.is_set():
+            return
+        for item in source():
+            if not _put(results, item, stop):
+                return
+    except Exception as e:
+        _put(results, _SourceError(e), stop)
+    finally:
+        _put(results, _END, stop)
+
+
+def merge_in_threads(
+    sources: Sequence[Callable[[], Iterable[Any]]],
+    max_workers: Optional[int] = None,
+    buffer_size: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+        Function consumes iterables returned by sources on thread pool and yields their items in order of arrival.
+        Bounded buffer applies backpressure on workers, closing the iterator stops them.
+
+        Parameters:
+                sources (list): Callables returning iterables to consume
+                max_workers (int): Maximal number of sources consumed concurrently
+                buffer_size (int): Maximal number of items buffered ahead of consumer
+        Returns:
+                iterator (Iterator): merged iterator over items of all sources
+    """
+    if not sources:
+        return
+    results: queue.Queue = queue.Queue(maxsize=buffer_size or BUFFER_SIZE)
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=min(max_workers or len(sources), len(sources)))
+    futures = [executor.submit(_consume, source, results, stop) for source in sources]
+    try:
+        pending = len(sources)
+        while pending:
+            item = results.get()
+            if item is _END:
+                pending -= 1
+            elif isinstance(item, _SourceError):
+                raise item.exception
+            else:
+                yield item
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
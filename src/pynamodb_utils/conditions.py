@@ -1,34 +1,91 @@
 import operator
 from functools import reduce
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional
 
 from pynamodb.attributes import Attribute
 from pynamodb.expressions.condition import Condition
 from pynamodb.expressions.operand import Path
 from pynamodb.models import Model
 
-from pynamodb_utils.exceptions import FilterError
+from pynamodb_utils.exceptions import ErrorCollector, FilterError
+from pynamodb_utils.metadata import get_model_metadata
 from pynamodb_utils.parsers import OPERATORS_MAPPING
-from pynamodb_utils.utils import get_attribute, get_available_attributes_list
 
 
-def _is_available(field_path: str, available_attributes: List, raise_exception: bool):
-    if "." in field_path:
+def _is_available(field_path: str, available_attributes: Collection, raise_exception: bool):
+    is_available = field_path in available_attributes
+    if not is_available and "." in field_path:
         _field_path = field_path.split(".", 1)[0] + ".*"
         is_available = _field_path in available_attributes
-    else:
-        is_available = field_path in available_attributes
     if not is_available and raise_exception:
         raise FilterError(
             message={
                 field_path: [
                     f"Parameter {field_path} does not exist."
-                    f" Choose some of available: {', '.join(available_attributes)}"
+                    f" Choose some of available: {', '.join(sorted(available_attributes))}"
                 ]
             }
         )
 
 
+class ConditionLeaf:
+    """
+        Compiled single query key (e.g. ``created_at__lte``) with resolved attribute and operator handler.
+        Binding a value to a leaf skips key parsing and validation.
+    """
+    __slots__ = ("key", "field_path", "attr", "handler", "negate")
+
+    def __init__(self, key: str, field_path: str, attr: Attribute, handler: Callable, negate: bool) -> None:
+        self.key = key
+        self.field_path = field_path
+        self.attr = attr
+        self.handler = handler
+        self.negate = negate
+
+    def bind(self, model: Model, value: Any) -> Condition:
+        condition = self.handler(model, self.field_path, self.attr, value)
+        return ~condition if self.negate else condition
+
+
+def compile_model_condition(
+        model: Model,
+        keys: Iterable[str],
+        raise_exception: bool = True,
+        unavailable_attributes: Optional[List[str]] = None
+) -> List[ConditionLeaf]:
+    """
+        Function validates query keys and compiles them into condition leaves, errors of all keys are raised together
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                keys (iterable): The query keys e.g. ``created_at__lte``
+                raise_exception (bool): boolean value enabling exceptions on missing nested attrs
+                unavailable_attributes (list): list of attributes that should be unavailable
+        Returns:
+                leaves (list): compiled condition leaves
+    """
+    leaves: List[ConditionLeaf] = []
+    errors = ErrorCollector()
+    metadata = get_model_metadata(model)
+    available_attributes = metadata.get_available_attributes(unavailable_attributes)
+    for key in keys:
+        array: List[str] = key.rsplit("__", 1)
+        field_path: str = array[0]
+        operator_name: str = array[1] if len(array) > 1 and array[1] != "not" else ""
+        if operator_name.replace("not_", "") not in OPERATORS_MAPPING:
+            errors.add({key: [f"Operator {operator_name} does not exist."
+                              f" Choose some of available: {', '.join(OPERATORS_MAPPING.keys())}"]})
+            continue
+        with errors.collect():
+            _is_available(field_path, available_attributes, raise_exception)
+            attr: Attribute = metadata.get_attribute(field_path)
+            if isinstance(attr, (Attribute, Path)):
+                negate = 'not_' in operator_name
+                handler = OPERATORS_MAPPING[operator_name.replace("not_", "")]
+                leaves.append(ConditionLeaf(key, field_path, attr, handler, negate))
+    errors.raise_errors()
+    return leaves
+
+
 def create_model_condition(
         model: Model,
         args: Dict[str, Any],
@@ -47,30 +104,51 @@ def create_model_condition(
         Returns:
                 condition (Condition): computed pynamodb condition
     """
-    conditions_list: List[Condition] = []
-    available_attributes: List[str] = get_available_attributes_list(
-        model=model,
-        unavailable_attrs=unavailable_attributes
+    leaves = compile_model_condition(
+        model,
+        keys=args.keys(),
+        raise_exception=raise_exception,
+        unavailable_attributes=unavailable_attributes
     )
-    for key, value in args.items():
-        array: List[str] = key.rsplit("__", 1)
-        field_path: str = array[0]
-        operator_name: str = array[1] if len(array) > 1 and array[1] != "not" else ""
-        if operator_name.replace("not_", "") not in OPERATORS_MAPPING:
-            raise FilterError(
-                message={key: [f"Operator {operator_name} does not exist."
-                               f" Choose some of available: {', '.join(OPERATORS_MAPPING.keys())}"]}
-            )
-        _is_available(field_path, available_attributes, raise_exception)
-        attr: Attribute = get_attribute(model, field_path)
-        if isinstance(attr, (Attribute, Path)):
-            if 'not_' in operator_name:
-                operator_name = operator_name.replace("not_", "")
-                operator_handler = OPERATORS_MAPPING[operator_name]
-                conditions_list.append(~operator_handler(model, field_path, attr, value))
-            else:
-                operator_handler = OPERATORS_MAPPING[operator_name]
-                conditions_list.append(operator_handler(model, field_path, attr, value))
+    conditions_list: List[Condition] = [leaf.bind(model, args[leaf.key]) for leaf in leaves]
     if conditions_list:
         return reduce(_operator, conditions_list)
     return None
+
+
+def compile_projection(
+        model: Model,
+        paths: Iterable[str],
+        raise_exception: bool = True,
+        unavailable_attributes: Optional[List[str]] = None
+) -> List[Path]:
+    """
+        Function validates projected attribute paths and resolves them into document paths,
+        errors of all paths are raised together.
+        Table keys are always projected so that returned items can be identified.
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                paths (iterable): The attribute paths e.g. ``tags.type``
+                raise_exception (bool): boolean value enabling exceptions on missing nested attrs
+                unavailable_attributes (list): list of attributes that should be unavailable
+        Returns:
+                projection (list): document paths used in ``ProjectionExpression``
+    """
+    metadata = get_model_metadata(model)
+    available_attributes = metadata.get_available_attributes(unavailable_attributes)
+    table_keys = [key for key in (model._hash_keyname, model._range_keyname) if key is not None]
+    projection: Dict[str, Path] = {}
+    errors = ErrorCollector()
+    for field_path in table_keys + [path for path in paths if path not in table_keys]:
+        if field_path in projection:
+            continue
+        if field_path not in table_keys:
+            with errors.collect():
+                _is_available(field_path, available_attributes, raise_exception)
+        attr = metadata.get_attribute(field_path)
+        if isinstance(attr, Attribute):
+            projection[field_path] = Path(attr)
+        elif isinstance(attr, Path):
+            projection[field_path] = attr
+    errors.raise_errors()
+    return list(projection.values())
@@ -0,0 +1,285 @@
+import json
+import weakref
+from datetime import datetime, timezone
+from enum import Enum
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from pynamodb.attributes import (Attribute, BinarySetAttribute, BooleanAttribute, ListAttribute, MapAttribute,
+                                 NumberAttribute, NumberSetAttribute, UnicodeAttribute, UnicodeSetAttribute,
+                                 UTCDateTimeAttribute)
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.attributes import DynamicMapAttribute, EnumNumberAttribute, EnumUnicodeAttribute
+from pynamodb_utils.utils import parse_attr
+
+Converter = Callable[[Any], Any]
+
+_IDENTITY_ATTRIBUTES = (UnicodeAttribute, NumberAttribute, BooleanAttribute)
+_DIRECT_GETTERS = (Attribute.__get__, MapAttribute.__get__)
+
+
+def _split_paths(paths: Iterable[str]) -> Dict[str, Optional[List[str]]]:
+    """
+    Function groups dotted paths by top level attribute, None marks path covering attribute entirely.
+    """
+    result: Dict[str, Optional[List[str]]] = {}
+    for path in paths:
+        head, _, tail = path.partition(".")
+        if not tail:
+            result[head] = None
+        elif result.get(head, []) is not None:
+            result.setdefault(head, []).append(tail)
+    return result
+
+
+def _drop_paths(obj: Dict[str, Any], paths: Sequence[str]) -> Dict[str, Any]:
+    for path in paths:
+        *parents, key = path.split(".")
+        target = obj
+        for parent in parents:
+            target = target.get(parent) if isinstance(target, dict) else None
+        if isinstance(target, dict):
+            target.pop(key, None)
+    return obj
+
+
+def _convert_datetime(value: Any) -> Any:
+    return datetime.isoformat(value, sep="T") if isinstance(value, datetime) else parse_attr(value)
+
+
+def _convert_enum(value: Any) -> Any:
+    return value.name if isinstance(value, Enum) else parse_attr(value)
+
+
+def compile_attribute_converter(
+    attr: Attribute, hidden_paths: Sequence[str] = (), projected_paths: Optional[Sequence[str]] = None
+) -> Optional[Converter]:
+    """
+    Function returns converter of attribute value to python primitive, None when value is returned as is.
+    """
+    if isinstance(attr, DynamicMapAttribute):
+        def convert(value: Any) -> Any:
+            result = value.as_dict() if isinstance(value, DynamicMapAttribute) else parse_attr(value)
+            return _drop_paths(result, hidden_paths) if hidden_paths and isinstance(result, dict) else result
+        return convert
+    if isinstance(attr, MapAttribute) and not attr.is_raw():
+        return compile_dict_converter(type(attr), hidden_paths, projected_paths)
+    if hidden_paths:
+        return lambda value: _drop_paths(parse_attr(value), hidden_paths)
+    if isinstance(attr, (EnumNumberAttribute, EnumUnicodeAttribute)):
+        return _convert_enum
+    if isinstance(attr, UTCDateTimeAttribute):
+        return _convert_datetime
+    if type(attr) in _IDENTITY_ATTRIBUTES:
+        return None
+    return parse_attr
+
+
+def compile_dict_converter(
+    cls: Any, hidden_paths: Iterable[str] = (), projected_paths: Optional[Iterable[str]] = None
+) -> Converter:
+    """
+        Function compiles converter of model or map attribute instances to dictionaries.
+        Hidden attributes are skipped, converter per attribute is chosen once based on attribute type.
+        When projected paths are given only projected attributes are converted.
+    """
+    hidden = _split_paths(hidden_paths)
+    projected = _split_paths(projected_paths) if projected_paths is not None else None
+    fields: List[Tuple[str, bool, Optional[Converter]]] = []
+    for name, attr in cls.get_attributes().items():
+        if name in hidden and hidden[name] is None:
+            continue
+        if projected is not None and name not in projected:
+            continue
+        direct = type(attr).__get__ in _DIRECT_GETTERS
+        fields.append((
+            name,
+            direct,
+            compile_attribute_converter(attr, hidden.get(name) or (), projected.get(name) if projected else None),
+        ))
+
+    def convert(obj: Any) -> Any:
+        if obj is None:
+            return None
+        values = obj.attribute_values
+        result = {}
+        for name, direct, convert_value in fields:
+            value = values.get(name) if direct else getattr(obj, name, None)
+            result[name] = value if convert_value is None or value is None else convert_value(value)
+        return result
+
+    return convert
+
+
+_DICT_CONVERTERS: "weakref.WeakKeyDictionary[type, Tuple[Dict, Dict[Optional[Tuple[str, ...]], Converter]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_dict_converter(cls: Any, attributes: Optional[Iterable[str]] = None) -> Converter:
+    """
+    Function returns cached converter of model class respecting ``Meta.invisible_attributes``.
+    Converters limited to projected attribute paths are cached per projection.
+    """
+    source = cls.get_attributes()
+    entry = _DICT_CONVERTERS.get(cls)
+    if entry is None or entry[0] is not source:
+        entry = _DICT_CONVERTERS[cls] = source, {}
+    projection = None if attributes is None else tuple(sorted(set(attributes)))
+    try:
+        return entry[1][projection]
+    except KeyError:
+        convert = entry[1][projection] = compile_dict_converter(
+            cls, getattr(cls.Meta, "invisible_attributes", []), projection
+        )
+        return convert
+
+
+def iter_as_dict(results: Iterable[Any], attributes: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Function lazily converts query or scan results to dictionaries, limited to projected attributes when given.
+    """
+    if attributes is not None:
+        attributes = tuple(attributes)
+    cls = convert = None
+    for item in results:
+        if type(item) is not cls:
+            cls = type(item)
+            convert = get_dict_converter(cls, attributes)
+        started_at = instrumentation.start()
+        result = convert(item)
+        instrumentation.record("as_dict", started_at, model=cls)
+        yield result
+
+
+def _load_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value
+
+
+def _compile_enum_loader(enum: Type[Enum]) -> Converter:
+    def load(value: Any) -> Any:
+        if isinstance(value, enum):
+            return value
+        try:
+            return enum[value]
+        except KeyError:
+            raise ValueError(f"{value} is not member of {', '.join(enum.__members__)}.")
+    return load
+
+
+def _load_set(value: Any) -> Any:
+    return set(value) if isinstance(value, (list, tuple)) else value
+
+
+def _is_typed_map(attr_cls: Any) -> bool:
+    return isinstance(attr_cls, type) and issubclass(attr_cls, MapAttribute) and not attr_cls.is_raw() and not (
+        issubclass(attr_cls, DynamicMapAttribute)
+    )
+
+
+def compile_attribute_loader(attr: Attribute) -> Optional[Converter]:
+    """
+    Function returns loader of python primitive produced by ``as_dict`` back to attribute value,
+    None when value is set as is.
+    """
+    if isinstance(attr, (EnumNumberAttribute, EnumUnicodeAttribute)):
+        return _compile_enum_loader(attr.enum)
+    if isinstance(attr, UTCDateTimeAttribute):
+        return _load_datetime
+    if isinstance(attr, (UnicodeSetAttribute, NumberSetAttribute, BinarySetAttribute)):
+        return _load_set
+    if _is_typed_map(type(attr)):
+        return compile_values_loader(type(attr))
+    if isinstance(attr, ListAttribute) and _is_typed_map(attr.element_type):
+        load_element = compile_values_loader(attr.element_type)
+        element_type = attr.element_type
+        return lambda value: [
+            element_type(**load_element(element)) if isinstance(element, dict) else element for element in value
+        ]
+    return None
+
+
+def compile_values_loader(cls: Any) -> Converter:
+    """
+        Function compiles loader of dictionary produced by ``as_dict`` of model or map attribute class
+        into dictionary of attribute values, loader per attribute is chosen once based on attribute type.
+        Keys which are not attributes of class raise ValueError.
+    """
+    loaders = {name: compile_attribute_loader(attr) for name, attr in cls.get_attributes().items()}
+
+    def load(data: Dict[str, Any]) -> Dict[str, Any]:
+        result = {}
+        for name, value in data.items():
+            try:
+                loader = loaders[name]
+            except KeyError:
+                raise ValueError(f"Attribute {name} specified does not exist")
+            result[name] = value if loader is None or value is None else loader(value)
+        return result
+
+    return load
+
+
+def compile_dict_loader(cls: Any) -> Converter:
+    """
+        Function compiles loader of model instances from dictionaries produced by ``as_dict``.
+        Values of attributes without custom setter are stored directly, skipping descriptors.
+    """
+    load_values = compile_values_loader(cls)
+    direct = frozenset(
+        name for name, attr in cls.get_attributes().items()
+        if type(attr).__set__ is Attribute.__set__ or isinstance(attr, UTCDateTimeAttribute)
+    )
+
+    def load(data: Dict[str, Any]) -> Any:
+        instance = cls(_user_instantiated=False)
+        values = instance.attribute_values
+        for name, value in load_values(data).items():
+            if name in direct:
+                values[name] = value
+            else:
+                setattr(instance, name, value)
+        return instance
+
+    return load
+
+
+_DICT_LOADERS: "weakref.WeakKeyDictionary[type, Tuple[Dict, Converter]]" = weakref.WeakKeyDictionary()
+
+
+def get_dict_loader(cls: Any) -> Converter:
+    """
+    Function returns cached loader of model instances from dictionaries produced by ``as_dict``.
+    """
+    source = cls.get_attributes()
+    entry = _DICT_LOADERS.get(cls)
+    if entry is None or entry[0] is not source:
+        entry = _DICT_LOADERS[cls] = source, compile_dict_loader(cls)
+    return entry[1]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def write_json_lines(
+    results: Iterable[Any], fp: IO[str], attributes: Optional[Iterable[str]] = None, **kwargs
+) -> int:
+    """
+        Function streams query or scan results to file object as JSON lines.
+        Returns number of written lines.
+    """
+    kwargs.setdefault("default", _json_default)
+    dumps = json.JSONEncoder(**kwargs).encode
+    count = 0
+    for item in iter_as_dict(results, attributes):
+        fp.write(dumps(item))
+        fp.write("\n")
+        count += 1
+    return count
@@ -1,3 +1,7 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+
 class Error(Exception):
     def __init__(self, message: dict) -> None:
         self.message = message
@@ -14,3 +18,39 @@ class SerializerError(Error):
 
 class IndexNotFoundError(Exception):
     pass
+
+
+class BatchWriteError(Exception):
+    def __init__(self, message: str, unprocessed_items: list) -> None:
+        self.unprocessed_items = unprocessed_items
+        super().__init__(message)
+
+
+class BatchGetError(Exception):
+    def __init__(self, message: str, unprocessed_keys: list) -> None:
+        self.unprocessed_keys = unprocessed_keys
+        super().__init__(message)
+
+
+class ErrorCollector:
+    """
+        Collects messages of FilterErrors raised inside ``collect`` blocks and raises them as one FilterError.
+    """
+
+    def __init__(self) -> None:
+        self.message: Dict[str, List[Any]] = {}
+
+    @contextmanager
+    def collect(self) -> Iterator[None]:
+        try:
+            yield
+        except FilterError as e:
+            self.add(e.message)
+
+    def add(self, message: dict) -> None:
+        for key, value in message.items():
+            self.message.setdefault(key, []).extend(value if isinstance(value, list) else [value])
+
+    def raise_errors(self) -> None:
+        if self.message:
+            raise FilterError(message=self.message)
@@ -0,0 +1,393 @@
+import argparse
+import csv
+import gzip
+import hashlib
+import importlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_EXCEPTION, Executor, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pynamodb.constants import ITEMS
+from pynamodb.models import Model
+from pynamodb.pagination import ResultIterator
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.concurrency import merge_in_threads
+from pynamodb_utils.converters import _json_default, iter_as_dict
+from pynamodb_utils.metadata import ModelMetadata
+from pynamodb_utils.planner import PROJECTION
+from pynamodb_utils.scan import SCAN_TOTAL_SEGMENTS
+from pynamodb_utils.serializers import QuerySerializer
+from pynamodb_utils.soft_delete import exclude_deleted
+
+EXPORT_FORMATS = ("jsonl", "csv")
+EXPORT_PREFETCH_PAGES = int(os.environ.get("PYNAMODB_UTILS_EXPORT_PREFETCH_PAGES", 2))
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+RawPage = Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]
+PendingPage = Tuple["Future[bytes]", int, Optional[Dict[str, Any]]]
+
+logger = logging.getLogger("pynamodb_utils.export")
+
+
+class Checkpoint:
+    """
+        Progress of exported segment: bytes of output file and rows written, key to resume from and completion.
+        Checkpoint is stored next to output file and replaced atomically after every page.
+    """
+    __slots__ = ("path", "fingerprint", "offset", "count", "last_evaluated_key", "done")
+
+    def __init__(
+        self,
+        path: str,
+        fingerprint: str,
+        offset: int = 0,
+        count: int = 0,
+        last_evaluated_key: Optional[Dict[str, Any]] = None,
+        done: bool = False,
+    ) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self.offset = offset
+        self.count = count
+        self.last_evaluated_key = last_evaluated_key
+        self.done = done
+
+    @classmethod
+    def load(cls, path: str, fingerprint: str) -> "Checkpoint":
+        """ Loads checkpoint of the same export or returns empty checkpoint when there is none """
+        try:
+            with open(path) as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return cls(path, fingerprint)
+        if data.get("fingerprint") != fingerprint:
+            raise ValueError(f"Checkpoint {path} belongs to different export, remove it to start over")
+        return cls(
+            path, fingerprint, data["offset"], data["count"], data.get("last_evaluated_key"), data.get("done", False)
+        )
+
+    def save(self) -> None:
+        data = {
+            "fingerprint": self.fingerprint,
+            "offset": self.offset,
+            "count": self.count,
+            "last_evaluated_key": self.last_evaluated_key,
+            "done": self.done,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(data, fp)
+        os.replace(tmp_path, self.path)
+
+
+def _csv_value(value: Any, dumps: Callable[[Any], str]) -> Any:
+    return dumps(value) if isinstance(value, (dict, list, set, frozenset)) else value
+
+
+class Exporter:
+    """
+        Exports items of table, index query or scan with filter to JSON lines or CSV files, one file per segment.
+        Segments are scanned concurrently, next pages of every segment are fetched while current page is
+        converted and written, bounded prefetch applies backpressure on fetching.
+        Every page is written as separate gzip member and followed by checkpoint,
+        so interrupted export resumes from the last written page of every segment.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        directory: str,
+        query: Optional[dict] = None,
+        export_format: str = "jsonl",
+        compress: bool = True,
+        total_segments: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        prefetch_pages: Optional[int] = None,
+        raise_exception: bool = True,
+        include_deleted: bool = False,
+        convert_workers: Optional[int] = None,
+        **kwargs
+    ) -> None:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format {export_format}, supported are {', '.join(EXPORT_FORMATS)}")
+        self.model = model
+        self.directory = directory
+        self.query = exclude_deleted(model, query or {}, include_deleted)
+        self.export_format = export_format
+        self.compress = compress
+        self.max_workers = max_workers
+        self.prefetch_pages = prefetch_pages or EXPORT_PREFETCH_PAGES
+        self.convert_workers = convert_workers
+        self.kwargs = kwargs
+        self.attributes: Optional[Tuple[str, ...]] = (
+            tuple(self.query[PROJECTION]) if self.query.get(PROJECTION) is not None else None
+        )
+        unavailable_attributes: List[str] = getattr(model.Meta, "query_unavailable_attributes", [])
+        self.index, self.query_kwargs = QuerySerializer(model, unavailable_attributes).load(
+            data=self.query, raise_exception=raise_exception, fallback_to_scan=True
+        )
+        self.total_segments = 1 if self.index is not None else total_segments or SCAN_TOTAL_SEGMENTS
+        if self.total_segments < 1:
+            raise ValueError("total_segments must be positive")
+        self.fingerprint = self._get_fingerprint()
+        self._dumps = json.JSONEncoder(default=_json_default, separators=(",", ":")).encode
+        self._stop = threading.Event()
+
+    def _get_fingerprint(self) -> str:
+        normalized = json.dumps(
+            [
+                self.model.Meta.table_name,
+                ModelMetadata.index_name(self.index) if self.index is not None else None,
+                self.query,
+                self.export_format,
+                self.compress,
+                self.total_segments,
+            ],
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha1(normalized.encode()).hexdigest()
+
+    @property
+    def fieldnames(self) -> List[str]:
+        """ Columns of CSV export, visible top level attributes of model limited to projection """
+        invisible = {path for path in getattr(self.model.Meta, "invisible_attributes", []) if "." not in path}
+        projected = {path.split(".", 1)[0] for path in self.attributes} if self.attributes is not None else None
+        return [
+            name for name in self.model.get_attributes()
+            if name not in invisible and (projected is None or name in projected)
+        ]
+
+    def get_path(self, segment: int) -> str:
+        extension = self.export_format + (".gz" if self.compress else "")
+        return os.path.join(
+            self.directory, f"{self.model.Meta.table_name}-{segment:05}-of-{self.total_segments:05}.{extension}"
+        )
+
+    def _get_result_iterator(self, segment: int, last_evaluated_key: Optional[Dict[str, Any]]) -> ResultIterator:
+        kwargs = instrumentation.consumed_capacity_kwargs(self.kwargs)
+        if self.index is not None:
+            return self.index.query(**self.query_kwargs, last_evaluated_key=last_evaluated_key, **kwargs)
+        return self.model.scan(
+            segment=segment,
+            total_segments=self.total_segments,
+            last_evaluated_key=last_evaluated_key,
+            **self.query_kwargs,
+            **kwargs
+        )
+
+    def _iter_pages(self, segment: int, last_evaluated_key: Optional[Dict[str, Any]]) -> Iterator[RawPage]:
+        result_iterator = instrumentation.instrument_result_iterator(
+            self._get_result_iterator(segment, last_evaluated_key), "export", model=self.model
+        )
+        page_iter = result_iterator.page_iter
+        for page in page_iter:
+            yield page.get(ITEMS) or [], page_iter.last_evaluated_key
+
+    def encode(self, raw_items: Sequence[Dict[str, Any]], header: bool = False) -> bytes:
+        """ Converts raw items of page to lines of export format """
+        rows = iter_as_dict((self.model.from_raw_data(item) for item in raw_items), self.attributes)
+        if self.export_format == "jsonl":
+            return "".join(f"{self._dumps(row)}\n" for row in rows).encode()
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, self.fieldnames, extrasaction="ignore")
+        if header:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow({k: _csv_value(v, self._dumps) for k, v in row.items()})
+        return buffer.getvalue().encode()
+
+    def _write(self, fp: Any, data: bytes) -> None:
+        if self.compress:
+            with gzip.GzipFile(fileobj=fp, mode="wb") as gz:
+                gz.write(data)
+        else:
+            fp.write(data)
+        fp.flush()
+        os.fsync(fp.fileno())
+
+    def _write_page(self, fp: Any, checkpoint: Checkpoint, page: PendingPage) -> None:
+        converted, count, last_evaluated_key = page
+        self._write(fp, converted.result())
+        checkpoint.offset = fp.tell()
+        checkpoint.count += count
+        checkpoint.last_evaluated_key = last_evaluated_key
+        checkpoint.save()
+        instrumentation.increment("export.items", count, model=self.model)
+
+    def export_segment(self, segment: int, converter: Executor) -> int:
+        """
+            Exports segment resuming from its checkpoint, returns number of rows in segment file.
+            Pages are converted on converter while next pages are fetched and converted pages are written in order.
+        """
+        path = self.get_path(segment)
+        checkpoint = Checkpoint.load(path + CHECKPOINT_SUFFIX, self.fingerprint)
+        if checkpoint.done:
+            logger.warning("%s was already exported, pass overwrite to export it again", path)
+            return checkpoint.count
+        if checkpoint.offset == 0 and checkpoint.last_evaluated_key is None and self.export_format == "csv":
+            header: bytes = self.encode([], header=True)
+        else:
+            header = b""
+        mode = "r+b" if os.path.exists(path) else "wb"
+        with open(path, mode) as fp:
+            fp.truncate(checkpoint.offset)
+            fp.seek(checkpoint.offset)
+            if checkpoint.last_evaluated_key is not None or not checkpoint.offset:
+                pages = merge_in_threads(
+                    [partial(self._iter_pages, segment, checkpoint.last_evaluated_key)],
+                    buffer_size=self.prefetch_pages,
+                )
+                pending: Deque[PendingPage] = deque()
+                try:
+                    for raw_items, last_evaluated_key in pages:
+                        if self._stop.is_set():
+                            return checkpoint.count
+                        pending.append(
+                            (converter.submit(self._encode_page, raw_items, header), len(raw_items), last_evaluated_key)
+                        )
+                        header = b""
+                        if len(pending) >= self.prefetch_pages:
+                            self._write_page(fp, checkpoint, pending.popleft())
+                    while pending:
+                        self._write_page(fp, checkpoint, pending.popleft())
+                finally:
+                    pages.close()
+                    for page in pending:
+                        page[0].cancel()
+            if header:
+                self._write(fp, header)
+                checkpoint.offset = fp.tell()
+        checkpoint.done = True
+        checkpoint.save()
+        return checkpoint.count
+
+    def _encode_page(self, raw_items: Sequence[Dict[str, Any]], header: bytes) -> bytes:
+        return header + self.encode(raw_items)
+
+    def remove_files(self) -> None:
+        """ Removes output files and checkpoints of all segments """
+        for segment in range(self.total_segments):
+            path = self.get_path(segment)
+            for name in (path, path + CHECKPOINT_SUFFIX):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    def run(self, overwrite: bool = False) -> Dict[str, int]:
+        """
+            Exports all segments and returns number of rows written to every file.
+            First failing segment stops remaining ones and its exception is raised, export can be resumed.
+            Already exported segments are skipped unless overwrite is set.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if overwrite:
+            self.remove_files()
+        self._stop.clear()
+        max_workers = min(self.max_workers or self.total_segments, self.total_segments)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pynamodb-utils-export") as executor, \
+                ThreadPoolExecutor(
+                    max_workers=self.convert_workers or max_workers, thread_name_prefix="pynamodb-utils-export-convert"
+                ) as converter:
+            futures = {
+                executor.submit(self.export_segment, segment, converter): segment
+                for segment in range(self.total_segments)
+            }
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            errors = [future for future in done if future.exception() is not None]
+            if errors:
+                self._stop.set()
+                for future in futures:
+                    future.cancel()
+                raise errors[0].exception()
+        return {self.get_path(futures[future]): future.result() for future in futures}
+
+
+def export(
+    model: Model,
+    directory: str,
+    query: Optional[dict] = None,
+    export_format: str = "jsonl",
+    compress: bool = True,
+    total_segments: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    overwrite: bool = False,
+    **kwargs
+) -> Dict[str, int]:
+    """
+        Function exports items matching query to JSON lines or CSV files in directory.
+        Query is executed on most suitable index, otherwise table is scanned in parallel segments.
+        Interrupted export started again with the same arguments resumes from checkpoints,
+        finished export is not repeated unless overwrite is set.
+        Soft deleted items are skipped for models with ``Meta.exclude_deleted`` unless include_deleted is passed.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                directory (str): Output directory, one file per segment
+                query (dict): The input dictionary with query, whole table is exported by default
+                export_format (str): ``jsonl`` or ``csv``
+                compress (bool): Compressing files with gzip
+                total_segments (int): Number of segments table is scanned in
+                max_workers (int): Maximal number of segments exported concurrently
+                overwrite (bool): Removing files and checkpoints of previous export before exporting
+                kwargs: Additional parameters passed to ``Exporter``, query or scan
+        Returns:
+                counts (dict): number of rows written to every file
+    """
+    return Exporter(
+        model,
+        directory,
+        query,
+        export_format=export_format,
+        compress=compress,
+        total_segments=total_segments,
+        max_workers=max_workers,
+        **kwargs
+    ).run(overwrite=overwrite)
+
+
+def import_model(path: str) -> Model:
+    """
+    Function imports model class from ``package.module:Model`` path.
+    """
+    module_name, _, name = path.partition(":")
+    if not name:
+        raise ValueError(f"Model path {path} has to be in format package.module:Model")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="pynamodb-utils-export", description="Exports items of pynamodb model to JSON lines or CSV files."
+    )
+    parser.add_argument("model", help="model class, e.g. package.module:Model")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--query", type=json.loads, default=None, help="JSON query, whole table by default")
+    parser.add_argument("--format", dest="export_format", choices=EXPORT_FORMATS, default="jsonl")
+    parser.add_argument("--no-compress", dest="compress", action="store_false", help="write plain files")
+    parser.add_argument("--segments", dest="total_segments", type=int, default=None, help="number of scan segments")
+    parser.add_argument("--workers", dest="max_workers", type=int, default=None, help="segments exported at once")
+    parser.add_argument("--overwrite", action="store_true", help="export again over finished or interrupted export")
+    args = parser.parse_args(argv)
+    counts = export(
+        import_model(args.model),
+        args.directory,
+        args.query,
+        export_format=args.export_format,
+        compress=args.compress,
+        total_segments=args.total_segments,
+        max_workers=args.max_workers,
+        overwrite=args.overwrite,
+    )
+    for path, count in counts.items():
+        print(f"{path}\t{count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import gzip
+import json
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pynamodb.models import Model
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.batch import RateLimiter, batch_write, run_chunks
+from pynamodb_utils.converters import get_dict_loader
+from pynamodb_utils.export import import_model
+from pynamodb_utils.result_cache import invalidate_item
+from pynamodb_utils.soft_delete import update_live_attributes
+from pynamodb_utils.utils import TZ_INFO, get_timestamp
+
+TIMESTAMP_ATTRIBUTES = ("created_at", "updated_at")
+
+Line = Tuple[int, str]
+
+
+class ImportProgress:
+    """
+        Progress of import: number of written items and estimated consumed write capacity units.
+    """
+    __slots__ = ("items", "write_capacity_units", "started_at")
+
+    def __init__(self) -> None:
+        self.items = 0
+        self.write_capacity_units = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def items_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.items / elapsed if elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ImportProgress(items={self.items}, write_capacity_units={self.write_capacity_units}, "
+            f"elapsed={self.elapsed:.1f}s)"
+        )
+
+
+def estimate_write_capacity(item: Dict[str, Any]) -> int:
+    """
+    Function estimates write capacity units consumed by put of serialized item, one unit per started KB.
+    """
+    return max(1, math.ceil(len(json.dumps(item, separators=(",", ":"))) / 1024))
+
+
+def iter_lines(fp: IO[str]) -> Iterator[Line]:
+    """
+    Function yields numbered non empty lines of file object.
+    """
+    for line_number, line in enumerate(fp, 1):
+        if line.strip():
+            yield line_number, line
+
+
+@contextmanager
+def open_source(source: Union[str, IO[str]]) -> Iterator[IO[str]]:
+    """
+    Function opens path of JSON lines file, gzip compressed when path ends with ``.gz``, file objects are passed as is.
+    """
+    if not isinstance(source, str):
+        yield source
+        return
+    with (gzip.open(source, "rt") if source.endswith(".gz") else open(source)) as fp:
+        yield fp
+
+
+def import_json_lines(
+    model: Model,
+    source: Union[str, IO[str]],
+    max_workers: Optional[int] = None,
+    write_capacity: Optional[float] = None,
+    keep_timestamps: bool = False,
+    max_retries: Optional[int] = None,
+    progress: Optional[Callable[[ImportProgress], None]] = None,
+) -> int:
+    """
+        Function streams JSON lines produced by ``as_dict`` or export into table in batches of 25 items.
+        Lines are parsed and converted into model instances on worker threads,
+        batches are written with BatchWriteItem and unprocessed items are retried with exponential backoff.
+        Items get import timestamp as ``created_at`` and ``updated_at`` unless keep_timestamps is set.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                source (str | IO): path of file, optionally gzip compressed, or file object opened for reading text
+                max_workers (int): Maximal number of batches written concurrently
+                write_capacity (float): Write capacity units per second consumed by import at most
+                keep_timestamps (bool): Keeping ``created_at`` and ``updated_at`` of imported items
+                max_retries (int): Maximal number of retries of unprocessed items of batch
+                progress (Callable): Called with ImportProgress after every written batch
+        Returns:
+                count (int): number of imported items
+    """
+    load = get_dict_loader(model)
+    limiter = RateLimiter(write_capacity) if write_capacity else None
+    update_timestamps = not keep_timestamps and all(name in model.get_attributes() for name in TIMESTAMP_ATTRIBUTES)
+    tz_info = getattr(model.Meta, TZ_INFO, None)
+    state = ImportProgress()
+    lock = threading.Lock()
+
+    def write_chunk(lines: List[Line]) -> int:
+        items = []
+        for line_number, line in lines:
+            try:
+                items.append(load(json.loads(line)))
+            except ValueError as e:
+                raise ValueError(f"Line {line_number}: {e}") from e
+        timestamp = get_timestamp(tz_info)
+        for item in items:
+            if update_timestamps:
+                item.created_at = item.updated_at = timestamp
+            update_live_attributes(item)
+        put_items = [item.serialize() for item in items]
+        units = sum(estimate_write_capacity(item) for item in put_items)
+        if limiter is not None:
+            limiter.acquire(units)
+        batch_write(model, put_items=put_items, max_retries=max_retries)
+        for item in items:
+            invalidate_item(model, item)
+        instrumentation.increment("import.items", len(items), model=model)
+        with lock:
+            state.items += len(items)
+            state.write_capacity_units += units
+            if progress is not None:
+                progress(state)
+        return len(items)
+
+    with open_source(source) as fp:
+        return run_chunks(iter_lines(fp), write_chunk, max_workers=max_workers)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="pynamodb-utils-import", description="Imports JSON lines into table of pynamodb model."
+    )
+    parser.add_argument("model", help="model class, e.g. package.module:Model")
+    parser.add_argument("source", help="JSON lines file, gzip compressed when name ends with .gz")
+    parser.add_argument("--workers", dest="max_workers", type=int, default=None, help="batches written at once")
+    parser.add_argument("--write-capacity", type=float, default=None, help="write capacity units per second")
+    parser.add_argument("--keep-timestamps", action="store_true", help="keep created_at and updated_at of items")
+    args = parser.parse_args(argv)
+    reported_at = [0.0]
+
+    def report(state: ImportProgress) -> None:
+        if state.elapsed - reported_at[0] >= 1:
+            reported_at[0] = state.elapsed
+            print(f"{state.items} items, {state.items_per_second:.0f} items/s", file=sys.stderr)
+
+    count = import_json_lines(
+        import_model(args.model),
+        args.source,
+        max_workers=args.max_workers,
+        write_capacity=args.write_capacity,
+        keep_timestamps=args.keep_timestamps,
+        progress=report,
+    )
+    print(count)
+
+
+if __name__ == "__main__":
+    main()
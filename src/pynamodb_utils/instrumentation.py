@@ -0,0 +1,222 @@
+import bisect
+import logging
+import threading
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pynamodb.constants import CAMEL_COUNT, CAPACITY_UNITS, CONSUMED_CAPACITY, SCANNED_COUNT
+from pynamodb.pagination import ResultIterator
+
+Tags = Dict[str, Any]
+
+HANDLERS: List["Instrumentation"] = []
+
+
+class Instrumentation:
+    """
+        Receiver of instrumentation events, subclasses override methods they are interested in.
+        Tag values may be model classes, adapters format them with ``format_tags``.
+    """
+
+    def timing(self, name: str, seconds: float, tags: Tags) -> None:
+        pass
+
+    def increment(self, name: str, value: float, tags: Tags) -> None:
+        pass
+
+
+def add_instrumentation(handler: Instrumentation) -> None:
+    """ Registers instrumentation handler, instrumentation is disabled while no handler is registered """
+    HANDLERS.append(handler)
+
+
+def remove_instrumentation(handler: Instrumentation) -> None:
+    HANDLERS.remove(handler)
+
+
+def is_enabled() -> bool:
+    return bool(HANDLERS)
+
+
+def start() -> Optional[float]:
+    """ Returns start time of measured phase or None when instrumentation is disabled """
+    return perf_counter() if HANDLERS else None
+
+
+def record(name: str, started_at: Optional[float], **tags: Any) -> Optional[float]:
+    """ Emits timing of phase started at ``started_at`` and returns start time of the next phase """
+    if started_at is None:
+        return None
+    now = perf_counter()
+    for handler in HANDLERS:
+        handler.timing(name, now - started_at, tags)
+    return now
+
+
+def increment(name: str, value: float = 1, **tags: Any) -> None:
+    for handler in HANDLERS:
+        handler.increment(name, value, tags)
+
+
+def format_tags(tags: Tags) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, getattr(v, "__name__", None) or str(v)) for k, v in tags.items()))
+
+
+UNLIMITED_RATE = float("inf")
+
+
+def consumed_capacity_kwargs(kwargs: Dict[str, Any], always: bool = False) -> Dict[str, Any]:
+    """
+        Function returns kwargs of ``Model.query`` or ``Model.scan`` requesting total consumed capacity with every page
+        when instrumentation is enabled or always is set.
+        Pynamodb requests consumed capacity whenever ``rate_limit`` is set, so unlimited rate is passed
+        unless the caller limits the rate already.
+    """
+    if not (always or HANDLERS) or kwargs.get("rate_limit"):
+        return kwargs
+    return {**kwargs, "rate_limit": UNLIMITED_RATE}
+
+
+class InstrumentedPageIterator:
+    """
+        Wrapper of pynamodb PageIterator emitting page count, items, scanned items and consumed capacity.
+        Consumed capacity is reported when query was called with ``consumed_capacity_kwargs``.
+    """
+
+    def __init__(self, page_iter: Any, name: str, tags: Tags) -> None:
+        self._page_iter = page_iter
+        self._name = name
+        self._tags = tags
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        started_at = perf_counter()
+        page = next(self._page_iter)
+        record(f"{self._name}.page", started_at, **self._tags)
+        increment(f"{self._name}.pages", 1, **self._tags)
+        increment(f"{self._name}.items", page.get(CAMEL_COUNT, 0), **self._tags)
+        increment(f"{self._name}.scanned_items", page.get(SCANNED_COUNT, 0), **self._tags)
+        increment(
+            f"{self._name}.consumed_capacity",
+            page.get(CONSUMED_CAPACITY, {}).get(CAPACITY_UNITS, 0),
+            **self._tags
+        )
+        return page
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._page_iter, name)
+
+
+def instrument_result_iterator(result_iterator: ResultIterator, name: str, **tags: Any) -> ResultIterator:
+    """
+        Instruments pages fetched by result iterator when instrumentation is enabled,
+        query or scan of result iterator should be called with ``consumed_capacity_kwargs``.
+    """
+    if HANDLERS:
+        result_iterator.page_iter = InstrumentedPageIterator(result_iterator.page_iter, name, tags)
+    return result_iterator
+
+
+class LoggingInstrumentation(Instrumentation):
+    """
+        Instrumentation adapter writing every event to logger.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG) -> None:
+        self.logger = logger or logging.getLogger("pynamodb_utils.instrumentation")
+        self.level = level
+
+    def timing(self, name: str, seconds: float, tags: Tags) -> None:
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s took %.6fs %s", name, seconds, dict(format_tags(tags)))
+
+    def increment(self, name: str, value: float, tags: Tags) -> None:
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s += %s %s", name, value, dict(format_tags(tags)))
+
+
+HISTOGRAM_BUCKETS: List[float] = [1e-6 * 2 ** i for i in range(28)]
+
+
+class Histogram:
+    """
+        Histogram of timings with exponential buckets from 1us to ~2 minutes.
+    """
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.buckets[bisect.bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+
+    def percentile(self, q: float) -> float:
+        """ Returns upper bound of bucket containing q-th percentile """
+        threshold = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.buckets):
+            cumulative += count
+            if cumulative >= threshold and count:
+                return min(HISTOGRAM_BUCKETS[i] if i < len(HISTOGRAM_BUCKETS) else self.max, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class InMemoryInstrumentation(Instrumentation):
+    """
+        Instrumentation adapter aggregating timings into histograms and summing counters per name and tags.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.timings: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+
+    def timing(self, name: str, seconds: float, tags: Tags) -> None:
+        key = (name, format_tags(tags))
+        with self._lock:
+            histogram = self.timings.get(key)
+            if histogram is None:
+                histogram = self.timings[key] = Histogram()
+            histogram.add(seconds)
+
+    def increment(self, name: str, value: float, tags: Tags) -> None:
+        key = (name, format_tags(tags))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def report(self) -> Dict[str, List[Dict[str, Any]]]:
+        """ Returns summaries of histograms and counters grouped by event name """
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for (name, tags), histogram in sorted(self.timings.items()):
+                result.setdefault(name, []).append({"tags": dict(tags), **histogram.summary()})
+            for (name, tags), value in sorted(self.counters.items()):
+                result.setdefault(name, []).append({"tags": dict(tags), "value": value})
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self.timings.clear()
+            self.counters.clear()
@@ -0,0 +1,81 @@
+import threading
+import weakref
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple, Union
+
+from pynamodb.attributes import Attribute
+from pynamodb.indexes import GlobalSecondaryIndex, LocalSecondaryIndex
+from pynamodb.models import Model
+
+from pynamodb_utils.utils import create_index_map, get_attribute, get_attributes_list
+
+
+class ModelMetadata:
+    """
+        Precomputed model metadata: attribute paths, nested attribute lookup table, index map and key schemas.
+    """
+
+    def __init__(self, model: Model) -> None:
+        self.model = model
+        self._attributes_source = model.get_attributes()
+        self.attribute_paths: FrozenSet[str] = frozenset(get_attributes_list(model))
+        self.attributes: Dict[str, Attribute] = {
+            path: get_attribute(model, path) for path in self.attribute_paths if not path.endswith(".*")
+        }
+        self.index_map: Dict[
+            Tuple[str, Optional[str]], Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex]
+        ] = create_index_map(model)
+        self.key_schemas: Dict[str, Tuple[str, Optional[str]]] = {
+            self.index_name(idx): keys for keys, idx in self.index_map.items()
+        }
+        self._available_attributes: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+
+    @staticmethod
+    def index_name(idx: Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex]) -> str:
+        if isinstance(idx, (GlobalSecondaryIndex, LocalSecondaryIndex)):
+            return idx.Meta.index_name
+        return idx.Meta.table_name
+
+    def is_stale(self) -> bool:
+        return self._attributes_source is not self.model.get_attributes()
+
+    def get_available_attributes(self, unavailable_attrs: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+        key = tuple(unavailable_attrs or ())
+        try:
+            return self._available_attributes[key]
+        except KeyError:
+            available = self.attribute_paths.difference(key)
+            self._available_attributes[key] = available
+            return available
+
+    def get_attribute(self, attr_string: str) -> Optional[Attribute]:
+        try:
+            return self.attributes[attr_string]
+        except KeyError:
+            return get_attribute(self.model, attr_string)
+
+
+_REGISTRY: "weakref.WeakKeyDictionary[type, ModelMetadata]" = weakref.WeakKeyDictionary()
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_model_metadata(model: Model) -> ModelMetadata:
+    """
+    Function returns metadata of model class, computing it on first use or after the class was redefined.
+    """
+    metadata = _REGISTRY.get(model)
+    if metadata is None or metadata.is_stale():
+        metadata = ModelMetadata(model)
+        with _REGISTRY_LOCK:
+            _REGISTRY[model] = metadata
+    return metadata
+
+
+def invalidate_model_metadata(model: Optional[Model] = None) -> None:
+    """
+    Function drops cached metadata of given model class or of all model classes.
+    """
+    with _REGISTRY_LOCK:
+        if model is None:
+            _REGISTRY.clear()
+        else:
+            _REGISTRY.pop(model, None)
@@ -1,12 +1,26 @@
-from datetime import timezone
-from typing import Any, List, Optional
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
 from pynamodb.attributes import UTCDateTimeAttribute
 from pynamodb.expressions.condition import Condition
 from pynamodb.models import Model, ResultIterator
 
+from pynamodb_utils import instrumentation
+from pynamodb_utils.aio import AsyncResultIterator
+from pynamodb_utils.batch import batch_write, run_chunks
+from pynamodb_utils.chunking import make_split_query, needs_split
+from pynamodb_utils.converters import get_dict_converter, get_dict_loader, iter_as_dict, write_json_lines
+from pynamodb_utils.importer import ImportProgress, import_json_lines
+from pynamodb_utils.multi_query import make_index_queries
+from pynamodb_utils.pagination import CURSOR_SECRET, Page, query_page
+from pynamodb_utils.planner import get_index_planner
+from pynamodb_utils.point_get import GET_KWARGS, get_item
+from pynamodb_utils.result_cache import cached_query, get_result_cache, invalidate_item
+from pynamodb_utils.scan import parallel_scan
 from pynamodb_utils.serializers import ConditionsSerializer, QuerySerializer
-from pynamodb_utils.utils import get_timestamp, parse_attrs_to_dict
+from pynamodb_utils.soft_delete import exclude_deleted, update_live_attributes
+from pynamodb_utils.utils import TZ_INFO, get_timestamp
 
 
 class JSONQueryModel(Model):
@@ -14,65 +28,316 @@ class JSONQueryModel(Model):
         abstract = True
 
     @classmethod
-    def get_conditions_from_json(cls, query: dict, raise_exception: bool = True) -> Condition:
+    def get_conditions_from_json(
+        cls, query: dict, raise_exception: bool = True, include_deleted: bool = False
+    ) -> Condition:
         """
             Class method parses query dictionary and returns computed pynamodb condition.
 
             Parameters:
                     query (dict): A decimal integer
                     raise_exception (bool): Throwing an exception in case of an error
+                    include_deleted (bool): Including soft deleted items when ``Meta.exclude_deleted`` is set
 
             Returns:
                     condition (Condition): computed pynamodb condition
         """
         query_unavailable_attributes: List[str] = getattr(cls.Meta, "query_unavailable_attributes", [])
-        return ConditionsSerializer(cls, query_unavailable_attributes).load(data=query,
-                                                                            raise_exception=raise_exception)
+        return ConditionsSerializer(cls, query_unavailable_attributes).load(
+            data=exclude_deleted(cls, query, include_deleted), raise_exception=raise_exception)
 
     @classmethod
-    def make_index_query(cls, query: dict, raise_exception: bool = True, **kwargs) -> ResultIterator[Model]:
+    def make_index_query(
+        cls,
+        query: dict,
+        raise_exception: bool = True,
+        use_cache: bool = True,
+        include_deleted: bool = False,
+        max_workers: Optional[int] = None,
+        **kwargs
+    ) -> Union[ResultIterator[Model], Iterator[Model]]:
         """
-            Class method parses query dictionary and executes query on index most suitable index
+            Class method parses query dictionary and executes query on index most suitable index.
+            When ``Meta.result_cache`` is set results are read through the cache.
+            Query pinning full primary key of table is served with GetItem when results are not cached.
+            Query with ``is_in`` on hash key or with more than 100 ``is_in`` values is split into many requests,
+            executed concurrently and not cached.
 
             Parameters:
                     query (dict): A decimal integer
                     raise_exception (bool): Throwing an exception in case of an error
+                    use_cache (bool): Reading results through result cache when it is configured
+                    include_deleted (bool): Including soft deleted items when ``Meta.exclude_deleted`` is set
+                    max_workers (int): Maximal number of requests of split query executed concurrently
 
             Returns:
                     result_iterator (result_iterator): result iterator for optimized query
         """
         query_unavailable_attributes: List[str] = getattr(cls.Meta, "query_unavailable_attributes", [])
+        query = exclude_deleted(cls, query, include_deleted)
+        if needs_split(cls, query):
+            return make_split_query(
+                cls, query, query_unavailable_attributes, raise_exception=raise_exception, max_workers=max_workers,
+                **kwargs
+            )
+        serializer = QuerySerializer(cls, query_unavailable_attributes)
+        cache = get_result_cache(cls) if use_cache else None
+        if cache is None and GET_KWARGS.issuperset(kwargs):
+            point_get = serializer.load_key(data=query, raise_exception=raise_exception)
+            if point_get is not None:
+                key, get_kwargs = point_get
+                return get_item(cls, key, **{**get_kwargs, **kwargs})
+        idx, query_kwargs = serializer.load(data=query, raise_exception=raise_exception)
+        if cache is not None:
+            return cached_query(cls, idx, query, query_kwargs, cache, **kwargs)
+        return instrumentation.instrument_result_iterator(
+            idx.query(**query_kwargs, **instrumentation.consumed_capacity_kwargs(kwargs)), "query", model=cls
+        )
+
+    @classmethod
+    def make_query(
+        cls,
+        query: dict,
+        raise_exception: bool = True,
+        total_segments: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        include_deleted: bool = False,
+        **kwargs
+    ) -> Union[ResultIterator[Model], Iterator[Model]]:
+        """
+            Class method parses query dictionary and executes query on most suitable index.
+            When no index matches the query table is scanned in parallel segments with the same filter condition.
+
+            Parameters:
+                    query (dict): The input dictionary with query
+                    raise_exception (bool): Throwing an exception in case of an error
+                    total_segments (int): Number of segments used by scan fallback
+                    max_workers (int): Maximal number of segments scanned concurrently
+                    include_deleted (bool): Including soft deleted items when ``Meta.exclude_deleted`` is set
+
+            Returns:
+                    result_iterator (Iterator): result iterator of query or merged iterator of scan segments
+        """
+        query_unavailable_attributes: List[str] = getattr(cls.Meta, "query_unavailable_attributes", [])
         idx, query = QuerySerializer(cls, query_unavailable_attributes).load(
-            data=query, raise_exception=raise_exception)
-        return idx.query(**query, **kwargs)
+            data=exclude_deleted(cls, query, include_deleted), raise_exception=raise_exception, fallback_to_scan=True)
+        if idx is None:
+            return parallel_scan(cls, total_segments=total_segments, max_workers=max_workers, **query, **kwargs)
+        return instrumentation.instrument_result_iterator(
+            idx.query(**query, **instrumentation.consumed_capacity_kwargs(kwargs)), "query", model=cls
+        )
+
+    @classmethod
+    def make_index_queries(
+        cls,
+        queries: Sequence[dict],
+        raise_exception: bool = True,
+        merge: bool = True,
+        order_by_range_key: bool = False,
+        max_workers: Optional[int] = None,
+        include_deleted: bool = False,
+        **kwargs
+    ) -> Union[Iterator[Model], List[Iterator[Model]]]:
+        """
+            Class method executes many queries concurrently, queries of the same shape share one compiled plan.
+
+            Parameters:
+                    queries (list): The input dictionaries with queries
+                    raise_exception (bool): Throwing an exception in case of an error
+                    merge (bool): Returning one merged iterator instead of iterator per query
+                    order_by_range_key (bool): Merging results in order of range key of queried index
+                    max_workers (int): Maximal number of queries executed concurrently
+                    include_deleted (bool): Including soft deleted items when ``Meta.exclude_deleted`` is set
+
+            Returns:
+                    result_iterator (Iterator): merged iterator or list of iterators in order of queries
+        """
+        query_unavailable_attributes: List[str] = getattr(cls.Meta, "query_unavailable_attributes", [])
+        return make_index_queries(
+            cls,
+            [exclude_deleted(cls, query, include_deleted) for query in queries],
+            query_unavailable_attributes,
+            raise_exception=raise_exception,
+            merge=merge,
+            order_by_range_key=order_by_range_key,
+            max_workers=max_workers,
+            **kwargs
+        )
+
+    @classmethod
+    def paginate_index_query(
+        cls,
+        query: dict,
+        page_size: int,
+        cursor: Optional[str] = None,
+        raise_exception: bool = True,
+        max_read_capacity: Optional[float] = None,
+        read_page_size: Optional[int] = None,
+        include_deleted: bool = False,
+        **kwargs
+    ) -> Page:
+        """
+            Class method executes query on most suitable index and returns page of exactly page_size items.
+            Pages of DynamoDB are fetched until page is full or consumed read capacity reaches the cap.
+            Cursors are signed with ``Meta.cursor_secret`` or ``PYNAMODB_UTILS_CURSOR_SECRET`` when set.
+
+            Parameters:
+                    query (dict): The input dictionary with query
+                    page_size (int): Number of items in page
+                    cursor (str): Cursor returned with previous page
+                    raise_exception (bool): Throwing an exception in case of an error
+                    max_read_capacity (float): Read capacity units after which partial page is returned
+                    read_page_size (int): Number of items evaluated by single DynamoDB request
+                    include_deleted (bool): Including soft deleted items when ``Meta.exclude_deleted`` is set
+
+            Returns:
+                    page (Page): matching items and opaque cursor of the next page
+        """
+        query_unavailable_attributes: List[str] = getattr(cls.Meta, "query_unavailable_attributes", [])
+        return query_page(
+            cls,
+            exclude_deleted(cls, query, include_deleted),
+            page_size,
+            cursor=cursor,
+            unavailable_attributes=query_unavailable_attributes,
+            raise_exception=raise_exception,
+            max_read_capacity=max_read_capacity,
+            secret=getattr(cls.Meta, "cursor_secret", CURSOR_SECRET),
+            read_page_size=read_page_size,
+            **kwargs
+        )
+
+    @classmethod
+    def amake_index_query(
+        cls,
+        query: dict,
+        raise_exception: bool = True,
+        executor: Optional[Executor] = None,
+        prefetch: bool = True,
+        **kwargs
+    ) -> AsyncResultIterator:
+        """
+            Class method parses query dictionary and returns asynchronous iterator of query on most suitable index.
+            Pages are fetched on bounded executor and next page is prefetched while current one is consumed.
+
+            Parameters:
+                    query (dict): The input dictionary with query
+                    raise_exception (bool): Throwing an exception in case of an error
+                    executor (Executor): Executor fetching pages, shared bounded executor by default
+                    prefetch (bool): Fetching next page while current one is consumed
+
+            Returns:
+                    async_result_iterator (AsyncResultIterator): asynchronous iterator of query results
+        """
+        return AsyncResultIterator(
+            cls.make_index_query(query, raise_exception=raise_exception, use_cache=False, **kwargs),
+            executor=executor,
+            prefetch=prefetch,
+        )
+
+    @classmethod
+    def ascan_from_json(
+        cls,
+        query: dict,
+        raise_exception: bool = True,
+        executor: Optional[Executor] = None,
+        prefetch: bool = True,
+        include_deleted: bool = False,
+        **kwargs
+    ) -> AsyncResultIterator:
+        """
+            Class method parses query dictionary and returns asynchronous iterator of scan with computed condition.
+
+            Parameters:
+                    query (dict): The input dictionary with query
+                    raise_exception (bool): Throwing an exception in case of an error
+                    executor (Executor): Executor fetching pages, shared bounded executor by default
+                    prefetch (bool): Fetching next page while current one is consumed
+                    include_deleted (bool): Including soft deleted items when ``Meta.exclude_deleted`` is set
+
+            Returns:
+                    async_result_iterator (AsyncResultIterator): asynchronous iterator of scan results
+        """
+        condition = cls.get_conditions_from_json(
+            query, raise_exception=raise_exception, include_deleted=include_deleted
+        )
+        return AsyncResultIterator(
+            cls.scan(filter_condition=condition, **kwargs),
+            executor=executor,
+            prefetch=prefetch,
+        )
+
+    @classmethod
+    def explain(cls, query: dict, include_deleted: bool = False) -> Optional[Dict[str, Any]]:
+        """
+            Class method returns index chosen for query and its estimated cost without executing query.
+
+            Parameters:
+                    query (dict): The input dictionary with query
+                    include_deleted (bool): Including soft deleted items when ``Meta.exclude_deleted`` is set
+
+            Returns:
+                    plan (dict): chosen index, keys used on it and estimated cost or None if no index matches
+        """
+        return get_index_planner(cls).explain(cls, exclude_deleted(cls, query, include_deleted))
 
 
 class AsDictModel(Model):
     class Meta:
         abstract = True
 
-    def as_dict(self) -> dict:
-        """ Parses pynamodb model instance to python dict"""
-        invisible_attributes: List[str] = getattr(self.Meta, "invisible_attributes", [])
-        result: dict = parse_attrs_to_dict(self)
-        attr: str
-        for attr in invisible_attributes:
-            self._pop_path(result, attr)
+    def as_dict(self, attributes: Optional[Iterable[str]] = None) -> dict:
+        """ Parses pynamodb model instance to python dict, limited to given attribute paths when provided"""
+        started_at = instrumentation.start()
+        result = get_dict_converter(type(self), attributes)(self)
+        instrumentation.record("as_dict", started_at, model=type(self))
         return result
 
-    @staticmethod
-    def _pop_path(obj: dict, path: str) -> Any:
-        attrs = path.split(".")[::-1]
-        _len = len(attrs)
-        for i in range(len(attrs)):
-            key = attrs[i]
-            if key in obj:
-                if i == _len - 1:
-                    return obj.pop(key)
-                obj = obj[key]
+    @classmethod
+    def from_dict(cls, data: dict) -> Model:
+        """
+            Class method builds model instance from python dict produced by ``as_dict``.
+            Enum names, ISO datetime strings, lists of set attributes and nested maps are converted back.
+
+            Parameters:
+                    data (dict): python dict produced by ``as_dict``
+
+            Returns:
+                    instance (Model): model instance
+        """
+        return get_dict_loader(cls)(data)
+
+    @classmethod
+    def iter_as_dict(cls, results: Iterable[Model], attributes: Optional[Iterable[str]] = None) -> Iterator[dict]:
+        """
+            Class method lazily parses query or scan results to python dicts.
+
+            Parameters:
+                    results (Iterable): result iterator of query or scan
+                    attributes (Iterable): attribute paths included in dicts, e.g. ``PROJECTION`` of query
 
+            Returns:
+                    iterator (Iterator): iterator of python dicts
+        """
+        return iter_as_dict(results, attributes)
 
-TZ_INFO = "TZINFO"
+    @classmethod
+    def write_json_lines(
+        cls, results: Iterable[Model], fp: IO[str], attributes: Optional[Iterable[str]] = None, **kwargs
+    ) -> int:
+        """
+            Class method streams query or scan results to file object as JSON lines.
+
+            Parameters:
+                    results (Iterable): result iterator of query or scan
+                    fp (IO): file object opened for writing text
+                    attributes (Iterable): attribute paths included in lines, e.g. ``PROJECTION`` of query
+                    kwargs: Additional parameters passed to ``json.JSONEncoder``
+
+            Returns:
+                    count (int): number of written lines
+        """
+        return write_json_lines(results, fp, attributes, **kwargs)
 
 
 class TimestampedModel(Model):
@@ -83,20 +348,134 @@ class TimestampedModel(Model):
     class Meta:
         abstract = True
 
-    def update_timestamps(self):
+    def update_timestamps(self, timestamp: Optional[datetime] = None):
         tz_info = getattr(self.Meta, TZ_INFO, None)
         self.created_at = self.created_at.astimezone(tz=tz_info or timezone.utc)
-        self.updated_at = get_timestamp(tz=tz_info)
+        self.updated_at = timestamp or get_timestamp(tz=tz_info)
 
     def save(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True):
         self.update_timestamps()
+        update_live_attributes(self)
         super().save(condition=condition, add_version_condition=add_version_condition)
+        invalidate_item(type(self), self)
 
     def save_without_timestamp_update(self, condition=None):
+        update_live_attributes(self)
         super().save(condition=condition)
+        invalidate_item(type(self), self)
 
     def soft_delete(self, condition=None):
         """ Puts delete_at timestamp """
         tz_info = getattr(self.Meta, TZ_INFO, None)
         self.deleted_at = get_timestamp(tz_info)
+        update_live_attributes(self)
         super().save(condition=condition)
+        invalidate_item(type(self), self)
+
+    @classmethod
+    def bulk_save(
+        cls,
+        items: Iterable["TimestampedModel"],
+        max_workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ) -> int:
+        """
+            Class method saves items in batches of 25 with BatchWriteItem, items of one batch share timestamp.
+            Unprocessed items are retried with exponential backoff.
+
+            Parameters:
+                    items (Iterable): model instances to save
+                    max_workers (int): Maximal number of batches written concurrently
+                    max_retries (int): Maximal number of retries of unprocessed items of batch
+
+            Returns:
+                    count (int): number of saved items
+        """
+        tz_info = getattr(cls.Meta, TZ_INFO, None)
+
+        def write_chunk(chunk: List[TimestampedModel]) -> int:
+            timestamp = get_timestamp(tz_info)
+            for item in chunk:
+                item.update_timestamps(timestamp)
+                update_live_attributes(item)
+            batch_write(cls, put_items=[item.serialize() for item in chunk], max_retries=max_retries)
+            for item in chunk:
+                invalidate_item(cls, item)
+            return len(chunk)
+
+        return run_chunks(items, write_chunk, max_workers=max_workers)
+
+    @classmethod
+    def bulk_soft_delete(
+        cls,
+        items_or_keys: Iterable[Any],
+        max_workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ) -> int:
+        """
+            Class method puts deleted_at timestamp on items in batches of 25 with BatchWriteItem.
+            Keys (hash key or tuple of hash and range key) are fetched with BatchGetItem first,
+            missing items are skipped.
+
+            Parameters:
+                    items_or_keys (Iterable): model instances or keys of items
+                    max_workers (int): Maximal number of batches written concurrently
+                    max_retries (int): Maximal number of retries of unprocessed items of batch
+
+            Returns:
+                    count (int): number of soft deleted items
+        """
+        tz_info = getattr(cls.Meta, TZ_INFO, None)
+
+        def write_chunk(chunk: List[Any]) -> int:
+            items = [item for item in chunk if isinstance(item, Model)]
+            keys = [key for key in chunk if not isinstance(key, Model)]
+            if keys:
+                items.extend(cls.batch_get(keys))
+            if not items:
+                return 0
+            timestamp = get_timestamp(tz_info)
+            for item in items:
+                item.deleted_at = timestamp
+                update_live_attributes(item)
+            batch_write(cls, put_items=[item.serialize() for item in items], max_retries=max_retries)
+            for item in items:
+                invalidate_item(cls, item)
+            return len(items)
+
+        return run_chunks(items_or_keys, write_chunk, max_workers=max_workers)
+
+    @classmethod
+    def bulk_import(
+        cls,
+        source: Union[str, IO[str]],
+        max_workers: Optional[int] = None,
+        write_capacity: Optional[float] = None,
+        keep_timestamps: bool = False,
+        max_retries: Optional[int] = None,
+        progress: Optional[Callable[[ImportProgress], None]] = None,
+    ) -> int:
+        """
+            Class method imports JSON lines produced by ``as_dict`` or export in batches of 25 with BatchWriteItem.
+            Imported items get import timestamp as ``created_at`` and ``updated_at`` unless keep_timestamps is set.
+
+            Parameters:
+                    source (str | IO): path of file, optionally gzip compressed, or file object opened for reading text
+                    max_workers (int): Maximal number of batches written concurrently
+                    write_capacity (float): Write capacity units per second consumed by import at most
+                    keep_timestamps (bool): Keeping ``created_at`` and ``updated_at`` of imported items
+                    max_retries (int): Maximal number of retries of unprocessed items of batch
+                    progress (Callable): Called with ImportProgress after every written batch
+
+            Returns:
+                    count (int): number of imported items
+        """
+        return import_json_lines(
+            cls,
+            source,
+            max_workers=max_workers,
+            write_capacity=write_capacity,
+            keep_timestamps=keep_timestamps,
+            max_retries=max_retries,
+            progress=progress,
+        )
@@ -0,0 +1,137 @@
+import heapq
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from operator import attrgetter
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Union
+
+from pynamodb.indexes import Index
+from pynamodb.models import Model
+
+from pynamodb_utils.concurrency import PrefetchIterator, get_default_executor, merge_in_threads
+from pynamodb_utils.exceptions import SerializerError
+from pynamodb_utils.point_get import GET_KWARGS, batch_get
+from pynamodb_utils.serializers import QuerySerializer
+
+
+def _get_range_key_name(model: Model, idx: Any) -> Optional[str]:
+    attributes = idx.Meta.attributes if isinstance(idx, Index) else model.get_attributes()
+    return next((name for name, attr in attributes.items() if attr.is_range_key), None)
+
+
+class _ExecutorLease:
+    """
+        Executor created for iterators of one call, shut down once all of them are exhausted or closed.
+    """
+
+    def __init__(self, executor: Executor, count: int) -> None:
+        self.executor = executor
+        self._count = count
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            self._count -= 1
+            if self._count == 0:
+                self.executor.shutdown(wait=False)
+
+
+class _LeasedPrefetchIterator(PrefetchIterator):
+    """
+        Prefetching iterator releasing its lease of executor when it is exhausted or closed.
+    """
+
+    def __init__(self, result_iterator: Any, lease: _ExecutorLease) -> None:
+        super().__init__(result_iterator, lease.executor)
+        self._release: Optional[Callable[[], None]] = lease.release
+
+    def _end(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __next__(self) -> Any:
+        try:
+            return super().__next__()
+        except BaseException:
+            self._end()
+            raise
+
+    def close(self) -> None:
+        super().close()
+        self._end()
+
+
+def _merge_ordered(iterators: List[PrefetchIterator], key: Callable[[Any], Any], reverse: bool) -> Iterator[Model]:
+    try:
+        yield from heapq.merge(*iterators, key=key, reverse=reverse)
+    finally:
+        for iterator in iterators:
+            iterator.close()
+
+
+def make_index_queries(
+    model: Model,
+    queries: Sequence[dict],
+    unavailable_attributes: List[str],
+    raise_exception: bool = True,
+    merge: bool = True,
+    order_by_range_key: bool = False,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    **kwargs
+) -> Union[Iterator[Model], List[Iterator[Model]]]:
+    """
+        Function executes many queries on most suitable indexes concurrently.
+        Queries of the same shape share one compiled plan, pages of every query are prefetched on thread pool.
+        Merged queries which all pin full primary key of table are fetched with BatchGetItem instead.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                queries (list): The input dictionaries with queries
+                unavailable_attributes (list): list of attributes that should be unavailable
+                raise_exception (bool): Throwing an exception in case of an error
+                merge (bool): Returning one merged iterator instead of iterator per query
+                order_by_range_key (bool): Merging results in order of range key of queried index
+                max_workers (int): Maximal number of queries executed concurrently
+                executor (Executor): Executor fetching pages of ordered or separate iterators,
+                    executor of max_workers threads created otherwise is shut down when iterators end
+                kwargs: Additional parameters passed to query
+        Returns:
+                iterator (Iterator): merged iterator or list of iterators in order of queries
+    """
+    serializer = QuerySerializer(model, unavailable_attributes)
+    if merge and not order_by_range_key and queries and GET_KWARGS.issuperset(kwargs):
+        point_gets = [serializer.load_key(data=query, raise_exception=raise_exception) for query in queries]
+        projections = {repr(get_kwargs) for _, get_kwargs in filter(None, point_gets)}
+        if all(point_gets) and len(projections) == 1:
+            return batch_get(
+                model, [key for key, _ in point_gets], max_workers=max_workers, **{**point_gets[0][1], **kwargs}
+            )
+    loaded = [serializer.load(data=query, raise_exception=raise_exception) for query in queries]
+
+    if merge and not order_by_range_key:
+        return merge_in_threads(
+            [partial(idx.query, **query, **kwargs) for idx, query in loaded], max_workers=max_workers
+        )
+
+    iterators: List[PrefetchIterator]
+    if executor is None and max_workers and loaded:
+        lease = _ExecutorLease(ThreadPoolExecutor(max_workers=max_workers), len(loaded))
+        iterators = [_LeasedPrefetchIterator(idx.query(**query, **kwargs), lease) for idx, query in loaded]
+    else:
+        executor = executor or get_default_executor()
+        iterators = [PrefetchIterator(idx.query(**query, **kwargs), executor) for idx, query in loaded]
+    if not merge:
+        return iterators
+
+    range_keys = {_get_range_key_name(model, idx) for idx, _ in loaded}
+    if len(range_keys) != 1 or None in range_keys:
+        for iterator in iterators:
+            iterator.close()
+        raise SerializerError(message={"Query": ["Queries have to share range key to be ordered by it"]})
+    return _merge_ordered(
+        iterators,
+        key=attrgetter(range_keys.pop()),
+        reverse=kwargs.get("scan_index_forward") is False,
+    )
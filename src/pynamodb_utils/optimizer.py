@@ -0,0 +1,183 @@
+import os
+from decimal import Decimal, InvalidOperation
+from functools import reduce
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, Type
+
+from pynamodb.constants import BINARY, NUMBER, STRING
+from pynamodb.expressions.condition import And, Between, Comparison, Condition, In, Not, Or
+from pynamodb.expressions.operand import Path, Value, _Operand
+
+MAX_IN_OPERANDS = int(os.environ.get("PYNAMODB_UTILS_MAX_IN_OPERANDS", 100))
+
+
+def flatten_condition(condition: Condition, cls: Type[Condition]) -> List[Condition]:
+    """
+    Function returns operands of nested binary AND/OR conditions of the same type.
+    """
+    operands: List[Condition] = []
+    stack = [condition]
+    while stack:
+        current = stack.pop()
+        if type(current) is cls:
+            stack.extend(reversed(current.values))
+        else:
+            operands.append(current)
+    return operands
+
+
+def _path_key(condition: Condition) -> Optional[Tuple[str, ...]]:
+    path = condition.values[0] if condition.values else None
+    return tuple(path.path) if isinstance(path, Path) else None
+
+
+def conditions_equal(condition1: Condition, condition2: Condition) -> bool:
+    """
+    Function compares condition trees structurally, pynamodb equality does not support nested conditions.
+    """
+    if type(condition1) is not type(condition2) or condition1.operator != condition2.operator:
+        return False
+    if len(condition1.values) != len(condition2.values):
+        return False
+    for value1, value2 in zip(condition1.values, condition2.values):
+        if isinstance(value1, Condition):
+            if not isinstance(value2, Condition) or not conditions_equal(value1, value2):
+                return False
+        elif isinstance(value2, Condition) or not value1._equals_to(value2):
+            return False
+    return True
+
+
+def _structural_key(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, Condition):
+        return type(value), value.operator, tuple(_structural_key(v) for v in value.values)
+    if isinstance(value, _Operand):
+        return type(value), tuple(_structural_key(v) for v in value.values)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _structural_key(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_structural_key(v) for v in value)
+    return value
+
+
+def deduplicate_conditions(operands: List[Condition]) -> List[Condition]:
+    """
+    Function returns operands without structurally equal repetitions, first occurrence is kept.
+    Operands are compared by key of their type, operator, paths and serialized values.
+    """
+    result: List[Condition] = []
+    seen: Set[Hashable] = set()
+    for operand in operands:
+        key = _structural_key(operand)
+        if key not in seen:
+            seen.add(key)
+            result.append(operand)
+    return result
+
+
+def _comparable(operand: Any) -> Optional[Tuple[str, Any]]:
+    if not isinstance(operand, Value):
+        return None
+    ((attr_type, value),) = operand.value.items()
+    if attr_type == NUMBER:
+        try:
+            return attr_type, Decimal(value)
+        except InvalidOperation:
+            return None
+    if attr_type == STRING and isinstance(value, str) or attr_type == BINARY and isinstance(value, bytes):
+        return attr_type, value
+    return None
+
+
+def is_ordered_range(lower: Any, upper: Any) -> bool:
+    """
+        Function returns whether serialized bounds are values of the same type with lower <= upper,
+        DynamoDB rejects BETWEEN with inverted bounds.
+    """
+    lower, upper = _comparable(lower), _comparable(upper)
+    return lower is not None and upper is not None and lower[0] == upper[0] and lower[1] <= upper[1]
+
+
+def merge_ranges(operands: List[Condition]) -> List[Condition]:
+    """
+    Function merges single ``>=`` and single ``<=`` comparison of the same attribute into BETWEEN
+    when bounds are ordered, inverted bounds are kept as AND matching nothing.
+    """
+    bounds: Dict[Tuple[str, ...], Dict[str, List[int]]] = {}
+    for i, operand in enumerate(operands):
+        if type(operand) is Comparison and operand.operator in (">=", "<="):
+            key = _path_key(operand)
+            if key is not None:
+                bounds.setdefault(key, {">=": [], "<=": []})[operand.operator].append(i)
+
+    replaced: Dict[int, Optional[Condition]] = {}
+    for indexes in bounds.values():
+        if len(indexes[">="]) == 1 and len(indexes["<="]) == 1:
+            lower, upper = operands[indexes[">="][0]], operands[indexes["<="][0]]
+            if not is_ordered_range(lower.values[1], upper.values[1]):
+                continue
+            first, second = sorted((indexes[">="][0], indexes["<="][0]))
+            replaced[first] = Between(lower.values[0], lower.values[1], upper.values[1])
+            replaced[second] = None
+    if not replaced:
+        return operands
+    return [replaced.get(i, operand) for i, operand in enumerate(operands) if replaced.get(i, operand) is not None]
+
+
+def merge_equalities(operands: List[Condition]) -> List[Condition]:
+    """
+    Function merges ``=`` comparisons and IN conditions of the same attribute into IN conditions
+    of at most MAX_IN_OPERANDS values.
+    """
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    for i, operand in enumerate(operands):
+        if (type(operand) is Comparison and operand.operator == "=") or type(operand) is In:
+            key = _path_key(operand)
+            if key is not None:
+                groups.setdefault(key, []).append(i)
+
+    replaced: Dict[int, Optional[Condition]] = {}
+    for indexes in groups.values():
+        batches: List[List[int]] = [[]]
+        size = 0
+        for i in indexes:
+            count = len(operands[i].values) - 1
+            if batches[-1] and size + count > MAX_IN_OPERANDS:
+                batches.append([])
+                size = 0
+            batches[-1].append(i)
+            size += count
+        for batch in batches:
+            if len(batch) > 1:
+                path = operands[batch[0]].values[0]
+                replaced[batch[0]] = In(path, *[value for i in batch for value in operands[i].values[1:]])
+                replaced.update((i, None) for i in batch[1:])
+    if not replaced:
+        return operands
+    return [replaced.get(i, operand) for i, operand in enumerate(operands) if replaced.get(i, operand) is not None]
+
+
+def simplify_condition(condition: Optional[Condition]) -> Optional[Condition]:
+    """
+        Function normalizes pynamodb condition tree before execution.
+        Nested AND/OR are flattened, duplicated operands removed, ``>=`` and ``<=`` of the same attribute
+        in AND are merged into BETWEEN, equalities of the same attribute in OR are merged into IN
+        and double negations are removed.
+    """
+    if condition is None:
+        return None
+    cls = type(condition)
+    if cls is Not:
+        inner = simplify_condition(condition.values[0])
+        return inner.values[0] if type(inner) is Not else Not(inner)
+    if cls is not And and cls is not Or:
+        return condition
+
+    operands: List[Condition] = []
+    for operand in flatten_condition(condition, cls):
+        simplified = simplify_condition(operand)
+        operands.extend(flatten_condition(simplified, cls))
+    operands = deduplicate_conditions(operands)
+    operands = merge_ranges(operands) if cls is And else merge_equalities(operands)
+    return reduce(cls, operands)
@@ -0,0 +1,218 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from pynamodb.constants import BATCH_GET_PAGE_LIMIT, CAPACITY_UNITS, CONSUMED_CAPACITY, ITEMS
+from pynamodb.indexes import GlobalSecondaryIndex, Index, LocalSecondaryIndex
+from pynamodb.models import Model
+from pynamodb.pagination import ResultIterator
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.batch import chunked
+from pynamodb_utils.exceptions import SerializerError
+from pynamodb_utils.metadata import ModelMetadata
+from pynamodb_utils.plans import get_query_shape
+from pynamodb_utils.serializers import QuerySerializer
+
+CURSOR_SECRET = os.environ.get("PYNAMODB_UTILS_CURSOR_SECRET")
+PAGE_MAX_READ_CAPACITY = float(os.environ.get("PYNAMODB_UTILS_PAGE_MAX_READ_CAPACITY", 100))
+CURSOR_SIGNATURE_SIZE = 16
+
+
+def iter_pages(result_iterator: ResultIterator) -> Iterator[List[Any]]:
+    """
+        Function iterates result iterator of query or scan page by page.
+        Each page is a list of mapped items, limit of result iterator is respected.
+        Plain iterators, e.g. of split queries, are grouped into pages of BATCH_GET_PAGE_LIMIT items.
+    """
+    if not isinstance(result_iterator, ResultIterator):
+        yield from chunked(result_iterator, BATCH_GET_PAGE_LIMIT)
+        return
+    map_fn = result_iterator._map_fn
+    limit = result_iterator._limit
+    for page in result_iterator.page_iter:
+        items = page.get(ITEMS) or []
+        if limit is not None:
+            items = items[:limit]
+            limit -= len(items)
+        yield [map_fn(item) for item in items] if map_fn else items
+        if limit == 0:
+            return
+
+
+class Page:
+    """
+        Page of query results with opaque cursor of the next page, cursor is None on the last page.
+    """
+    __slots__ = ("items", "cursor", "consumed_capacity")
+
+    def __init__(self, items: List[Any], cursor: Optional[str], consumed_capacity: float = 0) -> None:
+        self.items = items
+        self.cursor = cursor
+        self.consumed_capacity = consumed_capacity
+
+    @property
+    def has_more(self) -> bool:
+        return self.cursor is not None
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode()
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _sign(payload: str, secret: str) -> str:
+    digest = hmac.new(secret.encode(), payload.encode(), hashlib.sha256).digest()
+    return _b64encode(digest[:CURSOR_SIGNATURE_SIZE])
+
+
+def get_plan_id(
+    model: Model, idx: Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex], query: dict
+) -> str:
+    """
+    Function returns short digest identifying model, index and shape of query.
+    """
+    identity = repr((model.Meta.table_name, ModelMetadata.index_name(idx), get_query_shape(query)))
+    return _b64encode(hashlib.sha1(identity.encode()).digest()[:9])
+
+
+def get_query_digest(query: dict) -> str:
+    """
+    Function returns short digest of values bound to query, cursor of query is not accepted by query with other values.
+    """
+    values = json.dumps(query, sort_keys=True, separators=(",", ":"), default=repr)
+    return _b64encode(hashlib.sha1(values.encode()).digest()[:9])
+
+
+def encode_cursor(last_evaluated_key: Dict[str, Any], plan_id: str, secret: Optional[str] = None) -> str:
+    """
+        Function encodes last evaluated key and plan identity into compact url safe cursor.
+        Plan identity is expected to cover values of query, e.g. plan id joined with ``get_query_digest``.
+        Cursor is signed with HMAC when secret is given.
+    """
+    payload = _b64encode(json.dumps([plan_id, last_evaluated_key], separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload, secret)}" if secret else payload
+
+
+def decode_cursor(cursor: str, plan_id: str, secret: Optional[str] = None) -> Dict[str, Any]:
+    """
+        Function decodes cursor into last evaluated key.
+        Cursor created for other query plan, with invalid signature or malformed raises SerializerError.
+    """
+    payload, _, signature = cursor.partition(".")
+    if secret and not hmac.compare_digest(signature, _sign(payload, secret)):
+        raise SerializerError(message={"cursor": ["Invalid cursor signature."]})
+    try:
+        cursor_plan_id, last_evaluated_key = json.loads(_b64decode(payload))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise SerializerError(message={"cursor": ["Malformed cursor."]})
+    if cursor_plan_id != plan_id or not isinstance(last_evaluated_key, dict):
+        raise SerializerError(message={"cursor": ["Cursor does not belong to this query."]})
+    return last_evaluated_key
+
+
+def get_key_attribute_names(
+    model: Model, idx: Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex]
+) -> List[str]:
+    """
+    Function returns DynamoDB names of attributes forming last evaluated key of query on index.
+    """
+    attributes: Iterable[Any] = model.get_attributes().values()
+    if isinstance(idx, Index):
+        attributes = list(attributes) + list(idx.Meta.attributes.values())
+    names: List[str] = []
+    for attr in attributes:
+        if (attr.is_hash_key or attr.is_range_key) and attr.attr_name not in names:
+            names.append(attr.attr_name)
+    return names
+
+
+def query_page(
+    model: Model,
+    query: dict,
+    page_size: int,
+    cursor: Optional[str] = None,
+    unavailable_attributes: Optional[List[str]] = None,
+    raise_exception: bool = True,
+    max_read_capacity: Optional[float] = None,
+    secret: Optional[str] = None,
+    read_page_size: Optional[int] = None,
+    **kwargs
+) -> Page:
+    """
+        Function executes query on most suitable index and returns page of exactly page_size matching items.
+        Following DynamoDB pages are fetched until page is full, results are exhausted
+        or consumed read capacity reaches max_read_capacity.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                query (dict): The input dictionary with query
+                page_size (int): Number of items in page
+                cursor (str): Cursor returned with previous page
+                unavailable_attributes (list): list of attributes that should be unavailable
+                raise_exception (bool): Throwing an exception in case of an error
+                max_read_capacity (float): Read capacity units after which partial page is returned
+                secret (str): Secret used to sign cursors
+                read_page_size (int): Number of items evaluated by single DynamoDB request, page_size by default
+        Returns:
+                page (Page): matching items and cursor of the next page
+    """
+    if page_size < 1:
+        raise SerializerError(message={"page_size": ["Page size has to be positive."]})
+    if max_read_capacity is None:
+        max_read_capacity = PAGE_MAX_READ_CAPACITY
+    idx, query_kwargs = QuerySerializer(model, unavailable_attributes or []).load(query, raise_exception)
+    plan_id = f"{get_plan_id(model, idx, query)}.{get_query_digest(query)}"
+    last_evaluated_key = decode_cursor(cursor, plan_id, secret) if cursor else None
+
+    started_at = instrumentation.start()
+    result_iterator = idx.query(
+        **query_kwargs,
+        last_evaluated_key=last_evaluated_key,
+        page_size=read_page_size or page_size,
+        **instrumentation.consumed_capacity_kwargs(kwargs, always=True)
+    )
+    page_iter = result_iterator.page_iter
+    key_names = get_key_attribute_names(model, idx)
+
+    items: List[Any] = []
+    consumed_capacity = 0.0
+    next_key: Optional[Dict[str, Any]] = None
+    for page in page_iter:
+        consumed_capacity += page.get(CONSUMED_CAPACITY, {}).get(CAPACITY_UNITS, 0)
+        raw_items = page.get(ITEMS) or []
+        for position, item in enumerate(raw_items, 1):
+            items.append(model.from_raw_data(item))
+            if len(items) == page_size:
+                if position < len(raw_items):
+                    next_key = {name: item[name] for name in key_names if name in item}
+                else:
+                    next_key = page_iter.last_evaluated_key
+                break
+        else:
+            next_key = page_iter.last_evaluated_key
+            if next_key is not None and consumed_capacity < max_read_capacity:
+                continue
+        break
+
+    instrumentation.record("query_page", started_at, model=model)
+    instrumentation.increment("query_page.items", len(items), model=model)
+    instrumentation.increment("query_page.consumed_capacity", consumed_capacity, model=model)
+    return Page(
+        items,
+        encode_cursor(next_key, plan_id, secret) if next_key else None,
+        consumed_capacity,
+    )
@@ -1,8 +1,8 @@
 import json
+import os
 from datetime import datetime
-from functools import reduce
-from operator import and_
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from pynamodb import attributes
 from pynamodb.attributes import Attribute
@@ -11,15 +11,72 @@ from pynamodb.expressions.operand import Path
 from pynamodb.models import Model
 
 from pynamodb_utils.attributes import EnumNumberAttribute, EnumUnicodeAttribute
+from pynamodb_utils.cache import LRUCache
 from pynamodb_utils.exceptions import FilterError
+from pynamodb_utils.metadata import get_model_metadata
 
+DATETIME_FORMATS = [
+    "%Y-%m-%dT%H:%M:%S.%f+00:00",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S.%f+00:00",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+]
+DATETIME_CACHE_SIZE = int(os.environ.get("PYNAMODB_UTILS_DATETIME_CACHE_SIZE", 4096))
 
-def parse_string_to_datetime(value: str, field_name: str, *args):
+
+def _parse_iso_datetime(value: str) -> Optional[datetime]:
+    """
+    Function parses any of DATETIME_FORMATS in single pass based on length and separators of value.
+    """
+    length = len(value)
+    if length < 10 or value[4] != "-" or value[7] != "-":
+        return None
+    parts = [value[0:4], value[5:7], value[8:10]]
+    if length > 10:
+        if length < 16 or value[10] not in "T " or value[13] != ":":
+            return None
+        parts += [value[11:13], value[14:16]]
+    if length > 16:
+        if length < 19 or value[16] != ":":
+            return None
+        parts.append(value[17:19])
+    if length > 19:
+        fraction = value[20:-6] if value.endswith("+00:00") else value[20:]
+        if value[19] != "." or not 1 <= len(fraction) <= 6:
+            return None
+        parts.append(fraction.ljust(6, "0"))
+    if not all(part.isdigit() for part in parts):
+        return None
+    try:
+        return datetime(*map(int, parts))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _parse_datetime(value: str) -> Optional[datetime]:
+    result = _parse_iso_datetime(value)
+    if result is not None:
+        return result
     for fmt in DATETIME_FORMATS:
         try:
             return datetime.strptime(value, fmt)
         except ValueError:
             pass
+    return None
+
+
+def parse_string_to_datetime(value: str, field_name: str, *args):
+    if value is None or isinstance(value, datetime):
+        return value
+    result = _parse_datetime(value) if isinstance(value, str) else None
+    if result is not None:
+        return result
     raise FilterError(
         message={
             field_name: [
@@ -29,18 +86,6 @@ def parse_string_to_datetime(value: str, field_name: str, *args):
     )
 
 
-DATETIME_FORMATS = [
-    "%Y-%m-%dT%H:%M:%S.%f+00:00",
-    "%Y-%m-%dT%H:%M:%S.%f",
-    "%Y-%m-%dT%H:%M:%S",
-    "%Y-%m-%dT%H:%M",
-    "%Y-%m-%d %H:%M:%S.%f+00:00",
-    "%Y-%m-%d %H:%M:%S.%f",
-    "%Y-%m-%d %H:%M:%S",
-    "%Y-%m-%d %H:%M",
-    "%Y-%m-%d",
-]
-
 NoneType = type(None)
 
 
@@ -52,8 +97,8 @@ def default_list_parser(value: List[Any], field_name: str, model: Model) -> List
     if isinstance(value, (list, NoneType)):
         return value
     elif isinstance(value, str):
-        field = getattr(model, field_name)
-        _type = field.element_type() if field else attributes.UnicodeAttribute()
+        field = get_model_metadata(model).get_attribute(field_name)
+        _type = field.element_type() if getattr(field, "element_type", None) else attributes.UnicodeAttribute()
         return [_type.deserialize(i) for i in value.split(',')]
     raise FilterError(message={field_name: [f"{value} is not valid type of {field_name}."]})
 
@@ -116,13 +161,13 @@ def default_enum_parser(value: Any, field_name: str, model: Model) -> Any:
     if isinstance(value, NoneType):
         return None
 
-    values = getattr(model, field_name).enum.__members__
-
-    _value = set(value) if isinstance(value, list) else {value}
+    attr = get_model_metadata(model).get_attribute(field_name)
 
-    if _value.issubset(set(values)):
+    if attr.member_names.issuperset(value if isinstance(value, list) else (value,)):
         return value
 
+    values = attr.enum.__members__
+
     raise FilterError(
         message={
             field_name: [
@@ -147,15 +192,44 @@ TYPE_MAPPING = {
 }
 
 
+PARSER_CACHE_SIZE = int(os.environ.get("PYNAMODB_UTILS_PARSER_CACHE_SIZE", 4096))
+_PARSER_CACHE = LRUCache(maxsize=PARSER_CACHE_SIZE)
+
+
+def register_parser(attribute_cls: Type[Attribute], fn: Callable[[Any, str, Model], Any]) -> None:
+    """
+        Function registers parser of filter values for attribute class and its subclasses.
+        Parser is called with value, field name and model.
+    """
+    TYPE_MAPPING[attribute_cls] = fn
+    _PARSER_CACHE.clear()
+
+
+def resolve_parser(attr: Any) -> Callable[[Any, str, Model], Any]:
+    """
+    Function returns parser registered for the closest class in MRO of attribute.
+    """
+    for cls in type(attr).__mro__:
+        parser = TYPE_MAPPING.get(cls)
+        if parser is not None:
+            return parser
+    return default_parser
+
+
+def get_parser(model: Model, field_name: str) -> Callable[[Any, str, Model], Any]:
+    """
+    Function returns cached parser of (nested) field of model.
+    """
+    key = (model, field_name)
+    parser = _PARSER_CACHE.get(key)
+    if parser is None:
+        parser = resolve_parser(get_model_metadata(model).get_attribute(field_name))
+        _PARSER_CACHE.set(key, parser)
+    return parser
+
+
 def parse_value(model: Model, field_name: str, value: Any) -> Any:
-    attrs = field_name.split(".")
-    if len(attrs) == 1:
-        _type = type(getattr(model, field_name))
-        if issubclass(_type, attributes.MapAttribute):
-            return TYPE_MAPPING[attributes.MapAttribute](value, field_name, model)
-        return TYPE_MAPPING[_type](value, field_name, model)
-    else:
-        return TYPE_MAPPING[attributes.MapAttribute](value, field_name, model)
+    return get_parser(model, field_name)(value, field_name, model)
 
 
 def get_equals_condition(model: Model, field_name: str, attr: Attribute, value: Any) -> Condition:
@@ -169,8 +243,19 @@ def get_startswith_condition(model: Model, field_name: str, attr: Attribute, val
     return attr.startswith(parse_value(model, field_name, value))
 
 
+FALSE_EXISTS_VALUES = frozenset(("false", "0"))
+
+
 def get_exists_condition(model: Model, field_name: str, attr: Attribute, value: Any) -> Condition:
-    return attr.exists()
+    """
+    Function returns condition of existence of attribute.
+    Values False, 0, "false" and "0" (case insensitive) return condition of absence of attribute.
+    """
+    if isinstance(value, str):
+        exists = value.strip().lower() not in FALSE_EXISTS_VALUES
+    else:
+        exists = value is None or not isinstance(value, (bool, int, float)) or bool(value)
+    return attr.exists() if exists else attr.does_not_exist()
 
 
 def get_gt_condition(model: Model, field_name: str, attr: Attribute, value: Any) -> Condition:
@@ -189,6 +274,14 @@ def get_lte_condition(model: Model, field_name: str, attr: Attribute, value: Any
     return attr.__le__(parse_value(model, field_name, value))
 
 
+def get_between_condition(model: Model, field_name: str, attr: Attribute, value: Any) -> Condition:
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise FilterError(
+            message={field_name: [f"{value} is not valid range of {field_name}, expected [lower, upper]."]}
+        )
+    return attr.between(parse_value(model, field_name, value[0]), parse_value(model, field_name, value[1]))
+
+
 def get_contains_condition(model: Model, field_name: str, attr: Attribute, value: Any) -> Condition:
     parsed_value = parse_value(model, field_name, value)
     if isinstance(parsed_value, list):
@@ -197,10 +290,11 @@ def get_contains_condition(model: Model, field_name: str, attr: Attribute, value
 
 
 def get_is_in_condition(model: Model, field_name: str, attr: Attribute, value: Any) -> Condition:
-    parsed_value = parse_value(model, field_name, value)
-    if isinstance(parsed_value, list):
-        return reduce(and_, [attr.is_in(item) for item in parsed_value])
-    return attr.is_in(parsed_value)
+    if isinstance(value, list):
+        if not value:
+            raise FilterError(message={field_name: [f"List of values of {field_name} can not be empty."]})
+        return attr.is_in(*[parse_value(model, field_name, item) for item in value])
+    return attr.is_in(parse_value(model, field_name, value))
 
 
 OPERATORS_MAPPING = {
@@ -213,5 +307,6 @@ OPERATORS_MAPPING = {
     "lt": get_lt_condition,
     "gte": get_gte_condition,
     "lte": get_lte_condition,
+    "between": get_between_condition,
     "is_in": get_is_in_condition,
 }
@@ -0,0 +1,294 @@
+import threading
+import weakref
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+from pynamodb.indexes import GlobalSecondaryIndex, LocalSecondaryIndex
+from pynamodb.models import Model
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.metadata import get_model_metadata
+
+STATEMENTS = ("AND", "OR")
+PROJECTION = "PROJECTION"
+RESERVED_KEYS = STATEMENTS + (PROJECTION,)
+ALL_PROJECTION = "ALL"
+KEYS_ONLY_PROJECTION = "KEYS_ONLY"
+
+
+def split_query_key(key: str) -> Tuple[str, str]:
+    """
+    Function splits query key (e.g. ``created_at__lte``) into field path and operator name.
+    """
+    field_path, *operator_name = key.rsplit("__", 1)
+    return field_path, operator_name[0] if operator_name else ""
+
+
+def get_projected_attributes(data: dict) -> Optional[Set[str]]:
+    """
+    Function returns names of top level attributes projected by query or None when query fetches whole items.
+    """
+    projection = data.get(PROJECTION)
+    if projection is None:
+        return None
+    return {path.split(".", 1)[0] for path in projection}
+
+
+def get_referenced_attributes(data: dict) -> Set[str]:
+    """
+    Function returns names of top level attributes referenced anywhere in query.
+    """
+    result = set()
+    for k, v in data.items():
+        if k in STATEMENTS:
+            if v:
+                result |= get_referenced_attributes(v)
+        elif k != PROJECTION:
+            result.add(split_query_key(k)[0].split(".", 1)[0])
+    return result
+
+
+EQUALITY_OPERATORS = ("", "equals")
+RANGE_KEY_OPERATORS = EQUALITY_OPERATORS + ("between", "gte", "lte", "gt", "lt", "startswith")
+
+
+def select_range_key_conditions(conditions: List[Tuple[str, str]]) -> List[str]:
+    """
+        Function selects query keys which can be sent to DynamoDB as sort key condition.
+        DynamoDB accepts single condition on sort key: equality, comparison, BETWEEN or begins_with.
+        Pair of ``gte`` and ``lte`` is selected together and merged into BETWEEN, remaining keys stay in filter.
+
+        Parameters:
+                conditions (list): (operator name, query key) pairs of conditions on range key
+        Returns:
+                keys (list): query keys of sort key condition
+    """
+    by_operator: Dict[str, str] = {}
+    for operator_name, key in conditions:
+        by_operator.setdefault(operator_name, key)
+    for operator_name in EQUALITY_OPERATORS + ("between",):
+        if operator_name in by_operator:
+            return [by_operator[operator_name]]
+    if "gte" in by_operator and "lte" in by_operator:
+        return [by_operator["gte"], by_operator["lte"]]
+    for operator_name in ("gte", "lte", "gt", "lt", "startswith"):
+        if operator_name in by_operator:
+            return [by_operator[operator_name]]
+    return []
+
+
+class IndexCandidate:
+    """
+        Table or secondary index which may serve a query.
+    """
+    __slots__ = ("name", "index", "hash_key", "range_key", "projection_type", "projected_attributes", "is_local")
+
+    def __init__(
+        self,
+        name: str,
+        index: Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex],
+        hash_key: str,
+        range_key: Optional[str],
+        projection_type: str = ALL_PROJECTION,
+        projected_attributes: Optional[FrozenSet[str]] = None,
+        is_local: bool = False,
+    ) -> None:
+        self.name = name
+        self.index = index
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.projection_type = projection_type
+        self.projected_attributes = projected_attributes
+        self.is_local = is_local
+
+    @property
+    def is_table(self) -> bool:
+        return not isinstance(self.index, (GlobalSecondaryIndex, LocalSecondaryIndex))
+
+    def covers(self, attributes: Set[str]) -> bool:
+        return self.projected_attributes is None or attributes <= self.projected_attributes
+
+
+class IndexPlan:
+    """
+        Index chosen for query together with keys used on it and estimated cost.
+    """
+    __slots__ = ("candidate", "cost", "hash_key_query_key", "range_key_query_keys")
+
+    def __init__(
+        self,
+        candidate: IndexCandidate,
+        cost: float,
+        hash_key_query_key: str,
+        range_key_query_keys: List[str],
+    ) -> None:
+        self.candidate = candidate
+        self.cost = cost
+        self.hash_key_query_key = hash_key_query_key
+        self.range_key_query_keys = range_key_query_keys
+
+    @property
+    def index(self) -> Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex]:
+        return self.candidate.index
+
+    def explain(self) -> Dict[str, Any]:
+        return {
+            "index": self.candidate.name,
+            "hash_key": self.candidate.hash_key,
+            "range_key": self.candidate.range_key,
+            "hash_key_condition": self.hash_key_query_key,
+            "range_key_conditions": list(self.range_key_query_keys),
+            "projection": self.candidate.projection_type,
+            "estimated_cost": self.cost,
+        }
+
+
+class IndexPlanner:
+    """
+        Cost based index selection.
+
+        Cost is the estimated number of items read: ``item_count`` divided by cardinality of hash key
+        multiplied by selectivity of conditions which can be applied on range key. Indexes which do not
+        project all attributes are penalized, global indexes not projecting queried attributes are skipped.
+        When query carries projection, indexes covering all projected and queried attributes are preferred
+        as their items are smaller than items of table.
+        Cardinality statistics can be registered per attribute with ``register_statistics``.
+    """
+    RANGE_KEY_SELECTIVITY = {"between": 0.25, "lt": 0.5, "lte": 0.5, "gt": 0.5, "gte": 0.5, "startswith": 0.1}
+    DEFAULT_CARDINALITY = 10
+    DEFAULT_ITEM_COUNT = 1000
+    PARTIAL_PROJECTION_PENALTY = 1.5
+    LOCAL_INDEX_FETCH_PENALTY = 2.0
+    SECONDARY_INDEX_PENALTY = 1.01
+    COVERING_PROJECTION_DISCOUNT = 0.5
+
+    def __init__(self, item_count: Optional[int] = None, statistics: Optional[Dict[str, int]] = None) -> None:
+        self.item_count: int = item_count or self.DEFAULT_ITEM_COUNT
+        self.statistics: Dict[str, int] = dict(statistics or {})
+        self.version: int = 0
+
+    def register_statistics(self, attribute: str, cardinality: int) -> None:
+        """ Registers number of distinct values of attribute """
+        if cardinality < 1:
+            raise ValueError("cardinality must be positive")
+        self.statistics[attribute] = cardinality
+        self.version += 1
+
+    def set_item_count(self, item_count: int) -> None:
+        self.item_count = item_count
+        self.version += 1
+
+    def get_cardinality(self, attribute: str) -> int:
+        return self.statistics.get(attribute, self.DEFAULT_CARDINALITY)
+
+    def get_candidates(self, model: Model) -> List[IndexCandidate]:
+        metadata = get_model_metadata(model)
+        table_keys = {model._hash_keyname, model._range_keyname} - {None}
+        candidates = []
+        for (hash_key, range_key), idx in metadata.index_map.items():
+            if not isinstance(idx, (GlobalSecondaryIndex, LocalSecondaryIndex)):
+                candidates.append(IndexCandidate(metadata.index_name(idx), idx, hash_key, range_key))
+                continue
+            projection = idx.Meta.projection
+            projected_attributes = None
+            if projection.projection_type != ALL_PROJECTION:
+                projected_attributes = frozenset(
+                    table_keys | {hash_key, range_key} | set(projection.non_key_attributes or ())
+                ) - {None}
+            candidates.append(IndexCandidate(
+                metadata.index_name(idx),
+                idx,
+                hash_key,
+                range_key,
+                projection_type=projection.projection_type,
+                projected_attributes=projected_attributes,
+                is_local=isinstance(idx, LocalSecondaryIndex),
+            ))
+        return candidates
+
+    def estimate_cost(
+        self,
+        candidate: IndexCandidate,
+        equals: Dict[str, str],
+        range_key_query_keys: List[str],
+        referenced_attributes: Set[str],
+        projected_attributes: Optional[Set[str]] = None,
+    ) -> Optional[float]:
+        """ Returns estimated cost of query on candidate or None if candidate cannot serve query """
+        if candidate.hash_key not in equals:
+            return None
+        if projected_attributes is not None:
+            referenced_attributes = referenced_attributes | projected_attributes
+        if not candidate.covers(referenced_attributes) and not candidate.is_local and not candidate.is_table:
+            return None
+
+        cost = self.item_count / self.get_cardinality(candidate.hash_key)
+        operators = [split_query_key(k)[1] for k in range_key_query_keys]
+        if len(operators) > 1:
+            cost *= self.RANGE_KEY_SELECTIVITY["between"]
+        elif operators and operators[0] in EQUALITY_OPERATORS:
+            cost /= self.get_cardinality(candidate.range_key)
+        elif operators:
+            cost *= self.RANGE_KEY_SELECTIVITY[operators[0]]
+
+        if candidate.projection_type != ALL_PROJECTION:
+            if projected_attributes is not None and candidate.covers(referenced_attributes):
+                cost *= self.COVERING_PROJECTION_DISCOUNT
+            else:
+                cost *= self.PARTIAL_PROJECTION_PENALTY
+            if not candidate.covers(referenced_attributes):
+                cost *= self.LOCAL_INDEX_FETCH_PENALTY
+        if not candidate.is_table:
+            cost *= self.SECONDARY_INDEX_PENALTY
+        return cost
+
+    def plan(self, model: Model, data: dict) -> Optional[IndexPlan]:
+        """ Returns cheapest index plan for query or None if no index can serve it """
+        started_at = instrumentation.start()
+        equals: Dict[str, str] = {}
+        key_conditions: Dict[str, List[Tuple[str, str]]] = {}
+        for k in data:
+            if k in RESERVED_KEYS:
+                continue
+            field_path, operator_name = split_query_key(k)
+            if operator_name in EQUALITY_OPERATORS:
+                equals[field_path] = k
+            if operator_name in RANGE_KEY_OPERATORS:
+                key_conditions.setdefault(field_path, []).append((operator_name, k))
+        referenced_attributes = get_referenced_attributes(data)
+        projected_attributes = get_projected_attributes(data)
+
+        best: Optional[IndexPlan] = None
+        for candidate in self.get_candidates(model):
+            range_key_query_keys = select_range_key_conditions(key_conditions.get(candidate.range_key, []))
+            cost = self.estimate_cost(
+                candidate, equals, range_key_query_keys, referenced_attributes, projected_attributes
+            )
+            if cost is None or (best is not None and cost >= best.cost):
+                continue
+            best = IndexPlan(candidate, cost, equals[candidate.hash_key], range_key_query_keys)
+        instrumentation.record(
+            "index_planner.plan", started_at, model=model, index=best.candidate.name if best else None
+        )
+        return best
+
+    def explain(self, model: Model, data: dict) -> Optional[Dict[str, Any]]:
+        plan = self.plan(model, data)
+        return plan.explain() if plan is not None else None
+
+
+_PLANNERS: "weakref.WeakKeyDictionary[type, IndexPlanner]" = weakref.WeakKeyDictionary()
+_PLANNERS_LOCK = threading.Lock()
+
+
+def get_index_planner(model: Model) -> IndexPlanner:
+    """
+    Function returns index planner of model, ``Meta.index_planner`` when defined.
+    """
+    planner = getattr(model.Meta, "index_planner", None)
+    if planner is not None:
+        return planner
+    with _PLANNERS_LOCK:
+        planner = _PLANNERS.get(model)
+        if planner is None:
+            planner = _PLANNERS[model] = IndexPlanner()
+    return planner
@@ -0,0 +1,458 @@
+import operator
+import os
+from functools import reduce
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Set, Tuple, Union
+
+from pynamodb.expressions.condition import And, Condition, Or
+from pynamodb.expressions.operand import Path
+from pynamodb.indexes import GlobalSecondaryIndex, LocalSecondaryIndex
+from pynamodb.models import Model
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.cache import LRUCache
+from pynamodb_utils.conditions import ConditionLeaf, compile_model_condition, compile_projection
+from pynamodb_utils.exceptions import ErrorCollector, FilterError, IndexNotFoundError, SerializerError
+from pynamodb_utils.optimizer import deduplicate_conditions, flatten_condition, merge_equalities, merge_ranges
+from pynamodb_utils.parsers import (get_equals_condition, get_gte_condition, get_is_in_condition, get_lte_condition,
+                                    parse_value)
+from pynamodb_utils.planner import (EQUALITY_OPERATORS, PROJECTION, RESERVED_KEYS, IndexPlan, get_index_planner,
+                                    split_query_key)
+
+MAX_QUERY_DEPTH = int(os.environ.get("PYNAMODB_UTILS_MAX_QUERY_DEPTH", 10))
+PLAN_CACHE_SIZE = int(os.environ.get("PYNAMODB_UTILS_PLAN_CACHE_SIZE", 1024))
+
+STATEMENT_OPERATOR_MAP = {"AND": operator.and_, "OR": operator.or_}
+_NESTED_KEYS = frozenset((*STATEMENT_OPERATOR_MAP, PROJECTION))
+EQUALITY_HANDLERS = (get_equals_condition, get_is_in_condition)
+RANGE_HANDLERS = (get_gte_condition, get_lte_condition)
+
+PLAN_CACHE = LRUCache(maxsize=PLAN_CACHE_SIZE)
+
+
+def get_projection_shape(value: Any) -> Tuple[str, ...]:
+    """
+    Function validates projection of query and returns it as hashable tuple of attribute paths.
+    """
+    if isinstance(value, (list, tuple)) and all(isinstance(path, str) for path in value):
+        return tuple(value)
+    raise SerializerError(message={PROJECTION: ["Projection has to be a list of attribute paths."]})
+
+
+def get_query_shape(data: Mapping, depth: int = 0) -> Tuple:
+    """
+    Function computes hashable shape of query (keys, nesting, AND/OR structure and projection) ignoring values.
+    """
+    if depth > MAX_QUERY_DEPTH:
+        raise SerializerError(message={"Query": ["Maximal query depth has been reached."]})
+    if _NESTED_KEYS.isdisjoint(data):
+        return tuple(data)
+    return tuple(
+        (k, get_query_shape(v, depth + 1)) if k in STATEMENT_OPERATOR_MAP and v
+        else (k, get_projection_shape(v)) if k == PROJECTION
+        else k
+        for k, v in data.items()
+    )
+
+
+def _compile_projection(
+    model: Model, data: dict, unavailable_attributes: List[str], raise_exception: bool, *keys: Optional[str]
+) -> Optional[List[Path]]:
+    if data.get(PROJECTION) is None:
+        return None
+    paths = [key for key in keys if key is not None] + list(data[PROJECTION])
+    return compile_projection(model, paths, raise_exception, unavailable_attributes)
+
+
+class _LeafNode:
+    """
+        Leaf of compiled condition layout, path leads from top level query to statement containing the leaf.
+        Only leaves of the same attribute can bind to equal conditions.
+    """
+    __slots__ = ("path", "leaf", "signature")
+
+    def __init__(self, path: Tuple[str, ...], leaf: ConditionLeaf) -> None:
+        self.path = path
+        self.leaf = leaf
+        self.signature: Hashable = leaf.field_path
+
+    def bind(self, model: Model, data: Mapping, errors: ErrorCollector) -> Optional[Condition]:
+        for k in self.path:
+            data = data[k]
+        try:
+            return self.leaf.bind(model, data[self.leaf.key])
+        except FilterError as e:
+            errors.add(e.message)
+            return None
+
+
+def _is_leaf_of(child: Any, handlers: Tuple[Callable, ...]) -> bool:
+    return isinstance(child, _LeafNode) and not child.leaf.negate and child.leaf.handler in handlers
+
+
+class _GroupNode:
+    """
+        AND/OR of compiled condition layout flattened at compile time.
+        Operands are deduplicated only within groups of children which can bind to equal conditions
+        and merged into BETWEEN or IN only when layout has candidate leaves for it.
+    """
+    __slots__ = ("cls", "children", "signature", "duplicates", "merge")
+
+    def __init__(self, cls: type, children: List[Any]) -> None:
+        self.cls = cls
+        self.children = children
+        self.signature: Hashable = (cls, tuple(child.signature for child in children))
+        indexes: Dict[Hashable, List[int]] = {}
+        for i, child in enumerate(children):
+            indexes.setdefault(child.signature, []).append(i)
+        self.duplicates = [group for group in indexes.values() if len(group) > 1]
+        if cls is And:
+            bounds: Dict[str, Set[Callable]] = {}
+            for child in children:
+                if _is_leaf_of(child, RANGE_HANDLERS):
+                    bounds.setdefault(child.leaf.field_path, set()).add(child.leaf.handler)
+            self.merge = any(len(handlers) == len(RANGE_HANDLERS) for handlers in bounds.values())
+        else:
+            paths = [child.leaf.field_path for child in children if _is_leaf_of(child, EQUALITY_HANDLERS)]
+            self.merge = len(set(paths)) != len(paths)
+
+    def bind(self, model: Model, data: Mapping, errors: ErrorCollector) -> Optional[Condition]:
+        operands: List[Condition] = []
+        collapsed = False
+        for child in self.children:
+            operand = child.bind(model, data, errors)
+            if operand is None:
+                continue
+            if type(operand) is self.cls:
+                operands.extend(flatten_condition(operand, self.cls))
+                collapsed = True
+            else:
+                operands.append(operand)
+        if len(operands) != len(self.children) and not collapsed:
+            return reduce(self.cls, operands) if operands else None
+        if collapsed:
+            operands = deduplicate_conditions(operands)
+        elif self.duplicates:
+            dropped = set()
+            for group in self.duplicates:
+                kept = {id(operand) for operand in deduplicate_conditions([operands[i] for i in group])}
+                dropped.update(i for i in group if id(operands[i]) not in kept)
+            operands = [operand for i, operand in enumerate(operands) if i not in dropped]
+        if self.merge or collapsed:
+            operands = merge_ranges(operands) if self.cls is And else merge_equalities(operands)
+        return reduce(self.cls, operands)
+
+
+def _group(cls: type, children: List[Any]) -> _GroupNode:
+    flattened: List[Any] = []
+    for child in children:
+        if isinstance(child, _GroupNode) and child.cls is cls:
+            flattened.extend(child.children)
+        else:
+            flattened.append(child)
+    return _GroupNode(cls, flattened)
+
+
+class ConditionPlan:
+    """
+        Compiled query shape producing pynamodb condition for given query values.
+        Plans are immutable and never modify query, one plan can be bound by many threads at once.
+    """
+    __slots__ = ("model", "statements", "leaves", "operator", "layout")
+
+    def __init__(
+        self,
+        model: Model,
+        statements: List[Tuple[str, "ConditionPlan"]],
+        leaves: List[ConditionLeaf],
+        _operator: Callable = operator.and_,
+    ) -> None:
+        self.model = model
+        self.statements = statements
+        self.leaves = leaves
+        self.operator = _operator
+        self.layout: Optional[Union[_LeafNode, _GroupNode]] = None
+
+    def _compile_layout(self, path: Tuple[str, ...]) -> Optional[Union[_LeafNode, _GroupNode]]:
+        """
+            Compiles simplified layout of condition: statements are ANDed with leaves joined by operator of plan,
+            nested AND/OR are flattened and candidates for BETWEEN and IN are found once per shape.
+        """
+        items: List[Union[_LeafNode, _GroupNode]] = []
+        for k, plan in self.statements:
+            layout = plan._compile_layout((*path, k))
+            if layout is not None:
+                items.append(layout)
+        leaves = [_LeafNode(path, leaf) for leaf in self.leaves]
+        if len(leaves) > 1:
+            items.append(_group(And if self.operator is operator.and_ else Or, leaves))
+        elif leaves:
+            items.append(leaves[0])
+        if len(items) > 1:
+            return _group(And, items)
+        return items[0] if items else None
+
+    @classmethod
+    def compile(
+        cls,
+        model: Model,
+        data: dict,
+        unavailable_attributes: List[str],
+        raise_exception: bool = False,
+        _operator: Callable = operator.and_,
+        depth: int = 0,
+        errors: Optional[ErrorCollector] = None,
+    ) -> "ConditionPlan":
+        """ Compiles query shape, validation errors of all keys are raised together as one FilterError """
+        if depth > MAX_QUERY_DEPTH:
+            raise SerializerError(message={"Query": ["Maximal query depth has been reached."]})
+        if not depth:
+            instrumentation.increment("plans.compiled", kind="conditions", model=model)
+
+        collector = errors or ErrorCollector()
+        statements = [
+            (k, cls.compile(
+                model, data[k], unavailable_attributes, raise_exception, __operator, depth + 1, collector
+            ))
+            for k, __operator in STATEMENT_OPERATOR_MAP.items()
+            if data.get(k)
+        ]
+        leaves: List[ConditionLeaf] = []
+        with collector.collect():
+            leaves = compile_model_condition(
+                model,
+                keys=[k for k in data if k not in RESERVED_KEYS],
+                raise_exception=raise_exception,
+                unavailable_attributes=unavailable_attributes,
+            )
+        if errors is None:
+            collector.raise_errors()
+        plan = cls(model, statements, leaves, _operator)
+        if not depth:
+            plan.layout = plan._compile_layout(())
+        return plan
+
+    def bind(self, data: Mapping, errors: Optional[ErrorCollector] = None) -> Optional[Condition]:
+        """
+            Returns simplified condition for query values, simplification was planned by compile.
+            Errors of all values are raised together or added to errors when collector is given.
+        """
+        collector = errors or ErrorCollector()
+        condition = self.layout.bind(self.model, data, collector) if self.layout is not None else None
+        if errors is None:
+            collector.raise_errors()
+        return condition
+
+
+class QueryPlan:
+    """
+        Compiled query shape with already selected index.
+    """
+    __slots__ = (
+        "model",
+        "index",
+        "hash_key",
+        "hash_key_query_key",
+        "range_key_plan",
+        "filter_plan",
+        "projection",
+        "key_query_keys",
+    )
+
+    def __init__(
+        self,
+        model: Model,
+        index: Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex],
+        hash_key: str,
+        hash_key_query_key: str,
+        range_key_plan: ConditionPlan,
+        filter_plan: ConditionPlan,
+        projection: Optional[List[Path]] = None,
+        key_query_keys: Optional[Tuple[str, ...]] = None,
+    ) -> None:
+        self.model = model
+        self.index = index
+        self.hash_key = hash_key
+        self.hash_key_query_key = hash_key_query_key
+        self.range_key_plan = range_key_plan
+        self.filter_plan = filter_plan
+        self.projection = projection
+        self.key_query_keys = key_query_keys
+
+    @classmethod
+    def compile(
+        cls,
+        model: Model,
+        data: dict,
+        unavailable_attributes: List[str],
+        raise_exception: bool = False,
+    ) -> "QueryPlan":
+        instrumentation.increment("plans.compiled", kind="query", model=model)
+        index_plan = get_index_planner(model).plan(model, data)
+        if index_plan is None:
+            raise IndexNotFoundError("Could not find index for query")
+
+        hash_key_name = index_plan.candidate.hash_key
+        range_keys = index_plan.range_key_query_keys
+        hash_keys = [index_plan.hash_key_query_key]
+        errors = ErrorCollector()
+        range_key_plan = ConditionPlan.compile(
+            model, {_k: data[_k] for _k in range_keys}, unavailable_attributes, raise_exception, errors=errors
+        )
+        filter_plan = ConditionPlan.compile(
+            model,
+            {_k: v for _k, v in data.items() if _k not in range_keys and _k not in hash_keys},
+            unavailable_attributes,
+            raise_exception,
+            errors=errors,
+        )
+        projection = None
+        with errors.collect():
+            projection = _compile_projection(
+                model, data, unavailable_attributes, raise_exception, hash_key_name, index_plan.candidate.range_key
+            )
+        errors.raise_errors()
+        return cls(
+            model,
+            index_plan.index,
+            hash_key_name,
+            index_plan.hash_key_query_key,
+            range_key_plan,
+            filter_plan,
+            projection,
+            _get_key_query_keys(index_plan, data),
+        )
+
+    @property
+    def is_point_get(self) -> bool:
+        """ Whether query pins full primary key of table and can be served with GetItem """
+        return self.key_query_keys is not None
+
+    def bind_key(self, data: Mapping) -> Any:
+        """ Returns primary key of point get, hash key or tuple of hash and range key """
+        errors = ErrorCollector()
+        values = []
+        for query_key in self.key_query_keys or ():
+            field_path = split_query_key(query_key)[0]
+            with errors.collect():
+                value = parse_value(self.model, field_path, data[query_key])
+                if value is None:
+                    raise FilterError(message={field_path: [f"Value of key {field_path} can not be empty."]})
+                values.append(value)
+        errors.raise_errors()
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def bind(self, data: Mapping) -> Tuple[Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex], Dict[str, Any]]:
+        """
+            Returns index and query parameters, errors of all values are raised together.
+            Range key bounds which can not be merged into BETWEEN, e.g. inverted ones,
+            are sent as lower bound key condition and upper bound filter.
+        """
+        errors = ErrorCollector()
+        query: Dict[str, Any] = {}
+        with errors.collect():
+            query["hash_key"] = parse_value(self.model, self.hash_key, data[self.hash_key_query_key])
+        range_key_condition = self.range_key_plan.bind(data, errors)
+        filter_condition = self.filter_plan.bind(data, errors)
+        errors.raise_errors()
+        if isinstance(range_key_condition, And):
+            range_key_condition, *bounds = range_key_condition.values
+            if filter_condition is not None:
+                bounds.append(filter_condition)
+            filter_condition = reduce(operator.and_, bounds)
+        query["range_key_condition"] = range_key_condition
+        query["filter_condition"] = filter_condition
+        if self.projection is not None:
+            query["attributes_to_get"] = self.projection
+        return self.index, query
+
+
+def _get_key_query_keys(index_plan: IndexPlan, data: Mapping) -> Optional[Tuple[str, ...]]:
+    candidate = index_plan.candidate
+    keys = (index_plan.hash_key_query_key, *index_plan.range_key_query_keys)
+    if not candidate.is_table or len(keys) != (2 if candidate.range_key else 1):
+        return None
+    if any(split_query_key(k)[1] not in EQUALITY_OPERATORS for k in keys):
+        return None
+    if any(k not in keys and k != PROJECTION for k in data):
+        return None
+    return keys
+
+
+class ScanPlan:
+    """
+        Compiled query shape for which no index could be found, executed as scan with filter condition.
+    """
+    __slots__ = ("model", "filter_plan", "projection")
+
+    def __init__(self, model: Model, filter_plan: ConditionPlan, projection: Optional[List[Path]] = None) -> None:
+        self.model = model
+        self.filter_plan = filter_plan
+        self.projection = projection
+
+    def bind(self, data: Mapping) -> Tuple[None, Dict[str, Any]]:
+        query: Dict[str, Any] = {"filter_condition": self.filter_plan.bind(data)}
+        if self.projection is not None:
+            query["attributes_to_get"] = self.projection
+        return None, query
+
+
+def _plan_cache_key(
+    kind: str, model: Model, data: dict, unavailable_attributes: List[str], raise_exception: bool, *extra: Hashable
+) -> Hashable:
+    return (kind, model, tuple(unavailable_attributes), bool(raise_exception), get_query_shape(data), *extra)
+
+
+def get_condition_plan(
+    model: Model, data: dict, unavailable_attributes: List[str], raise_exception: bool = False
+) -> ConditionPlan:
+    """
+    Function returns cached condition plan for query shape, compiling it on first use.
+    """
+    return PLAN_CACHE.get_or_create(
+        _plan_cache_key("conditions", model, data, unavailable_attributes, raise_exception),
+        lambda: ConditionPlan.compile(model, data, unavailable_attributes, raise_exception),
+    )
+
+
+def get_query_plan(
+    model: Model,
+    data: dict,
+    unavailable_attributes: List[str],
+    raise_exception: bool = False,
+    fallback_to_scan: bool = False,
+) -> Union[QueryPlan, ScanPlan]:
+    """
+    Function returns cached query plan for query shape, compiling it on first use.
+    Plans are recompiled when statistics of model index planner change.
+    With fallback_to_scan scan plan is returned when no index matches the query.
+    """
+    planner = get_index_planner(model)
+
+    def _compile() -> Union[QueryPlan, ScanPlan]:
+        try:
+            return QueryPlan.compile(model, data, unavailable_attributes, raise_exception)
+        except IndexNotFoundError:
+            if not fallback_to_scan:
+                raise
+        return ScanPlan(
+            model,
+            ConditionPlan.compile(model, data, unavailable_attributes, raise_exception),
+            _compile_projection(model, data, unavailable_attributes, raise_exception),
+        )
+
+    return PLAN_CACHE.get_or_create(
+        _plan_cache_key(
+            "query", model, data, unavailable_attributes, raise_exception, fallback_to_scan, planner, planner.version
+        ),
+        _compile,
+    )
+
+
+def clear_plan_cache(model: Optional[Model] = None) -> None:
+    """
+    Function drops cached plans of given model or all cached plans.
+    """
+    if model is None:
+        PLAN_CACHE.clear()
+    else:
+        PLAN_CACHE.discard(lambda key: key[1] is model)
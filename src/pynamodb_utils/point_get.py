@@ -0,0 +1,147 @@
+import time
+from functools import partial
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from pynamodb.constants import BATCH_GET_PAGE_LIMIT, KEYS, RESPONSES, UNPROCESSED_KEYS
+from pynamodb.exceptions import DoesNotExist
+from pynamodb.models import Model
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.batch import BATCH_MAX_RETRIES, chunked, deduplicate, get_backoff
+from pynamodb_utils.concurrency import merge_in_threads
+from pynamodb_utils.exceptions import BatchGetError
+
+GET_KWARGS = frozenset(("consistent_read", "attributes_to_get"))
+
+
+class PointGetIterator:
+    """
+        Lazy iterator of item fetched by primary key with GetItem, request is sent on first ``next``
+        so that iterator can be consumed on executor. Exposes ``last_evaluated_key`` and ``total_count``
+        like pynamodb ResultIterator, the key is always None since GetItem has no further pages.
+    """
+    last_evaluated_key: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def __init__(self, model: Model, key: Any, **kwargs) -> None:
+        self.model = model
+        self.key = key
+        self.kwargs = kwargs
+        self.total_count = 0
+        self._done = False
+
+    def __iter__(self) -> Iterator[Model]:
+        return self
+
+    def __next__(self) -> Model:
+        if self._done:
+            raise StopIteration
+        self._done = True
+        hash_key, range_key = self.key if isinstance(self.key, (tuple, list)) else (self.key, None)
+        started_at = instrumentation.start()
+        try:
+            item = self.model.get(hash_key, range_key, **self.kwargs)
+        except DoesNotExist:
+            raise StopIteration
+        finally:
+            instrumentation.record("get_item", started_at, model=self.model)
+        self.total_count = 1
+        return item
+
+    def next(self) -> Model:
+        return self.__next__()
+
+
+def get_item(model: Model, key: Any, **kwargs) -> PointGetIterator:
+    """
+        Function fetches item by primary key with GetItem.
+        Returns lazy iterator of single item or empty iterator when item does not exist.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                key (Any): hash key or tuple of hash and range key
+                kwargs: ``consistent_read`` and ``attributes_to_get``
+        Returns:
+                iterator (PointGetIterator): iterator of found item
+    """
+    return PointGetIterator(model, key, **kwargs)
+
+
+def _serialize_key(model: Model, key: Any) -> Dict[str, Any]:
+    hash_key, range_key = key if isinstance(key, (tuple, list)) else (key, None)
+    serialized_hash_key, serialized_range_key = model._serialize_keys(hash_key, range_key)
+    result = {model._hash_key_attribute().attr_name: serialized_hash_key}
+    if serialized_range_key is not None:
+        result[model._range_key_attribute().attr_name] = serialized_range_key
+    return result
+
+
+def _get_chunk(
+    model: Model,
+    keys: List[Any],
+    consistent_read: Optional[bool],
+    attributes_to_get: Optional[Sequence[Any]],
+    max_retries: int,
+) -> List[Model]:
+    items: List[Model] = []
+    keys_to_get = [_serialize_key(model, key) for key in keys]
+    connection = model._get_connection()
+    table_name = model.Meta.table_name
+    attempt = 0
+    while True:
+        started_at = instrumentation.start()
+        data = connection.batch_get_item(
+            keys_to_get, consistent_read=consistent_read, attributes_to_get=attributes_to_get
+        )
+        instrumentation.record("batch_get", started_at, model=model)
+        items.extend(model.from_raw_data(item) for item in (data or {}).get(RESPONSES, {}).get(table_name) or ())
+        unprocessed_keys = (data or {}).get(UNPROCESSED_KEYS, {}).get(table_name, {}).get(KEYS)
+        if not unprocessed_keys:
+            return items
+        instrumentation.increment("batch_get.unprocessed", len(unprocessed_keys), model=model)
+        if attempt >= max_retries:
+            raise BatchGetError(
+                f"{len(unprocessed_keys)} keys left unprocessed after {attempt} retries", unprocessed_keys
+            )
+        time.sleep(get_backoff(attempt))
+        keys_to_get = unprocessed_keys
+        attempt += 1
+
+
+def batch_get(
+    model: Model,
+    keys: Iterable[Any],
+    consistent_read: Optional[bool] = None,
+    attributes_to_get: Optional[Sequence[Any]] = None,
+    max_workers: Optional[int] = None,
+    max_retries: Optional[int] = None,
+) -> Iterator[Model]:
+    """
+        Function fetches items by primary keys with BatchGetItem in chunks of 100 distinct keys.
+        Unprocessed keys are retried with exponential backoff, BatchGetError is raised when retries run out.
+        Chunks are fetched concurrently when max_workers is given, items are returned in order of arrival
+        and missing items are skipped.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                keys (Iterable): hash keys or tuples of hash and range key
+                consistent_read (bool): Using strongly consistent reads
+                attributes_to_get (list): Projected attributes
+                max_workers (int): Maximal number of chunks fetched concurrently
+                max_retries (int): Maximal number of retries of unprocessed keys of chunk
+        Returns:
+                iterator (Iterator): iterator of found items
+    """
+    if max_retries is None:
+        max_retries = BATCH_MAX_RETRIES
+    get_chunk = partial(
+        _get_chunk,
+        model,
+        consistent_read=consistent_read,
+        attributes_to_get=attributes_to_get,
+        max_retries=max_retries,
+    )
+    chunks = list(chunked(deduplicate(keys), BATCH_GET_PAGE_LIMIT))
+    if not max_workers or max_workers < 2 or len(chunks) < 2:
+        return chain.from_iterable(get_chunk(chunk) for chunk in chunks)
+    return merge_in_threads([partial(get_chunk, chunk) for chunk in chunks], max_workers=max_workers)
@@ -0,0 +1,329 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from pynamodb.constants import ITEMS
+from pynamodb.indexes import GlobalSecondaryIndex, LocalSecondaryIndex
+from pynamodb.models import Model
+from pynamodb.pagination import ResultIterator
+
+from pynamodb_utils import instrumentation
+from pynamodb_utils.metadata import ModelMetadata, get_model_metadata
+
+RESULT_CACHE_SIZE = int(os.environ.get("PYNAMODB_UTILS_RESULT_CACHE_SIZE", 1024))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("PYNAMODB_UTILS_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+RESULT_CACHE_TTL = float(os.environ.get("PYNAMODB_UTILS_RESULT_CACHE_TTL", 5))
+RESULT_CACHE_INVALIDATIONS = int(os.environ.get("PYNAMODB_UTILS_RESULT_CACHE_INVALIDATIONS", 4096))
+
+RawItem = Dict[str, Any]
+
+
+class ResultCache:
+    """
+        Backend storing raw items of query results.
+        Entries are tagged with partition of query and keys of returned items, both are plain strings
+        so that external stores can index them. Subclasses implement all methods.
+        Results are stored with version read before query was executed, entry is not stored when its partition
+        or any of its items was invalidated since then.
+    """
+
+    def get(self, key: str) -> Optional[List[RawItem]]:
+        raise NotImplementedError
+
+    def version(self) -> int:
+        """ Returns counter of invalidations """
+        raise NotImplementedError
+
+    def set(
+        self, key: str, items: List[RawItem], partition: str, item_keys: Iterable[str], version: Optional[int] = None
+    ) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, partitions: Iterable[str], item_key: Optional[str] = None) -> None:
+        """ Drops entries of given partitions and entries containing item with given key """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryResultCache(ResultCache):
+    """
+        Thread-safe in-process backend with LRU eviction, time to live and cap on size of stored items in bytes.
+        Size of entry is estimated as length of its JSON encoding, entries larger than cap are not stored.
+        Versions of last RESULT_CACHE_INVALIDATIONS invalidated partitions and items are kept,
+        results older than forgotten invalidations are not stored.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.maxsize: int = RESULT_CACHE_SIZE if maxsize is None else maxsize
+        self.max_bytes: int = RESULT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl: float = RESULT_CACHE_TTL if ttl is None else ttl
+        self.size: int = 0
+        self._data: "OrderedDict[str, Tuple[float, int, str, Tuple[str, ...], List[RawItem]]]" = OrderedDict()
+        self._partitions: Dict[str, Set[str]] = {}
+        self._item_keys: Dict[str, Set[str]] = {}
+        self._version = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten_version = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[List[RawItem]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return entry[4]
+
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def _is_stale(self, version: int, names: Iterable[str]) -> bool:
+        if version < self._forgotten_version:
+            return True
+        return any(self._invalidated.get(name, 0) > version for name in names)
+
+    def set(
+        self, key: str, items: List[RawItem], partition: str, item_keys: Iterable[str], version: Optional[int] = None
+    ) -> None:
+        size = len(json.dumps(items, separators=(",", ":"), default=str))
+        if not self.maxsize or size > self.max_bytes:
+            return
+        item_keys = tuple(item_keys)
+        with self._lock:
+            if version is not None and self._is_stale(version, (partition, *item_keys)):
+                return
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (monotonic() + self.ttl, size, partition, item_keys, items)
+            self.size += size
+            self._partitions.setdefault(partition, set()).add(key)
+            for item_key in item_keys:
+                self._item_keys.setdefault(item_key, set()).add(key)
+            while len(self._data) > self.maxsize or self.size > self.max_bytes:
+                self._remove(next(iter(self._data)))
+
+    def invalidate(self, partitions: Iterable[str], item_key: Optional[str] = None) -> None:
+        with self._lock:
+            keys = set(self._item_keys.get(item_key, ())) if item_key is not None else set()
+            self._version += 1
+            for name in (*partitions, *((item_key,) if item_key is not None else ())):
+                keys |= self._partitions.get(name, set())
+                self._invalidated.pop(name, None)
+                self._invalidated[name] = self._version
+            while len(self._invalidated) > RESULT_CACHE_INVALIDATIONS:
+                _, self._forgotten_version = self._invalidated.popitem(last=False)
+            for key in keys:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._partitions.clear()
+            self._item_keys.clear()
+            self.size = 0
+            self._version += 1
+            self._invalidated.clear()
+            self._forgotten_version = self._version
+
+    def _remove(self, key: str) -> None:
+        _, size, partition, item_keys, _ = self._data.pop(key)
+        self.size -= size
+        _discard_reference(self._partitions, partition, key)
+        for item_key in item_keys:
+            _discard_reference(self._item_keys, item_key, key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+def _discard_reference(references: Dict[str, Set[str]], name: str, key: str) -> None:
+    keys = references.get(name)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del references[name]
+
+
+def get_result_cache(model: Model) -> Optional[ResultCache]:
+    """
+    Function returns result cache configured in ``Meta.result_cache`` of model or None.
+    """
+    return getattr(model.Meta, "result_cache", None)
+
+
+def get_partition(model: Model, index_name: str, serialized_hash_key: Any) -> str:
+    return json.dumps([model.Meta.table_name, index_name, serialized_hash_key], default=str)
+
+
+def _serialize_key(model: Model, name: Optional[str], value: Any) -> Any:
+    if name is None or value is None:
+        return None
+    attr = model.get_attributes().get(name)
+    return attr.serialize(value) if attr is not None else value
+
+
+def get_item_key(model: Model, item: Model) -> str:
+    """
+    Function returns key identifying item in cache entries.
+    """
+    return json.dumps([
+        model.Meta.table_name,
+        _serialize_key(model, model._hash_keyname, getattr(item, model._hash_keyname)),
+        _serialize_key(model, model._range_keyname, getattr(item, model._range_keyname, None)),
+    ], default=str)
+
+
+def get_raw_item_key(model: Model, item: RawItem) -> str:
+    values = []
+    for name in (model._hash_keyname, model._range_keyname):
+        attr = model.get_attributes().get(name) if name else None
+        values.append(attr.get_value(item[attr.attr_name]) if attr and attr.attr_name in item else None)
+    return json.dumps([model.Meta.table_name, *values], default=str)
+
+
+def get_item_partitions(model: Model, item: Model) -> List[str]:
+    """
+    Function returns partitions of table and secondary indexes containing item.
+    """
+    partitions = []
+    for index_name, (hash_key, _) in get_model_metadata(model).key_schemas.items():
+        value = getattr(item, hash_key, None)
+        if value is not None:
+            partitions.append(get_partition(model, index_name, _serialize_key(model, hash_key, value)))
+    return partitions
+
+
+def invalidate_item(model: Model, item: Model) -> None:
+    """
+    Function drops cached results of partitions containing item and results in which item was returned.
+    """
+    cache = get_result_cache(model)
+    if cache is not None:
+        cache.invalidate(get_item_partitions(model, item), get_item_key(model, item))
+        instrumentation.increment("result_cache.invalidate", model=model)
+
+
+def get_cache_key(
+    model: Model,
+    idx: Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex],
+    query: dict,
+    kwargs: Dict[str, Any],
+) -> str:
+    """
+    Function returns digest of model, index, query values and query parameters.
+    """
+    normalized = json.dumps(
+        [model.Meta.table_name, ModelMetadata.index_name(idx), query, sorted(kwargs.items())],
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+class CachingResultIterator:
+    """
+        Iterator of query results storing raw items in result cache once all results were consumed.
+        Results not consumed to the end or invalidated while consumed are not cached.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        result_iterator: ResultIterator,
+        cache: ResultCache,
+        key: str,
+        partition: str,
+        version: int,
+        map_fn: Optional[Callable[[RawItem], Any]] = None,
+        limit: Optional[int] = None,
+    ) -> None:
+        self.model = model
+        self.result_iterator = result_iterator
+        self.cache = cache
+        self.key = key
+        self.partition = partition
+        self.version = version
+        self.map_fn = map_fn
+        self.limit = limit
+        self._items = self._iter_items()
+
+    def _iter_items(self) -> Iterator[Any]:
+        map_fn = self.map_fn
+        limit = self.limit
+        raw_items: List[RawItem] = []
+        for page in self.result_iterator.page_iter:
+            items = page.get(ITEMS) or []
+            if limit is not None:
+                items = items[:limit]
+                limit -= len(items)
+            raw_items.extend(items)
+            for item in items:
+                yield map_fn(item) if map_fn else item
+            if limit == 0:
+                break
+        item_keys = [get_raw_item_key(self.model, item) for item in raw_items]
+        self.cache.set(self.key, raw_items, self.partition, item_keys, version=self.version)
+
+    @property
+    def last_evaluated_key(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        return self.result_iterator.last_evaluated_key
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._items)
+
+
+def cached_query(
+    model: Model,
+    idx: Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex],
+    query: dict,
+    query_kwargs: Dict[str, Any],
+    cache: ResultCache,
+    **kwargs
+) -> Iterator[Model]:
+    """
+        Function returns cached results of query or executes query and caches its results once consumed.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                idx (Index): Index chosen for query
+                query (dict): The input dictionary with query
+                query_kwargs (dict): Parameters of query bound by query serializer
+                cache (ResultCache): Result cache backend
+        Returns:
+                iterator (Iterator): iterator of query results
+    """
+    key = get_cache_key(model, idx, query, kwargs)
+    items = cache.get(key)
+    if items is not None:
+        instrumentation.increment("result_cache.hit", model=model)
+        return iter([model.from_raw_data(item) for item in items])
+    instrumentation.increment("result_cache.miss", model=model)
+    index_name = ModelMetadata.index_name(idx)
+    hash_key = get_model_metadata(model).key_schemas[index_name][0]
+    partition = get_partition(model, index_name, _serialize_key(model, hash_key, query_kwargs["hash_key"]))
+    version = cache.version()
+    result_iterator = instrumentation.instrument_result_iterator(
+        idx.query(**query_kwargs, **instrumentation.consumed_capacity_kwargs(kwargs)), "query", model=model
+    )
+    return CachingResultIterator(
+        model, result_iterator, cache, key, partition, version, map_fn=model.from_raw_data, limit=kwargs.get("limit")
+    )
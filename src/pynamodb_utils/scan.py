@@ -0,0 +1,42 @@
+import os
+from functools import partial
+from typing import Iterator, Optional
+
+from pynamodb.expressions.condition import Condition
+from pynamodb.models import Model
+
+from pynamodb_utils.concurrency import merge_in_threads
+
+SCAN_TOTAL_SEGMENTS = int(os.environ.get("PYNAMODB_UTILS_SCAN_TOTAL_SEGMENTS", 4))
+
+
+def parallel_scan(
+    model: Model,
+    filter_condition: Optional[Condition] = None,
+    total_segments: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    buffer_size: Optional[int] = None,
+    **kwargs,
+) -> Iterator[Model]:
+    """
+        Function scans table in parallel segments and streams items of all segments through one iterator.
+        Items are yielded in order of arrival, bounded buffer applies backpressure on segment workers.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                filter_condition (Condition): Condition applied on every segment
+                total_segments (int): Number of segments table is split to
+                max_workers (int): Maximal number of segments scanned concurrently
+                buffer_size (int): Maximal number of items buffered ahead of consumer
+                kwargs: Additional parameters passed to ``Model.scan``
+        Returns:
+                iterator (Iterator): merged iterator over items of all segments
+    """
+    total_segments = total_segments or SCAN_TOTAL_SEGMENTS
+    if total_segments < 1:
+        raise ValueError("total_segments must be positive")
+    sources = [
+        partial(model.scan, segment=segment, total_segments=total_segments, filter_condition=filter_condition, **kwargs)
+        for segment in range(total_segments)
+    ]
+    return merge_in_threads(sources, max_workers=max_workers, buffer_size=buffer_size)
@@ -1,19 +1,26 @@
-import operator
-import os
 from abc import abstractmethod
-from functools import reduce
-from typing import Any, Dict, List, Tuple, Union
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from pynamodb.indexes import GlobalSecondaryIndex, LocalSecondaryIndex
 from pynamodb.models import Model
 
-from pynamodb_utils.conditions import Condition, FilterError, create_model_condition
+from pynamodb_utils import instrumentation
+from pynamodb_utils.conditions import Condition, FilterError
 
-from .exceptions import SerializerError
-from .parsers import parse_value
-from .utils import create_index_map, pick_index_keys
+from .exceptions import IndexNotFoundError, SerializerError
+from .plans import (MAX_QUERY_DEPTH, STATEMENT_OPERATOR_MAP, ConditionPlan, QueryPlan, ScanPlan,  # NOQA
+                    get_condition_plan, get_query_plan)
 
-MAX_QUERY_DEPTH = int(os.environ.get("PYNAMODB_UTILS_MAX_QUERY_DEPTH", 10))
+
+@contextmanager
+def _serializer_errors() -> Iterator[None]:
+    try:
+        yield
+    except ValueError as e:
+        raise SerializerError(message={"Query": str(e)})
+    except FilterError as e:
+        raise SerializerError(message={"Query": e.message}) from e
 
 
 class Serializer:
@@ -27,53 +34,27 @@ class Serializer:
 
 
 class ConditionsSerializer(Serializer):
-    STATEMENT_OPERATOR_MAP = {"AND": operator.and_, "OR": operator.or_}
+    STATEMENT_OPERATOR_MAP = STATEMENT_OPERATOR_MAP
 
     def __init__(self, model: Model, unavailable_attributes: List[str] = []) -> None:
         self.unavailable_attributes: List[str] = unavailable_attributes
         super().__init__(model)
 
-    def _get_conditions(
-        self,
-        data: dict,
-        raise_exception: bool = False,
-        depth: int = 0,
-        _operator=operator.and_,
-    ):
-        if depth > MAX_QUERY_DEPTH:
-            raise SerializerError(message={"Query": ["Maximal query depth has been reached."]})
-
-        conditions = []
-        for k, __operator in self.STATEMENT_OPERATOR_MAP.items():
-            statement = data.pop(k, None)
-            if statement:
-                conditions.append(
-                    self._get_conditions(
-                        data=statement,
-                        raise_exception=raise_exception,
-                        _operator=__operator,
-                        depth=depth + 1,
-                    )
-                )
-        if data:
-            conditions.append(
-                create_model_condition(
-                    self.model,
-                    args=data,
-                    _operator=_operator,
-                    raise_exception=raise_exception,
-                    unavailable_attributes=self.unavailable_attributes
-                )
-            )
-        return reduce(operator.and_, conditions) if conditions else None
+    def compile(self, data: dict, raise_exception: bool = False) -> ConditionPlan:
+        """
+            Compiles shape of query into reusable plan, plans are cached per model and shape.
+        """
+        with _serializer_errors():
+            return get_condition_plan(self.model, data, self.unavailable_attributes, raise_exception)
 
     def load(self, data: dict, raise_exception: bool = False) -> Condition:
-        try:
-            return self._get_conditions(data, raise_exception)
-        except ValueError as e:
-            raise SerializerError(message={"Query": str(e)})
-        except FilterError as e:
-            raise SerializerError(message={"Query": e.message}) from e
+        started_at = instrumentation.start()
+        plan = self.compile(data, raise_exception)
+        started_at = instrumentation.record("conditions_serializer.compile", started_at, model=self.model)
+        with _serializer_errors():
+            result = plan.bind(data)
+        instrumentation.record("conditions_serializer.bind", started_at, model=self.model)
+        return result
 
 
 class QuerySerializer(Serializer):
@@ -81,53 +62,48 @@ class QuerySerializer(Serializer):
         self.unavailable_attributes: List[str] = unavailable_attributes
         super().__init__(model)
 
-    def _create_query(self, data: dict, raise_exception: bool = False):
-        idx_map = create_index_map(self.model)
-        _equals = {}
-        _rest = {}
-        for k in data:
-            if k not in ("AND", "OR"):
-                _name, *_operator = k.rsplit("__", 1)
-                if _operator in (["equals"], []):
-                    _equals[_name] = data[k]
-                else:
-                    _rest[_name] = data[k]
-
-        preferred_index_key = pick_index_keys(idx_map, _equals, _rest)
-
-        if preferred_index_key is None:
-            raise SerializerError(message={"Query": ["Could not find index for query"]})
-
-        range_key_query = {}
-        range_keys = [_k for _k in data if _k.rsplit("__", 1)[0].startswith(preferred_index_key[1])]
-        hash_keys = [_k for _k in data if _k.rsplit("__", 1)[0].startswith(preferred_index_key[0])]
-        for _k in range_keys:
-            range_key_query[_k] = data[_k]
-            del data[_k]
-
-        for _k in hash_keys:
-            del data[_k]
-        conditions_serializer = ConditionsSerializer(self.model, self.unavailable_attributes)
-        range_key_condition = conditions_serializer.load(
-            range_key_query, raise_exception
-        )
-        condition = conditions_serializer.load(data, raise_exception)
-        hash_key = parse_value(self.model, preferred_index_key[0], _equals[preferred_index_key[0]])
-        result = idx_map[preferred_index_key], {
-            "hash_key": hash_key,
-            "range_key_condition": range_key_condition,
-            "filter_condition": condition,
-        }
-        return result
+    def compile(
+        self,
+        data: dict,
+        raise_exception: bool = False,
+        fallback_to_scan: bool = False
+    ) -> Union[QueryPlan, ScanPlan]:
+        """
+            Compiles shape of query into reusable plan with selected index, plans are cached per model and shape.
+            With fallback_to_scan query without matching index is compiled into scan plan.
+        """
+        with _serializer_errors():
+            try:
+                return get_query_plan(
+                    self.model, data, self.unavailable_attributes, raise_exception, fallback_to_scan
+                )
+            except IndexNotFoundError as e:
+                raise SerializerError(message={"Query": [str(e)]}) from e
 
     def load(
         self,
         data: dict,
-        raise_exception: bool = False
-    ) -> Tuple[Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex], Dict[str, Any]]:
-        try:
-            return self._create_query(data, raise_exception)
-        except ValueError as e:
-            raise SerializerError(message={"Query": str(e)})
-        except FilterError as e:
-            raise SerializerError(message={"Query": e.message})
+        raise_exception: bool = False,
+        fallback_to_scan: bool = False
+    ) -> Tuple[Optional[Union[Model, GlobalSecondaryIndex, LocalSecondaryIndex]], Dict[str, Any]]:
+        """
+            Returns index and query parameters, index is None when query has to be executed as scan.
+        """
+        started_at = instrumentation.start()
+        plan = self.compile(data, raise_exception, fallback_to_scan)
+        started_at = instrumentation.record("query_serializer.compile", started_at, model=self.model)
+        with _serializer_errors():
+            result = plan.bind(data)
+        instrumentation.record("query_serializer.bind", started_at, model=self.model)
+        return result
+
+    def load_key(self, data: dict, raise_exception: bool = False) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """
+            Returns primary key and GetItem parameters when query pins full primary key of table, otherwise None.
+        """
+        plan = self.compile(data, raise_exception)
+        if not isinstance(plan, QueryPlan) or not plan.is_point_get:
+            return None
+        with _serializer_errors():
+            key = plan.bind_key(data)
+        return key, {"attributes_to_get": plan.projection} if plan.projection is not None else {}
@@ -0,0 +1,61 @@
+from typing import Any, Dict
+
+from pynamodb.models import Model
+
+from pynamodb_utils.planner import RESERVED_KEYS, split_query_key
+
+DELETED_AT = "deleted_at"
+NOT_DELETED_QUERY_KEY = f"{DELETED_AT}__not_exists"
+
+
+def is_excluding_deleted(model: Model) -> bool:
+    """
+    Function returns whether queries of model exclude soft deleted items, enabled with ``Meta.exclude_deleted``.
+    """
+    return bool(getattr(model.Meta, "exclude_deleted", False))
+
+
+def get_live_attributes(model: Model) -> Dict[str, str]:
+    """
+    Function returns mapping of attributes to sparse attributes set only on items which are not soft deleted.
+    Mapping is configured with ``Meta.live_attributes``.
+    """
+    return getattr(model.Meta, "live_attributes", None) or {}
+
+
+def exclude_deleted(model: Model, query: dict, include_deleted: bool = False) -> dict:
+    """
+        Function returns copy of query excluding soft deleted items when model is configured to do so.
+        Conditions on attributes with sparse counterpart are moved to the sparse attribute,
+        so that index keyed on it, which contains only items not soft deleted, can serve the query.
+        Query referencing ``deleted_at`` explicitly or called with include_deleted is returned as is.
+
+        Parameters:
+                model (pynamodb.model.Model): Corresponding pynamodb model
+                query (dict): The input dictionary with query
+                include_deleted (bool): Opting out of exclusion, e.g. for administrative queries
+        Returns:
+                query (dict): query excluding soft deleted items
+    """
+    if include_deleted or not is_excluding_deleted(model):
+        return query
+    if any(k not in RESERVED_KEYS and split_query_key(k)[0] == DELETED_AT for k in query):
+        return query
+    live_attributes = get_live_attributes(model)
+    result: Dict[str, Any] = {}
+    for k, v in query.items():
+        field_path, operator_name = split_query_key(k)
+        if k not in RESERVED_KEYS and field_path in live_attributes:
+            k = f"{live_attributes[field_path]}__{operator_name}" if operator_name else live_attributes[field_path]
+        result[k] = v
+    result[NOT_DELETED_QUERY_KEY] = None
+    return result
+
+
+def update_live_attributes(item: Model) -> None:
+    """
+    Function copies values to sparse attributes of item which is not soft deleted and clears them otherwise.
+    """
+    deleted = getattr(item, DELETED_AT, None) is not None
+    for attribute, live_attribute in get_live_attributes(type(item)).items():
+        setattr(item, live_attribute, None if deleted else getattr(item, attribute))
@@ -110,5 +110,8 @@ def get_attribute(model: Model, attr_string: str) -> Optional[Attribute]:
     return result
 
 
+TZ_INFO = "TZINFO"
+
+
 def get_timestamp(tz: timezone = None) -> datetime:
     return datetime.now(tz or timezone.utc)
@@ -59,3 +59,17 @@ def post_table(aws_environ):
     yield Post
 
     Post.delete_table()
+
+
+@pytest.fixture
+def create_posts(post_table):
+    def create(keys, content=None):
+        for i, (name, sub_name) in enumerate(keys):
+            post_table(
+                name=name,
+                sub_name=sub_name,
+                content=content or ("even" if i % 2 == 0 else "odd"),
+                category=post_table.category.enum.finance,
+                tags={"type": "news"},
+            ).save()
+    return create
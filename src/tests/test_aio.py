@@ -0,0 +1,47 @@
+import asyncio
+from unittest.mock import patch
+
+
+def test_amake_index_query(post_table, create_posts):
+    create_posts(("news", f"post-{i:02}") for i in range(10))
+
+    async def run():
+        results = post_table.amake_index_query({"name": "news", "sub_name__gte": "post-05"}, page_size=2)
+        pages = [page async for page in results.pages]
+        return pages
+
+    pages = asyncio.run(run())
+    assert [[p.sub_name for p in page] for page in pages if page] == [
+        ["post-05", "post-06"], ["post-07", "post-08"], ["post-09"]
+    ]
+
+
+def test_ascan_from_json(post_table, create_posts):
+    create_posts(("news", f"post-{i:02}") for i in range(10))
+
+    async def run():
+        items = await post_table.ascan_from_json({"content": "odd"}, page_size=3).to_list()
+        results = post_table.ascan_from_json({}, page_size=1)
+        first = await results.__anext__()
+        await results.aclose()
+        return items, first, [item async for item in results]
+
+    items, first, rest = asyncio.run(run())
+    assert sorted(p.sub_name for p in items) == [f"post-{i:02}" for i in range(1, 10, 2)]
+    assert first.name == "news"
+    assert rest == []
+
+
+def test_amake_index_query_point_get_does_not_block(post_table, create_posts):
+    create_posts(("news", f"post-{i:02}") for i in range(2))
+
+    async def run():
+        with patch.object(post_table, "get", wraps=post_table.get) as get:
+            results = post_table.amake_index_query({"name": "news", "sub_name": "post-01"})
+            assert get.call_count == 0
+            items = await results.to_list()
+            assert get.call_count == 1
+            assert results.pages.last_evaluated_key is None
+        return items
+
+    assert [p.sub_name for p in asyncio.run(run())] == ["post-01"]
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb_utils.batch import batch_write, chunked
+from pynamodb_utils.exceptions import BatchWriteError
+
+
+def make_posts(model, count):
+    return [
+        model(name="news", sub_name=f"{i:03}", content="...", tags={"type": "news"}) for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_bulk_save(post_table, max_workers):
+    posts = make_posts(post_table, 60)
+    with patch.object(post_table, "save", side_effect=AssertionError("save called")):
+        assert post_table.bulk_save(iter(posts), max_workers=max_workers) == 60
+
+    saved = list(post_table.query("news"))
+    assert len(saved) == 60
+    assert len({p.updated_at for p in saved}) == 3
+    assert all(p.updated_at.tzinfo is not None for p in saved)
+
+
+def test_bulk_soft_delete(post_table):
+    posts = make_posts(post_table, 30)
+    post_table.bulk_save(posts)
+
+    keys = [("news", p.sub_name) for p in posts[:20]] + [("news", "missing")]
+    assert post_table.bulk_soft_delete(keys + posts[20:], max_workers=2) == 30
+    assert all(p.deleted_at is not None for p in post_table.query("news"))
+
+
+def test_batch_write_retries_unprocessed_items(post_table):
+    item = make_posts(post_table, 1)[0].serialize()
+    unprocessed = {"UnprocessedItems": {"example-table-name": [{"PutRequest": {"Item": item}}]}}
+    connection = post_table._get_connection()
+    with patch.object(connection, "batch_write_item", side_effect=[unprocessed, {}]) as write, \
+            patch("pynamodb_utils.batch.time.sleep") as sleep:
+        batch_write(post_table, put_items=[item])
+    assert write.call_count == 2
+    assert write.call_args.kwargs["put_items"] == [item]
+    sleep.assert_called_once()
+
+    with patch.object(connection, "batch_write_item", return_value=unprocessed), \
+            patch("pynamodb_utils.batch.time.sleep"), pytest.raises(BatchWriteError) as error:
+        batch_write(post_table, put_items=[item], max_retries=2)
+    assert error.value.unprocessed_items == unprocessed["UnprocessedItems"]["example-table-name"]
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+import pytest
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.models import Model
+
+from pynamodb_utils import JSONQueryModel
+from pynamodb_utils.chunking import split_query
+from pynamodb_utils.exceptions import SerializerError
+from pynamodb_utils.multi_query import make_index_queries
+
+
+def make_posts(model, names, count):
+    with model.batch_write() as batch:
+        for name in names:
+            for i in range(count):
+                batch.save(model(name=name, sub_name=f"{i:03}", content=f"{i % 250}", tags={"type": "news"}))
+
+
+def test_split_query_does_not_modify_query(post_table):
+    query = {"name__is_in": ["a", "b", "a"], "content__is_in": [str(i) for i in range(250)]}
+    copy = {k: list(v) for k, v in query.items()}
+    queries = split_query(post_table, query)
+    assert query == copy
+    assert len(queries) == 6
+    assert {q["name__equals"] for q in queries} == {"a", "b"}
+    assert all(len(q["content__is_in"]) <= 100 and "name__is_in" not in q for q in queries)
+
+
+def test_is_in_on_hash_key(post_table):
+    make_posts(post_table, ["a", "b", "c"], 3)
+
+    results = post_table.make_index_query({"name__is_in": ["a", "c", "missing"], "sub_name__lte": "001"})
+    assert sorted((p.name, p.sub_name) for p in results) == [("a", "000"), ("a", "001"), ("c", "000"), ("c", "001")]
+
+
+def test_large_is_in_is_split_and_deduplicated(post_table):
+    make_posts(post_table, ["news"], 300)
+    values = [str(i) for i in range(0, 250, 2)] * 2
+
+    with patch("pynamodb_utils.chunking.make_index_queries", wraps=make_index_queries) as queries:
+        results = list(post_table.make_index_query({"name": "news", "content__is_in": values}))
+    assert len(queries.call_args.args[1]) == 2
+    assert len(results) == len({(p.name, p.sub_name) for p in results}) == 150
+    assert {p.content for p in results} == set(values)
+
+
+def test_is_in_on_hash_key_uses_batch_get(aws_environ):
+    class Tag(JSONQueryModel):
+        name = UnicodeAttribute(hash_key=True)
+
+        class Meta:
+            table_name = "tags"
+
+    Tag.create_table(read_capacity_units=10, write_capacity_units=10)
+    with Tag.batch_write() as batch:
+        for i in range(150):
+            batch.save(Tag(name=str(i)))
+
+    names = [str(i) for i in range(0, 300, 2)]
+    with patch.object(Model, "query", side_effect=AssertionError("query called")):
+        assert sorted(int(t.name) for t in Tag.make_index_query({"name__is_in": names})) == list(range(0, 150, 2))
+
+    with pytest.raises(SerializerError):
+        Tag.make_index_query({"name__is_in": [1]})
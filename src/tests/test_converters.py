@@ -0,0 +1,64 @@
+import io
+import json
+
+from freezegun import freeze_time
+from pynamodb.attributes import ListAttribute, MapAttribute, UnicodeAttribute
+
+from pynamodb_utils import AsDictModel, DynamicMapAttribute
+from pynamodb_utils.converters import compile_dict_converter
+from pynamodb_utils.utils import parse_attrs_to_dict
+
+
+class Author(MapAttribute):
+    name = UnicodeAttribute()
+    email = UnicodeAttribute()
+
+
+class Article(AsDictModel):
+    title = UnicodeAttribute(hash_key=True)
+    author = Author()
+    reviewers = ListAttribute(of=Author, default=list)
+    tags = DynamicMapAttribute(default={})
+
+    class Meta:
+        table_name = "articles"
+        invisible_attributes = ["author.email", "tags.internal"]
+
+
+def test_as_dict_matches_legacy_conversion():
+    article = Article(
+        title="title",
+        author=Author(name="John", email="john@example.com"),
+        reviewers=[Author(name="Anna", email="anna@example.com")],
+        tags={"type": "news", "internal": "x"},
+    )
+    assert compile_dict_converter(Article)(article) == parse_attrs_to_dict(article)
+    assert article.as_dict() == {
+        "title": "title",
+        "author": {"name": "John"},
+        "reviewers": [{"name": "Anna", "email": "anna@example.com"}],
+        "tags": {"type": "news"},
+    }
+
+
+@freeze_time("2019-01-01 00:00:00+00:00")
+def test_write_json_lines(post_table):
+    category_enum = post_table.category.enum
+    for i in range(3):
+        post_table(
+            name=f"post-{i}",
+            sub_name="sub",
+            content="...",
+            category=category_enum.politics,
+            tags={"type": "news"},
+        ).save()
+
+    fp = io.StringIO()
+    assert post_table.write_json_lines(post_table.scan(), fp) == 3
+
+    lines = [json.loads(line) for line in fp.getvalue().splitlines()]
+    assert sorted(line["name"] for line in lines) == ["post-0", "post-1", "post-2"]
+    assert lines[0]["category"] == "politics"
+    assert lines[0]["created_at"] == "2019-01-01T00:00:00+00:00"
+    assert "secret_parameter" not in lines[0]
+    assert list(post_table.iter_as_dict(post_table.scan())) == lines
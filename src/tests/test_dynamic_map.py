@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pynamodb.attributes import MapAttribute, UnicodeAttribute
+from pynamodb.models import Model
+
+from pynamodb_utils.attributes import DynamicMapAttribute, LazyDecodedDict
+
+
+class Author(MapAttribute):
+    first_name = UnicodeAttribute()
+
+
+class Document(Model):
+    name = UnicodeAttribute(hash_key=True)
+    tags = DynamicMapAttribute(null=True)
+    authors = DynamicMapAttribute(of=Author, null=True)
+
+    class Meta:
+        table_name = "documents"
+
+
+RAW_TAGS = {
+    "type": {"S": "news"},
+    "topics": {"L": [{"S": "NYSE"}]},
+    "meta": {"M": {"pages": {"N": "3"}}},
+}
+
+
+def test_values_are_decoded_on_first_access():
+    tags = Document.tags.deserialize(RAW_TAGS)
+    values = tags.attribute_values
+    assert isinstance(values, LazyDecodedDict)
+    assert list(tags.keys()) == ["type", "topics", "meta"]
+    assert "type" in tags.keys()
+    assert values._decoded == {}
+
+    assert tags.type == "news"
+    assert values._decoded == {"type": "news"}
+    assert dict(tags.items()) == {"type": "news", "topics": ["NYSE"], "meta": {"pages": 3}}
+    assert tags.as_dict() == {"type": "news", "topics": ["NYSE"], "meta": {"pages": 3}}
+
+
+def test_serialize_reuses_raw_values():
+    tags = Document.tags.deserialize(RAW_TAGS)
+    tags["type"] = "opinion"
+    del tags.attribute_values["meta"]
+    assert Document.tags.serialize(tags) == {"type": {"S": "opinion"}, "topics": {"L": [{"S": "NYSE"}]}}
+
+
+def test_concurrent_first_access_decodes_consistently():
+    started = threading.Barrier(4)
+
+    def decode(raw):
+        time.sleep(0.01)
+        return {"decoded": raw["S"]}
+
+    values = LazyDecodedDict({"type": {"S": "news"}, "kind": {"S": "post"}}, decode)
+
+    def read(_):
+        started.wait()
+        return values["type"]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(read, range(4)))
+    assert all(result is results[0] for result in results)
+    assert results[0] == {"decoded": "news"}
+    assert len(values) == 2 and list(values) == ["type", "kind"]
+    assert values.serialize(lambda decoded, raw: {**raw, **{k: "new" for k in decoded}}) == {
+        "kind": {"S": "post"}, "type": "new"
+    }
+
+
+def test_element_decoder_is_cached():
+    raw = {"a": {"M": {"first_name": {"S": "John"}}}, "b": {"M": {"first_name": {"S": "Jane"}}}}
+    authors = Document.authors.deserialize(raw)
+    decoder = Document.authors._element_decoder
+    assert authors["a"].first_name == "John"
+    assert [author.first_name for _, author in authors.attribute_values.items()] == ["John", "Jane"]
+    Document.authors.deserialize(raw)
+    assert Document.authors._element_decoder is decoder
+
+
+def test_round_trip_through_model():
+    document = Document(name="doc", tags={"type": "news", "topics": ["NYSE"]})
+    loaded = Document.from_raw_data(document.serialize())
+    assert loaded.tags.as_dict() == {"type": "news", "topics": ["NYSE"]}
+    assert loaded.serialize() == document.serialize()
@@ -1,8 +1,11 @@
 from datetime import datetime
+from enum import Enum
+from unittest.mock import patch
 
 import pytest
 from freezegun import freeze_time
 
+from pynamodb_utils.attributes import EnumNumberAttribute, EnumUnicodeAttribute
 from pynamodb_utils.serializers import SerializerError
 
 
@@ -48,3 +51,50 @@ def test_enum_create_not_member_of(post_table):
             tags={"type": "news", "topics": ["stock exchange", "NYSE"]},
         )
         post.save()
+
+
+class Color(Enum):
+    red = 1
+    green = 2
+    crimson = 1
+
+
+class Shade(Enum):
+    light = "light"
+    dark = "dark"
+
+
+def test_enum_number_lookup_tables():
+    attr = EnumNumberAttribute(enum=Color, unknown_value=None)
+    assert attr.member_names == frozenset({"red", "green", "crimson"})
+    assert [attr.serialize(v) for v in (Color.green, 2, "crimson", lambda: Color.red)] == ["2", "2", "1", "1"]
+    assert attr.deserialize("1") is Color.red
+    assert attr.deserialize("7") is None
+    with pytest.raises(AttributeError):
+        attr.serialize("blue")
+    with pytest.raises(TypeError):
+        attr.serialize(Shade.dark)
+    with pytest.raises(ValueError):
+        EnumNumberAttribute(enum=Color).deserialize("7")
+
+
+def test_enum_lookup_tables_are_hit_for_members():
+    attr = EnumNumberAttribute(enum=Color)
+    with patch.object(attr, "_serialize", side_effect=AssertionError("_serialize called")), \
+            patch.object(attr, "_deserialize", side_effect=AssertionError("_deserialize called")):
+        assert [attr.serialize(v) for v in (Color.red, 2, "green")] == ["1", "2", "2"]
+        assert attr.deserialize("2") is Color.green
+    with patch.object(attr, "_deserialize", wraps=attr._deserialize) as deserialize:
+        with pytest.raises(ValueError):
+            attr.deserialize("7")
+    deserialize.assert_called_once_with("7")
+
+
+def test_enum_unicode_lookup_tables():
+    attr = EnumUnicodeAttribute(enum=Shade)
+    assert [attr.serialize(v) for v in (Shade.dark, "light")] == ["dark", "light"]
+    assert attr.deserialize("dark") is Shade.dark
+    with pytest.raises(ValueError):
+        attr.serialize("blue")
+    with pytest.raises(ValueError):
+        attr.deserialize("blue")
@@ -0,0 +1,120 @@
+import csv
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb_utils.export import CHECKPOINT_SUFFIX, Exporter, export, main
+
+
+def make_posts(model, count):
+    with model.batch_write() as batch:
+        for i in range(count):
+            batch.save(model(name=f"news-{i % 3}", sub_name=f"{i:03}", content=f"{i}", tags={"type": "news"}))
+
+
+def read_json_lines(path):
+    with gzip.open(path, "rt") as fp:
+        return [json.loads(line) for line in fp]
+
+
+def fail_after(fn, calls):
+    state = {"calls": 0}
+
+    def wrapper(*args, **kwargs):
+        state["calls"] += 1
+        if state["calls"] > calls:
+            raise RuntimeError("interrupted")
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def test_export_json_lines(post_table, tmp_path):
+    make_posts(post_table, 50)
+
+    counts = export(post_table, str(tmp_path), total_segments=3, max_workers=3)
+    assert len(counts) == 3 and sum(counts.values()) == 50
+
+    rows = [row for path in counts for row in read_json_lines(path)]
+    assert sorted(int(row["content"]) for row in rows) == list(range(50))
+    assert all("secret_parameter" not in row and row["tags"] == {"type": "news"} for row in rows)
+
+
+def test_export_csv_of_index_query(post_table, tmp_path):
+    make_posts(post_table, 10)
+    query = {"name": "news-1", "content__is_in": ["1", "4"], "PROJECTION": ["content", "tags"]}
+
+    counts = export(post_table, str(tmp_path), query, export_format="csv", compress=False)
+    (path, count), = counts.items()
+    assert count == 2 and path.endswith("-00000-of-00001.csv")
+    with open(path, newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    assert rows == [{"content": "1", "tags": '{"type":"news"}'}, {"content": "4", "tags": '{"type":"news"}'}]
+
+
+def test_export_resumes_from_checkpoint(post_table, tmp_path):
+    make_posts(post_table, 30)
+    exporter = Exporter(post_table, str(tmp_path), total_segments=1, page_size=10)
+    with patch.object(exporter, "encode", side_effect=fail_after(exporter.encode, 2)):
+        with pytest.raises(RuntimeError):
+            exporter.run()
+
+    path = exporter.get_path(0)
+    with open(path + CHECKPOINT_SUFFIX) as fp:
+        assert json.load(fp)["count"] == 20
+    assert len(read_json_lines(path)) == 20
+
+    with patch.object(post_table, "scan", wraps=post_table.scan) as scan:
+        assert Exporter(post_table, str(tmp_path), total_segments=1, page_size=10).run() == {path: 30}
+    assert scan.call_args.kwargs["last_evaluated_key"] is not None
+    assert sorted(int(row["content"]) for row in read_json_lines(path)) == list(range(30))
+
+    with patch.object(post_table, "scan", side_effect=AssertionError("scan called")):
+        assert export(post_table, str(tmp_path), total_segments=1, page_size=10) == {path: 30}
+    with pytest.raises(ValueError, match="different export"):
+        export(post_table, str(tmp_path), total_segments=1, query={"content": "1"})
+
+
+def test_export_converts_pages_on_pool(post_table, tmp_path):
+    make_posts(post_table, 30)
+    exporter = Exporter(post_table, str(tmp_path), total_segments=1, page_size=10, convert_workers=2)
+    threads = set()
+
+    def encode(*args, **kwargs):
+        threads.add(threading.current_thread().name)
+        return Exporter.encode(exporter, *args, **kwargs)
+
+    with patch.object(exporter, "encode", side_effect=encode):
+        assert exporter.run() == {exporter.get_path(0): 30}
+    assert threads and all(name.startswith("pynamodb-utils-export-convert") for name in threads)
+    assert sorted(int(row["content"]) for row in read_json_lines(exporter.get_path(0))) == list(range(30))
+
+
+def test_finished_export_is_reported_or_overwritten(post_table, tmp_path, caplog):
+    make_posts(post_table, 5)
+    (path, count), = export(post_table, str(tmp_path), total_segments=1).items()
+    assert count == 5
+
+    make_posts(post_table, 10)
+    with caplog.at_level(logging.WARNING, logger="pynamodb_utils.export"):
+        assert export(post_table, str(tmp_path), total_segments=1) == {path: 5}
+    assert "already exported" in caplog.text
+
+    assert export(post_table, str(tmp_path), total_segments=1, overwrite=True) == {path: 10}
+    assert len(read_json_lines(path)) == 10
+
+
+def test_cli(post_table, tmp_path, monkeypatch, capsys):
+    make_posts(post_table, 5)
+    monkeypatch.setattr(sys.modules[__name__], "ExportedPost", post_table, raising=False)
+
+    main([f"{__name__}:ExportedPost", str(tmp_path), "--segments", "2", "--format", "csv", "--no-compress"])
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 2
+    assert sum(int(line.split("\t")[1]) for line in output) == 5
+    assert all(os.path.exists(line.split("\t")[0]) for line in output)
@@ -0,0 +1,85 @@
+import gzip
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb_utils.batch import RateLimiter
+
+
+def make_posts(model, count):
+    posts = [
+        model(
+            name="news",
+            sub_name=f"{i:03}",
+            content=f"{i}",
+            category=model.category.enum.politics,
+            tags={"type": "news", "topics": ["NYSE"]},
+        )
+        for i in range(count)
+    ]
+    for post in posts:
+        post.created_at -= timedelta(days=1)
+        post.updated_at -= timedelta(days=1)
+    return posts
+
+
+def dump(model, posts):
+    fp = io.StringIO()
+    model.write_json_lines(posts, fp)
+    return fp.getvalue()
+
+
+def test_from_dict_reverses_as_dict(post_table):
+    post = make_posts(post_table, 1)[0]
+    loaded = post_table.from_dict(post.as_dict())
+    assert loaded.category is post_table.category.enum.politics
+    assert loaded.created_at == post.created_at and loaded.created_at.tzinfo is not None
+    assert loaded.as_dict() == post.as_dict()
+    assert loaded.serialize() == post.serialize()
+
+    with pytest.raises(ValueError):
+        post_table.from_dict({"name": "news", "unknown": 1})
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_bulk_import_keeps_timestamps(post_table, max_workers):
+    posts = make_posts(post_table, 60)
+    progress = []
+
+    count = post_table.bulk_import(
+        io.StringIO(dump(post_table, posts)),
+        max_workers=max_workers,
+        keep_timestamps=True,
+        progress=lambda state: progress.append(state.items),
+    )
+    assert count == 60
+    assert progress[-1] == 60
+    assert sorted(b - a for a, b in zip([0, *progress], progress)) == [10, 25, 25]
+    imported = {p.sub_name: p.as_dict() for p in post_table.query("news")}
+    assert imported == {p.sub_name: p.as_dict() for p in posts}
+
+
+def test_bulk_import_from_compressed_file(post_table, tmp_path):
+    posts = make_posts(post_table, 3)
+    path = str(tmp_path / "posts.jsonl.gz")
+    with gzip.open(path, "wt") as fp:
+        fp.write(dump(post_table, posts) + "\n")
+
+    assert post_table.bulk_import(path, write_capacity=100) == 3
+    imported = list(post_table.query("news"))
+    assert all(p.created_at == p.updated_at > posts[0].updated_at for p in imported)
+    assert {p.secret_parameter for p in imported} == {"secret"}
+
+    with pytest.raises(ValueError, match="Line 2"):
+        post_table.bulk_import(io.StringIO('{"name": "news", "sub_name": "x"}\n{"category": "sport"}\n'))
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(10)
+    with patch("pynamodb_utils.batch.time.sleep") as sleep:
+        limiter.acquire(10)
+        sleep.assert_not_called()
+        limiter.acquire(5)
+    assert sleep.call_args.args[0] == pytest.approx(0.5, abs=0.05)
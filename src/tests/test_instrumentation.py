@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+
+from pynamodb_utils.instrumentation import (UNLIMITED_RATE, InMemoryInstrumentation, LoggingInstrumentation,
+                                            add_instrumentation, consumed_capacity_kwargs, remove_instrumentation)
+from pynamodb_utils.plans import clear_plan_cache
+
+
+@pytest.fixture
+def in_memory_instrumentation():
+    handler = InMemoryInstrumentation()
+    add_instrumentation(handler)
+    yield handler
+    remove_instrumentation(handler)
+
+
+def test_in_memory_instrumentation(post_table, in_memory_instrumentation):
+    clear_plan_cache()
+    post_table(name="news", sub_name="a", content="...", tags={"type": "news"}).save()
+
+    results = [post.as_dict() for post in post_table.make_index_query({"name": "news", "content": "..."})]
+    post_table.get_conditions_from_json({"content": "..."})
+
+    assert len(results) == 1
+    report = in_memory_instrumentation.report()
+    assert report["index_planner.plan"][0]["tags"] == {"index": "example-table-name", "model": "Post"}
+    assert report["query.pages"] == [{"tags": {"model": "Post"}, "value": 1}]
+    assert report["query.items"] == [{"tags": {"model": "Post"}, "value": 1}]
+    assert report["query.consumed_capacity"][0]["value"] > 0
+    assert report["as_dict"][0]["count"] == 1
+    assert report["conditions_serializer.compile"][0]["count"] == 1
+    assert report["query_serializer.bind"][0]["p99"] >= report["query_serializer.bind"][0]["min"]
+    assert {"tags": {"kind": "query", "model": "Post"}, "value": 1} in report["plans.compiled"]
+
+
+def test_logging_instrumentation(post_table, caplog):
+    handler = LoggingInstrumentation()
+    add_instrumentation(handler)
+    try:
+        with caplog.at_level(logging.DEBUG, logger="pynamodb_utils.instrumentation"):
+            post_table.get_conditions_from_json({"content": "..."})
+    finally:
+        remove_instrumentation(handler)
+
+    assert any("conditions_serializer.bind took" in record.getMessage() for record in caplog.records)
+
+
+def test_consumed_capacity_kwargs(in_memory_instrumentation):
+    assert consumed_capacity_kwargs({"limit": 1}) == {"limit": 1, "rate_limit": UNLIMITED_RATE}
+    assert consumed_capacity_kwargs({"rate_limit": 5}) == {"rate_limit": 5}
+    remove_instrumentation(in_memory_instrumentation)
+    try:
+        assert consumed_capacity_kwargs({"limit": 1}) == {"limit": 1}
+        assert consumed_capacity_kwargs({"limit": 1}, always=True) == {"limit": 1, "rate_limit": UNLIMITED_RATE}
+    finally:
+        add_instrumentation(in_memory_instrumentation)
@@ -0,0 +1,36 @@
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.models import Model
+
+from pynamodb_utils.metadata import get_model_metadata, invalidate_model_metadata
+
+
+def test_model_metadata(post_table):
+    metadata = get_model_metadata(post_table)
+
+    assert get_model_metadata(post_table) is metadata
+    assert "tags.*" in metadata.attribute_paths
+    assert metadata.attributes["content"] is post_table.content
+    assert metadata.key_schemas == {
+        "example-table-name": ("name", "sub_name"),
+        "example-index-name": ("category", "created_at"),
+    }
+    assert metadata.index_map[("category", "created_at")] is post_table.category_created_at_gsi
+    assert "secret_parameter" not in metadata.get_available_attributes(["secret_parameter"])
+
+
+def test_model_metadata_invalidation():
+    def define_model():
+        class Item(Model):
+            name = UnicodeAttribute(hash_key=True)
+
+            class Meta:
+                table_name = "items"
+        return Item
+
+    model_1 = define_model()
+    model_2 = define_model()
+    metadata = get_model_metadata(model_1)
+
+    assert get_model_metadata(model_2) is not metadata
+    invalidate_model_metadata(model_1)
+    assert get_model_metadata(model_1) is not metadata
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb_utils.exceptions import SerializerError
+
+
+def test_make_index_queries_merged(post_table, create_posts):
+    create_posts(((tenant, f"{i}-{tenant}") for tenant in "abc" for i in range(4)), content="...")
+    queries = [{"name": tenant, "sub_name__gte": "1"} for tenant in ("a", "b", "c")]
+
+    results = post_table.make_index_queries(queries, page_size=1)
+    assert sorted(p.sub_name for p in results) == sorted(f"{i}-{t}" for t in "abc" for i in range(1, 4))
+
+    ordered = post_table.make_index_queries(queries, order_by_range_key=True, page_size=2)
+    assert [p.sub_name for p in ordered] == sorted(f"{i}-{t}" for t in "abc" for i in range(1, 4))
+
+    ordered = post_table.make_index_queries(queries, order_by_range_key=True, scan_index_forward=False)
+    assert [p.sub_name for p in ordered] == sorted((f"{i}-{t}" for t in "abc" for i in range(1, 4)), reverse=True)
+
+
+def test_make_index_queries_separate(post_table, create_posts):
+    create_posts(((tenant, f"{i}-{tenant}") for tenant in "abc" for i in range(4)), content="...")
+    queries = [{"name": "a"}, {"category": "finance", "content": "..."}]
+
+    results = post_table.make_index_queries(queries, merge=False, page_size=3)
+    assert [len(list(iterator)) for iterator in results] == [4, 12]
+
+    with pytest.raises(SerializerError):
+        post_table.make_index_queries(queries, order_by_range_key=True)
+
+
+def test_make_index_queries_shuts_down_own_executor(post_table, create_posts):
+    create_posts(((tenant, f"{i}-{tenant}") for tenant in "abc" for i in range(4)), content="...")
+    queries = [{"name": tenant} for tenant in ("a", "b", "c")]
+    executors = []
+
+    def create_executor(*args, **kwargs):
+        executors.append(ThreadPoolExecutor(*args, **kwargs))
+        return executors[-1]
+
+    with patch("pynamodb_utils.multi_query.ThreadPoolExecutor", side_effect=create_executor):
+        ordered = post_table.make_index_queries(queries, order_by_range_key=True, max_workers=2, page_size=1)
+        assert next(ordered).sub_name == "0-a"
+        ordered.close()
+        assert executors[-1]._shutdown
+
+        results = post_table.make_index_queries(queries, merge=False, max_workers=2)
+        assert [len(list(iterator)) for iterator in results[:2]] == [4, 4]
+        assert not executors[-1]._shutdown
+        results[2].close()
+        assert executors[-1]._shutdown
@@ -0,0 +1,81 @@
+import operator
+from functools import reduce
+
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.models import Model
+
+from pynamodb_utils.optimizer import conditions_equal, deduplicate_conditions, simplify_condition
+from pynamodb_utils.serializers import ConditionsSerializer
+
+
+class Item(Model):
+    name = UnicodeAttribute(hash_key=True)
+    kind = UnicodeAttribute()
+    price = NumberAttribute()
+
+    class Meta:
+        table_name = "items"
+
+
+def test_simplify_condition():
+    condition = (
+        ((Item.price >= 1) & (Item.kind == "a"))
+        & ((Item.price <= 5) & (Item.kind == "a"))
+        & ~~(Item.name == "x")
+    )
+    assert conditions_equal(
+        simplify_condition(condition), (Item.price.between(1, 5) & (Item.kind == "a")) & (Item.name == "x")
+    )
+
+    condition = ((Item.kind == "a") | (Item.kind == "b")) | (Item.kind.is_in("c") | (Item.name == "x"))
+    assert conditions_equal(simplify_condition(condition), Item.kind.is_in("a", "b", "c") | (Item.name == "x"))
+
+    condition = (Item.price >= 1) & (Item.price >= 2) & (Item.price <= 5)
+    assert conditions_equal(simplify_condition(condition), condition)
+
+
+def test_serializer_output_is_simplified():
+    condition = ConditionsSerializer(Item).load(
+        {"price__gte": 1, "price__lte": 5, "AND": {"kind": "a", "name__is_in": ["x", "y"]}, "kind__equals": "a"}
+    )
+    assert conditions_equal(condition, (Item.kind == "a") & Item.name.is_in("x", "y") & Item.price.between(1, 5))
+
+
+def test_inverted_range_is_not_merged():
+    condition = (Item.price >= 5) & (Item.price <= 1)
+    assert conditions_equal(simplify_condition(condition), condition)
+
+    condition = (Item.kind >= "b") & (Item.kind <= "a")
+    assert conditions_equal(simplify_condition(condition), condition)
+
+    condition = (Item.price >= 10) & (Item.price <= 9.5) & (Item.kind >= "a") & (Item.kind <= "a")
+    assert conditions_equal(
+        simplify_condition(condition), (Item.price >= 10) & (Item.price <= 9.5) & Item.kind.between("a", "a")
+    )
+
+
+def test_merged_in_is_limited_to_100_operands():
+    condition = Item.kind.is_in(*[str(i) for i in range(60)]) | Item.kind.is_in(*[str(i) for i in range(60, 120)])
+    assert conditions_equal(simplify_condition(condition), condition)
+
+    condition = reduce(operator.or_, [Item.kind == str(i) for i in range(150)])
+    assert conditions_equal(
+        simplify_condition(condition),
+        Item.kind.is_in(*[str(i) for i in range(100)]) | Item.kind.is_in(*[str(i) for i in range(100, 150)]),
+    )
+
+
+def test_deduplicate_conditions_on_structure():
+    operands = [
+        Item.kind == "a",
+        Item.kind == "a",
+        Item.kind == "b",
+        Item.price == 1,
+        Item.kind.is_in("a", "b"),
+        Item.kind.is_in("a", "b"),
+        (Item.kind == "a") | (Item.price >= 2),
+        (Item.kind == "a") | (Item.price >= 2),
+        (Item.kind == "a") | (Item.price > 2),
+    ]
+    result = deduplicate_conditions(operands)
+    assert [id(operand) for operand in result] == [id(operands[i]) for i in (0, 2, 3, 4, 6, 8)]
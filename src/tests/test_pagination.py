@@ -0,0 +1,62 @@
+import pytest
+
+from pynamodb_utils.exceptions import SerializerError
+from pynamodb_utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def posts(post_table):
+    for i in range(10):
+        content = "match" if i % 3 == 0 else "other"
+        post_table(name="news", sub_name=f"{i:02}", content=content, tags={"type": "news"}).save()
+    return post_table
+
+
+def test_pages_are_filled(posts):
+    query = {"name": "news", "content": "match"}
+    page = posts.paginate_index_query(query, page_size=3, read_page_size=2)
+    assert [p.sub_name for p in page] == ["00", "03", "06"]
+    assert page.has_more
+
+    page = posts.paginate_index_query(query, page_size=3, cursor=page.cursor, read_page_size=2)
+    assert [p.sub_name for p in page] == ["09"]
+    assert page.cursor is None
+
+
+def test_page_ends_inside_dynamodb_page(posts):
+    query = {"name": "news"}
+    seen, cursor = [], None
+    while True:
+        page = posts.paginate_index_query(query, page_size=4, cursor=cursor, read_page_size=3)
+        seen.extend(p.sub_name for p in page)
+        cursor = page.cursor
+        if cursor is None:
+            break
+    assert seen == [f"{i:02}" for i in range(10)]
+
+
+def test_read_capacity_cap(posts):
+    page = posts.paginate_index_query(
+        {"name": "news", "content": "missing"}, page_size=3, read_page_size=1, max_read_capacity=0.1
+    )
+    assert page.items == []
+    assert page.has_more
+
+
+def test_cursor_validation(posts):
+    cursor = posts.paginate_index_query({"name": "news"}, page_size=2).cursor
+    with pytest.raises(SerializerError):
+        posts.paginate_index_query({"name": "news", "content": "match"}, page_size=2, cursor=cursor)
+    with pytest.raises(SerializerError):
+        posts.paginate_index_query({"name": "other"}, page_size=2, cursor=cursor)
+    with pytest.raises(SerializerError):
+        posts.paginate_index_query({"name": "news"}, page_size=2, cursor="not-a-cursor")
+    assert posts.paginate_index_query({"name": "news"}, page_size=2, cursor=cursor).items
+
+    key = {"name": {"S": "news"}}
+    signed = encode_cursor(key, "plan", secret="secret")
+    assert decode_cursor(signed, "plan", secret="secret") == key
+    with pytest.raises(SerializerError):
+        decode_cursor(signed, "plan", secret="other")
+    with pytest.raises(SerializerError):
+        decode_cursor(encode_cursor(key, "plan"), "plan", secret="secret")
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+from pynamodb.attributes import MapAttribute, UnicodeAttribute, UTCDateTimeAttribute
+from pynamodb.models import Model
+
+from pynamodb_utils.exceptions import FilterError
+from pynamodb_utils.optimizer import conditions_equal
+from pynamodb_utils.parsers import (DATETIME_FORMATS, default_str_parser, get_exists_condition, get_parser,
+                                    parse_string_to_datetime, parse_value, register_parser)
+
+
+@pytest.mark.parametrize("fmt", DATETIME_FORMATS)
+def test_parse_string_to_datetime(fmt):
+    value = datetime(2019, 1, 2, 3, 4, 5, 600000)
+    assert parse_string_to_datetime(value.strftime(fmt), "created_at") == datetime.strptime(value.strftime(fmt), fmt)
+
+
+def test_parse_string_to_datetime_invalid():
+    assert parse_string_to_datetime(None, "created_at") is None
+    assert parse_string_to_datetime("2019-1-2", "created_at") == datetime(2019, 1, 2)
+    with pytest.raises(FilterError) as e:
+        parse_string_to_datetime("2019-02-30", "created_at")
+    assert e.value.message == {
+        "created_at": [
+            f"2019-02-30 is not valid type of created_at. Supported formats are {', '.join(DATETIME_FORMATS)}"
+        ]
+    }
+
+
+class LowerCaseAttribute(UnicodeAttribute):
+    pass
+
+
+class Address(MapAttribute):
+    city = UnicodeAttribute()
+    visited_at = UTCDateTimeAttribute()
+
+
+class Customer(Model):
+    name = LowerCaseAttribute(hash_key=True)
+    address = Address()
+
+    class Meta:
+        table_name = "customers"
+
+
+def test_parse_value_resolves_subclasses_and_nested_attributes():
+    assert get_parser(Customer, "name") is default_str_parser
+    assert parse_value(Customer, "address.visited_at", "2019-01-02") == datetime(2019, 1, 2)
+    with pytest.raises(FilterError):
+        parse_value(Customer, "address.city", 1)
+
+
+def test_register_parser():
+    register_parser(LowerCaseAttribute, lambda value, *args: value.lower())
+    try:
+        assert parse_value(Customer, "name", "ABC") == "abc"
+    finally:
+        register_parser(LowerCaseAttribute, default_str_parser)
+
+
+@pytest.mark.parametrize("value", [True, None, 1, "true", "True", "1", "yes"])
+def test_exists_condition_true_values(value):
+    condition = get_exists_condition(Customer, "name", Customer.name, value)
+    assert conditions_equal(condition, Customer.name.exists())
+
+
+@pytest.mark.parametrize("value", [False, 0, "false", "False", "FALSE", "0"])
+def test_exists_condition_false_values(value):
+    condition = get_exists_condition(Customer, "name", Customer.name, value)
+    assert conditions_equal(condition, Customer.name.does_not_exist())
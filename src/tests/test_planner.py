@@ -0,0 +1,73 @@
+from pynamodb_utils.optimizer import conditions_equal
+from pynamodb_utils.planner import IndexPlanner, get_index_planner
+from pynamodb_utils.serializers import QuerySerializer
+
+
+def test_explain(post_table):
+    assert post_table.explain({"category": "finance", "created_at__lte": "2019-01-01", "content": "..."}) == {
+        "index": "example-index-name",
+        "hash_key": "category",
+        "range_key": "created_at",
+        "hash_key_condition": "category",
+        "range_key_conditions": ["created_at__lte"],
+        "projection": "ALL",
+        "estimated_cost": 1000 / 10 * 0.5 * IndexPlanner.SECONDARY_INDEX_PENALTY,
+    }
+    assert post_table.explain({"content": "..."}) is None
+
+
+def test_statistics_change_index_choice(post_table):
+    query = {"name": "A weekly news.", "category__equals": "finance"}
+    assert post_table.explain(query)["index"] == "example-table-name"
+
+    planner = get_index_planner(post_table)
+    planner.register_statistics("category", cardinality=1000)
+    plan = post_table.explain(query)
+    assert plan["index"] == "example-index-name"
+    assert plan["hash_key_condition"] == "category__equals"
+
+    idx, _ = QuerySerializer(post_table).load(query)
+    assert idx is post_table.category_created_at_gsi
+
+
+def test_range_key_conditions(post_table):
+    serializer = QuerySerializer(post_table)
+    _, query = serializer.load({
+        "name": "news",
+        "sub_name__gte": "a",
+        "sub_name__lte": "c",
+        "sub_name__exists": None,
+        "sub_name__startswith": "b",
+    })
+    assert conditions_equal(query["range_key_condition"], post_table.sub_name.between("a", "c"))
+    assert conditions_equal(
+        query["filter_condition"], post_table.sub_name.exists() & post_table.sub_name.startswith("b")
+    )
+
+    _, query = serializer.load({"name": "news", "sub_name__gt": "a", "sub_name__lt": "c"})
+    assert conditions_equal(query["range_key_condition"], post_table.sub_name > "a")
+    assert conditions_equal(query["filter_condition"], post_table.sub_name < "c")
+
+    _, query = serializer.load({"name": "news", "sub_name__between": ["a", "c"], "content__not_startswith": "x"})
+    assert conditions_equal(query["range_key_condition"], post_table.sub_name.between("a", "c"))
+    assert conditions_equal(query["filter_condition"], ~post_table.content.startswith("x"))
+
+
+def test_range_key_between_query(post_table):
+    for sub_name in "abcde":
+        post_table(name="news", sub_name=sub_name, content="...", tags={"type": "news"}).save()
+
+    results = post_table.make_index_query({"name": "news", "sub_name__gte": "b", "sub_name__lte": "d"})
+    assert [p.sub_name for p in results] == ["b", "c", "d"]
+
+
+def test_inverted_range_key_bounds(post_table):
+    for sub_name in "abcde":
+        post_table(name="news", sub_name=sub_name, content="...", tags={"type": "news"}).save()
+
+    _, query = QuerySerializer(post_table).load(
+        {"name": "news", "sub_name__gte": "d", "sub_name__lte": "b", "content": "..."}
+    )
+    assert conditions_equal(query["range_key_condition"], post_table.sub_name >= "d")
+    assert conditions_equal(query["filter_condition"], (post_table.sub_name <= "b") & (post_table.content == "..."))
+    assert list(post_table.make_index_query({"name": "news", "sub_name__gte": "d", "sub_name__lte": "b"})) == []
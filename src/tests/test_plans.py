@@ -0,0 +1,149 @@
+import copy
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import reduce
+from types import MappingProxyType
+
+import pytest
+from freezegun import freeze_time
+from pynamodb.attributes import MapAttribute, UnicodeAttribute
+from pynamodb.models import Model
+
+from pynamodb_utils.cache import LRUCache
+from pynamodb_utils.conditions import create_model_condition
+from pynamodb_utils.exceptions import SerializerError
+from pynamodb_utils.optimizer import conditions_equal, simplify_condition
+from pynamodb_utils.plans import PLAN_CACHE, clear_plan_cache
+from pynamodb_utils.serializers import ConditionsSerializer, QuerySerializer
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_conditions_plan_reused_for_same_shape(post_table):
+    clear_plan_cache()
+    serializer = ConditionsSerializer(post_table)
+    query_1 = {"content__equals": "a", "OR": {"tags.type__equals": "news", "name__startswith": "A"}}
+    query_2 = {"content__equals": "b", "OR": {"tags.type__equals": "blog", "name__startswith": "B"}}
+
+    plan = serializer.compile(query_1)
+    assert serializer.compile(query_2) is plan
+    assert len(PLAN_CACHE) == 1
+    assert str(serializer.load(query_2)) != str(serializer.load(query_1))
+    assert query_1 == {"content__equals": "a", "OR": {"tags.type__equals": "news", "name__startswith": "A"}}
+
+    serializer.compile({"OR": {"tags.type__equals": "news", "name__startswith": "A"}, "content__equals": "a"})
+    assert len(PLAN_CACHE) == 2
+
+
+@freeze_time("2019-01-01 00:00:00+00:00")
+def test_query_plan_binds_new_values(post_table):
+    clear_plan_cache()
+    category_enum = post_table.category.enum
+    for category in category_enum:
+        post_table(
+            name=f"{category.name} news",
+            sub_name="sub",
+            content="...",
+            category=category,
+            tags={"type": "news"},
+        ).save()
+
+    serializer = QuerySerializer(post_table)
+    queries = [{"category": category.name, "created_at__lte": str(datetime.now())} for category in category_enum]
+    plans = [serializer.compile(query) for query in queries]
+    assert plans[0] is plans[1]
+
+    for category, query in zip(category_enum, queries):
+        assert [p.name for p in post_table.make_index_query(query)] == [f"{category.name} news"]
+
+
+def test_conditions_on_typed_map_attribute():
+    class Address(MapAttribute):
+        city = UnicodeAttribute()
+
+    class Customer(Model):
+        name = UnicodeAttribute(hash_key=True)
+        address = Address()
+
+        class Meta:
+            table_name = "customers"
+
+    condition = ConditionsSerializer(Customer).load({"address.city__startswith": "War"}, raise_exception=True)
+    assert str(condition) == str(Customer.address.city.startswith("War"))
+
+
+def test_serializers_do_not_mutate_query(post_table):
+    query = {
+        "name": "news",
+        "content__is_in": ["a", "b"],
+        "AND": {"sub_name__startswith": "a", "OR": {"tags.type": "news", "category": "finance"}},
+        "PROJECTION": ["content"],
+    }
+    expected = copy.deepcopy(query)
+    frozen = MappingProxyType({
+        **query, "AND": MappingProxyType({**query["AND"], "OR": MappingProxyType(query["AND"]["OR"])})
+    })
+
+    idx, kwargs = QuerySerializer(post_table).load(frozen)
+    ConditionsSerializer(post_table).load(frozen)
+    assert query == expected
+    assert conditions_equal(kwargs["filter_condition"], QuerySerializer(post_table).load(query)[1]["filter_condition"])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: QuerySerializer(post_table).load(frozen)[1], range(64)))
+    assert all(conditions_equal(r["filter_condition"], kwargs["filter_condition"]) for r in results)
+    assert query == expected
+
+
+def test_validation_errors_are_collected(post_table):
+    with pytest.raises(SerializerError) as e:
+        ConditionsSerializer(post_table, ["secret_parameter"]).load({
+            "unknown": 1,
+            "content__unknown": "x",
+            "OR": {"secret_parameter": "x", "category": "sport"},
+        }, raise_exception=True)
+    assert set(e.value.message["Query"]) == {"unknown", "content__unknown", "secret_parameter"}
+
+    with pytest.raises(SerializerError) as e:
+        QuerySerializer(post_table).load({
+            "category": "sport",
+            "created_at__lte": "not a date",
+            "OR": {"content": "a", "tags.type": "news"},
+            "PROJECTION": ["missing"],
+        }, raise_exception=True)
+    assert set(e.value.message["Query"]) == {"missing"}
+
+    with pytest.raises(SerializerError) as e:
+        QuerySerializer(post_table).load({"category": "sport", "created_at__lte": "not a date"})
+    assert set(e.value.message["Query"]) == {"category", "created_at"}
+
+
+def _raw_condition(model, data, _operator=operator.and_):
+    statements = [
+        _raw_condition(model, data[k], op) for k, op in (("AND", operator.and_), ("OR", operator.or_)) if k in data
+    ]
+    leaves = create_model_condition(model, {k: v for k, v in data.items() if k not in ("AND", "OR")}, _operator)
+    conditions = [c for c in (*statements, leaves) if c is not None]
+    return reduce(operator.and_, conditions) if conditions else None
+
+
+@pytest.mark.parametrize("query", [
+    {"content__gte": "a", "AND": {"content__lte": "c", "OR": {"name": "x", "name__is_in": ["y", "z"]}}},
+    {"content": "x", "AND": {"content__equals": "x", "name__not_startswith": "a"}, "OR": {"name": "a"}},
+    {"OR": {"AND": {"name": "a", "content": "b"}, "OR": {"AND": {"name": "a", "content": "b"}}}, "content": "c"},
+    {"content__gte": "d", "content__lte": "b", "OR": {"content": None, "content__exists": False}},
+])
+def test_bound_condition_is_simplified(post_table, query):
+    condition = ConditionsSerializer(post_table).load(query, raise_exception=True)
+    assert conditions_equal(condition, simplify_condition(_raw_condition(post_table, query)))
@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+import pytest
+from pynamodb.models import Model
+
+from pynamodb_utils.exceptions import BatchGetError, SerializerError
+from pynamodb_utils.point_get import batch_get
+from pynamodb_utils.serializers import QuerySerializer
+
+
+def test_primary_key_query_uses_get_item(post_table, create_posts):
+    create_posts([("news", "000"), ("news", "001")])
+
+    with patch.object(Model, "query", side_effect=AssertionError("query called")):
+        assert [p.content for p in post_table.make_index_query({"name": "news", "sub_name__equals": "001"})] == ["odd"]
+        missing = post_table.make_index_query({"name": "news", "sub_name": "missing"})
+        assert list(missing) == []
+        assert missing.last_evaluated_key is None and missing.total_count == 0
+
+        query = {"name": "news", "sub_name": "000", "PROJECTION": ["content"]}
+        results = post_table.make_index_query(query)
+        post = next(results)
+        assert post.content == "even" and post.tags != {"type": "news"}
+        assert results.last_evaluated_key is None and results.total_count == 1
+
+    with pytest.raises(SerializerError):
+        post_table.make_index_query({"name": "news", "sub_name": None})
+
+
+def test_point_get_is_recognized_by_plan(post_table):
+    serializer = QuerySerializer(post_table)
+    assert serializer.load_key({"name": "news", "sub_name": "000"}) == (("news", "000"), {})
+    assert serializer.load_key({"name": "news", "sub_name__lte": "000"}) is None
+    assert serializer.load_key({"name": "news", "sub_name": "000", "content": "0"}) is None
+    assert serializer.load_key({"category": "finance", "created_at": "2019-01-01"}) is None
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_primary_key_queries_use_batch_get(post_table, create_posts, max_workers):
+    create_posts([("news", f"{i:03}") for i in range(150)])
+    queries = [{"name": "news", "sub_name": f"{i:03}"} for i in range(0, 300, 2)]
+    connection = post_table._get_connection()
+
+    with patch.object(Model, "query", side_effect=AssertionError("query called")), \
+            patch.object(connection, "batch_get_item", wraps=connection.batch_get_item) as get_items:
+        results = post_table.make_index_queries(queries, max_workers=max_workers)
+        assert sorted(int(p.sub_name) for p in results) == list(range(0, 150, 2))
+    assert get_items.call_count == 2
+
+
+def test_batch_get_retries_unprocessed_keys(post_table, create_posts):
+    create_posts([("news", "000")])
+    key = {"name": {"S": "news"}, "sub_name": {"S": "000"}}
+    connection = post_table._get_connection()
+    table_name = post_table.Meta.table_name
+    data = connection.batch_get_item([key])
+    unprocessed = {"Responses": {table_name: []}, "UnprocessedKeys": {table_name: {"Keys": [key]}}}
+
+    with patch.object(connection, "batch_get_item", side_effect=[unprocessed, data]) as get_items, \
+            patch("pynamodb_utils.point_get.time.sleep") as sleep:
+        assert [p.content for p in batch_get(post_table, [("news", "000")])] == ["even"]
+    assert get_items.call_args.args[0] == [key]
+    sleep.assert_called_once()
+
+    with patch.object(connection, "batch_get_item", return_value=unprocessed), \
+            patch("pynamodb_utils.point_get.time.sleep"), pytest.raises(BatchGetError) as error:
+        list(batch_get(post_table, [("news", "000")], max_retries=2))
+    assert error.value.unprocessed_keys == [key]
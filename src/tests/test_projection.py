@@ -0,0 +1,59 @@
+import pytest
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.indexes import GlobalSecondaryIndex, IncludeProjection
+
+from pynamodb_utils import AsDictModel, JSONQueryModel
+from pynamodb_utils.exceptions import SerializerError
+from pynamodb_utils.serializers import QuerySerializer
+
+
+class PostNameIncludeGSI(GlobalSecondaryIndex):
+    name = UnicodeAttribute(hash_key=True)
+    category = UnicodeAttribute(range_key=True)
+
+    class Meta:
+        index_name = "name-include-index"
+        projection = IncludeProjection(["content"])
+
+
+class ProjectedPost(AsDictModel, JSONQueryModel):
+    name = UnicodeAttribute(hash_key=True)
+    sub_name = UnicodeAttribute(range_key=True)
+    category = UnicodeAttribute()
+    content = UnicodeAttribute()
+    body = UnicodeAttribute()
+    name_include_gsi = PostNameIncludeGSI()
+
+    class Meta:
+        table_name = "projected-post"
+
+
+def test_query_with_projection(post_table):
+    post_table(name="news", sub_name="a", content="...", tags={"type": "news", "topics": ["NYSE"]}).save()
+    query = {"name": "news", "PROJECTION": ["content", "tags.type"]}
+
+    _, kwargs = QuerySerializer(post_table).load(query)
+    paths = [path.path for path in kwargs["attributes_to_get"]]
+    assert paths == [["name"], ["sub_name"], ["content"], ["tags", "type"]]
+
+    post = next(post_table.make_index_query(query))
+    assert post.content == "..."
+    assert post.as_dict()["tags"] == {"type": "news"}
+    assert post.as_dict(attributes=query["PROJECTION"]) == {"content": "...", "tags": {"type": "news"}}
+    assert list(post_table.iter_as_dict([post], attributes=["name"])) == [{"name": "news"}]
+
+
+def test_projection_validation(post_table):
+    with pytest.raises(SerializerError):
+        post_table.make_index_query({"name": "news", "PROJECTION": ["secret_parameter"]})
+    with pytest.raises(SerializerError):
+        post_table.make_index_query({"name": "news", "PROJECTION": "content"})
+
+
+def test_planner_prefers_covering_index():
+    assert ProjectedPost.explain({"name": "news"})["index"] == "projected-post"
+    assert ProjectedPost.explain({"name": "news", "PROJECTION": ["body"]})["index"] == "projected-post"
+
+    plan = ProjectedPost.explain({"name": "news", "PROJECTION": ["content"]})
+    assert plan["index"] == "name-include-index"
+    assert plan["projection"] == "INCLUDE"
@@ -0,0 +1,96 @@
+from unittest.mock import patch
+
+import pytest
+
+from pynamodb_utils.result_cache import InMemoryResultCache
+
+
+@pytest.fixture
+def cached_posts(post_table):
+    post_table.Meta.result_cache = InMemoryResultCache(ttl=60)
+    for sub_name in "ab":
+        post_table(name="news", sub_name=sub_name, content="...", tags={"type": "news"}).save()
+    return post_table
+
+
+def test_results_are_read_through_cache(cached_posts):
+    query = {"name": "news", "content": "..."}
+    assert [p.sub_name for p in cached_posts.make_index_query(query)] == ["a", "b"]
+    assert len(cached_posts.Meta.result_cache) == 1
+
+    with patch.object(cached_posts, "query", side_effect=AssertionError("query executed")):
+        posts = list(cached_posts.make_index_query(query))
+    assert [p.sub_name for p in posts] == ["a", "b"]
+    assert posts[0].tags.type == "news"
+
+    assert [p.sub_name for p in cached_posts.make_index_query({"name": "news", "content": "x"})] == []
+    assert len(cached_posts.Meta.result_cache) == 2
+
+
+def test_partially_consumed_results_are_not_cached(cached_posts):
+    next(cached_posts.make_index_query({"name": "news"}))
+    assert len(cached_posts.Meta.result_cache) == 0
+
+
+def test_writes_invalidate_partition(cached_posts):
+    list(cached_posts.make_index_query({"name": "news"}))
+    list(cached_posts.make_index_query({"name": "other"}))
+    list(cached_posts.make_index_query({"category": "finance"}))
+    assert len(cached_posts.Meta.result_cache) == 3
+
+    cached_posts(name="news", sub_name="c", content="...", tags={"type": "news"}).save()
+    assert len(cached_posts.Meta.result_cache) == 1
+    assert [p.sub_name for p in cached_posts.make_index_query({"name": "news"})] == ["a", "b", "c"]
+
+    post = cached_posts.get("news", "a")
+    post.soft_delete()
+    assert len(cached_posts.Meta.result_cache) == 1
+    assert next(cached_posts.make_index_query({"name": "news"})).deleted_at is not None
+
+
+def test_results_invalidated_while_consumed_are_not_cached(cached_posts):
+    results = cached_posts.make_index_query({"name": "news"}, page_size=1)
+    assert next(results).sub_name == "a"
+    cached_posts(name="news", sub_name="c", content="...", tags={"type": "news"}).save()
+    assert [p.sub_name for p in results] == ["b", "c"]
+    assert len(cached_posts.Meta.result_cache) == 0
+
+    results = cached_posts.make_index_query({"name": "news"}, limit=2)
+    cached_posts.get("news", "b").soft_delete()
+    assert [p.sub_name for p in results] == ["a", "b"]
+    assert len(cached_posts.Meta.result_cache) == 0
+    assert [p.sub_name for p in cached_posts.make_index_query({"name": "news"}, limit=2)] == ["a", "b"]
+    assert len(cached_posts.Meta.result_cache) == 1
+
+
+def test_in_memory_cache_limits():
+    cache = InMemoryResultCache(maxsize=2, max_bytes=100, ttl=60)
+    cache.set("a", [{"v": {"S": "a"}}], "p1", ["k1"])
+    cache.set("b", [{"v": {"S": "b"}}], "p1", ["k2"])
+    cache.get("a")
+    cache.set("c", [{"v": {"S": "c"}}], "p2", ["k3"])
+    assert cache.get("b") is None and cache.get("a") is not None
+
+    cache.set("big", [{"v": {"S": "x" * 100}}], "p3", [])
+    assert cache.get("big") is None
+    assert cache.size <= 100
+
+    cache.invalidate(["p2"], "k1")
+    assert len(cache) == 0
+
+    version = cache.version()
+    cache.invalidate([], "k4")
+    cache.set("d", [], "p4", ["k4"], version=version)
+    cache.set("e", [], "p4", ["k5"], version=version)
+    assert cache.get("d") is None and cache.get("e") is not None
+
+    with patch("pynamodb_utils.result_cache.RESULT_CACHE_INVALIDATIONS", 1):
+        version = cache.version()
+        cache.invalidate(["p5"])
+        cache.invalidate(["p6"])
+        cache.set("f", [], "p4", [], version=version)
+    assert cache.get("f") is None
+
+    expired = InMemoryResultCache(ttl=0)
+    expired.set("a", [], "p1", [])
+    assert expired.get("a") is None
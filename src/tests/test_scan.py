@@ -0,0 +1,31 @@
+from pynamodb.models import ResultIterator
+
+from pynamodb_utils.scan import parallel_scan
+
+
+def test_make_query_falls_back_to_parallel_scan(post_table, create_posts):
+    create_posts((f"post-{i}", "sub") for i in range(20))
+
+    results = post_table.make_query({"content": "even"}, total_segments=3, max_workers=2)
+
+    assert not isinstance(results, ResultIterator)
+    assert sorted(p.name for p in results) == sorted(f"post-{i}" for i in range(0, 20, 2))
+
+
+def test_make_query_uses_index(post_table, create_posts):
+    create_posts((f"post-{i}", "sub") for i in range(4))
+
+    results = post_table.make_query({"name": "post-1", "content": "odd"})
+
+    assert isinstance(results, ResultIterator)
+    assert [p.name for p in results] == ["post-1"]
+
+
+def test_parallel_scan_early_close(post_table, create_posts):
+    create_posts((f"post-{i}", "sub") for i in range(10))
+
+    results = parallel_scan(post_table, total_segments=4, buffer_size=1)
+    first = next(results)
+    results.close()
+
+    assert first.name.startswith("post-")
@@ -0,0 +1,80 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
+
+from pynamodb_utils import JSONQueryModel, TimestampedModel
+from pynamodb_utils.export import export
+
+
+class LiveAuthorGSI(GlobalSecondaryIndex):
+    live_author = UnicodeAttribute(hash_key=True)
+
+    class Meta:
+        index_name = "live-author-index"
+        projection = AllProjection()
+
+
+class Article(JSONQueryModel, TimestampedModel):
+    name = UnicodeAttribute(hash_key=True)
+    author = UnicodeAttribute()
+    live_author = UnicodeAttribute(null=True)
+    live_author_gsi = LiveAuthorGSI()
+
+    class Meta:
+        table_name = "articles"
+        exclude_deleted = True
+        live_attributes = {"author": "live_author"}
+
+
+@pytest.fixture
+def articles(aws_environ):
+    Article.create_table(read_capacity_units=10, write_capacity_units=10)
+    for name in ("a", "b", "c"):
+        Article(name=name, author="john").save()
+    Article.get("b").soft_delete()
+    Article.bulk_soft_delete(["c"])
+    yield Article
+    Article.delete_table()
+
+
+def test_deleted_items_are_excluded(articles):
+    query = {"author": "john"}
+    assert [a.name for a in articles.make_index_query(query)] == ["a"]
+    assert query == {"author": "john"}
+    assert articles.explain(query)["index"] == "live-author-index"
+    assert [a.name for a in articles.make_index_query({"name": "b"})] == []
+    assert [a.name for a in articles.make_query({"author": "john"}, max_workers=1)] == ["a"]
+
+
+def test_sparse_attributes(articles):
+    assert articles.get("a").live_author == "john"
+    assert articles.get("b").live_author is None
+    assert articles.get("c").live_author is None
+
+
+def test_include_deleted_opt_out(articles):
+    assert [a.name for a in articles.make_index_query({"name": "b"}, include_deleted=True)] == ["b"]
+    assert [a.name for a in articles.make_index_query({"name": "b", "deleted_at__exists": True})] == ["b"]
+    assert articles.explain({"author": "john"}, include_deleted=True) is None
+
+
+def test_export_excludes_deleted(articles, tmp_path):
+    counts = export(articles, str(tmp_path / "live"), total_segments=2, compress=False)
+    rows = [json.loads(line) for path in counts for line in open(path)]
+    assert [row["name"] for row in rows] == ["a"]
+
+    counts = export(articles, str(tmp_path / "all"), total_segments=1, compress=False, include_deleted=True)
+    assert sum(counts.values()) == 3
+
+
+def test_hash_key_lookup_uses_batch_get(articles):
+    query = {"name__is_in": ["a", "b", "c", "d"]}
+    connection = articles._get_connection()
+    with patch.object(articles, "query", side_effect=AssertionError("query called")), \
+            patch.object(connection, "batch_get_item", wraps=connection.batch_get_item) as get_page:
+        assert [a.name for a in articles.make_index_query(query)] == ["a"]
+        assert sorted(a.name for a in articles.make_index_query(query, include_deleted=True)) == ["a", "b", "c"]
+    assert get_page.call_count == 2